@@ -1,9 +1,39 @@
 from abc import ABC, abstractmethod
-from typing import Any, TypeVar
+from collections.abc import Iterable, Mapping
+from typing import Any, Generic, NamedTuple, TypeVar
 
 from pydantic import BaseModel
 
 AbstractBaseModel = TypeVar("AbstractBaseModel", bound=BaseModel)
+T = TypeVar("T")
+
+
+class CacheEntry(NamedTuple, Generic[T]):
+    """
+    Cached value together with its remaining time to live.
+
+    Attributes:
+        value: The cached value. None for a negative entry.
+        ttl (float): Seconds until the value expires in the cache.
+    """
+
+    value: T
+    ttl: float
+
+
+class CachedResponse(NamedTuple):
+    """
+    Cached HTTP response.
+
+    Attributes:
+        body (bytes): The encoded response body.
+        headers (list[tuple[bytes, bytes]]): The response headers to replay.
+        etag (str): The strong ETag of the body.
+    """
+
+    body: bytes
+    headers: list[tuple[bytes, bytes]]
+    etag: str
 
 
 class AbstractModelCache(ABC):
@@ -19,6 +49,7 @@ class AbstractModelCache(ABC):
         key: str,
         value: AbstractBaseModel,
         cache_expire: int,
+        tags: Iterable[str] = (),
     ) -> None:
         """
         Set a single model in the cache.
@@ -27,6 +58,21 @@ class AbstractModelCache(ABC):
             key (str): The key to use for caching the model.
             value (AbstractBaseModel): The model to cache.
             cache_expire (int): The number of seconds until the model expires.
+            tags (Iterable[str]): The tags to invalidate the model by.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def set_empty(
+        self, key: str, cache_expire: int, tags: Iterable[str] = ()
+    ) -> None:
+        """
+        Cache the absence of a model (negative entry).
+
+        Args:
+            key (str): The key to use for caching the model.
+            cache_expire (int): The number of seconds until the entry expires.
+            tags (Iterable[str]): The tags to invalidate the entry by.
         """
         raise NotImplementedError
 
@@ -42,7 +88,8 @@ class AbstractModelCache(ABC):
             model (AbstractBaseModel): The model class to cast the cached value to.
 
         Returns:
-            The cached model, or None if the model is not in the cache.
+            The cached model, or None if the model is not in the cache or
+            is cached as absent.
         """
         raise NotImplementedError
 
@@ -52,14 +99,18 @@ class AbstractModelCache(ABC):
         key: str,
         values: list[AbstractBaseModel],
         cache_expire: int,
+        tags: Iterable[str] = (),
     ) -> None:
         """
         Set a list of models in the cache.
 
+        An empty list is cached as a negative entry.
+
         Args:
             key (str): The key to use for caching the list of models.
             values (list[AbstractBaseModel]): The list of models to cache.
             cache_expire (int): The number of seconds until the list of models expires.
+            tags (Iterable[str]): The tags to invalidate the list by.
         """
         raise NotImplementedError
 
@@ -79,6 +130,97 @@ class AbstractModelCache(ABC):
         """
         raise NotImplementedError
 
+    @abstractmethod
+    async def get_one_entry(
+        self, key: str, model: type[AbstractBaseModel]
+    ) -> CacheEntry[AbstractBaseModel | None] | None:
+        """
+        Get a single model from the cache together with its remaining TTL.
+
+        Args:
+            key (str): The key used for caching the model.
+            model (AbstractBaseModel): The model class to cast the cached value to.
+
+        Returns:
+            The cache entry, or None if the model is not in the cache.
+            The value of a negative entry is None.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_list_entry(
+        self,
+        key: str,
+        model: type[AbstractBaseModel],
+        start: int = 0,
+        stop: int = -1,
+    ) -> CacheEntry[list[AbstractBaseModel] | None] | None:
+        """
+        Get a list of models from the cache together with its remaining TTL.
+
+        Args:
+            key (str): The key used for caching the list of models.
+            model (AbstractBaseModel): The model class to cast the cached values to.
+            start (int): The index of the first model to get.
+            stop (int): The index of the last model to get, inclusive; -1 for
+                the end of the list.
+
+        Returns:
+            The cache entry, or None if the list of models is not in the cache.
+            The value of a negative entry is None, the value of a range past
+            the end of the list is an empty list.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def set_many_models(
+        self,
+        values: Mapping[str, AbstractBaseModel | None],
+        cache_expire: int,
+        tags: Mapping[str, Iterable[str]] | None = None,
+    ) -> None:
+        """
+        Set many models in the cache at once.
+
+        Args:
+            values (Mapping[str, AbstractBaseModel | None]): The models to cache
+                by their keys. None is cached as a negative entry.
+            cache_expire (int): The number of seconds until the models expire.
+            tags (Mapping[str, Iterable[str]] | None): The tags to invalidate
+                the models by, by their keys.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_many_models(
+        self, keys: list[str], model: type[AbstractBaseModel]
+    ) -> list[CacheEntry[AbstractBaseModel | None] | None]:
+        """
+        Get many models from the cache at once.
+
+        Args:
+            keys (list[str]): The keys used for caching the models.
+            model (AbstractBaseModel): The model class to cast the cached values to.
+
+        Returns:
+            The cache entries in the order of the keys. None for a key that is
+            not in the cache, an entry with None value for a negative entry.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def invalidate_tags(self, tags: Iterable[str]) -> int:
+        """
+        Delete all entries cached with any of the tags.
+
+        Args:
+            tags (Iterable[str]): The tags to invalidate.
+
+        Returns:
+            The number of deleted entries.
+        """
+        raise NotImplementedError
+
     @abstractmethod
     def build_key(self, key_prefix: str, *args: Any) -> str:
         """
@@ -92,3 +234,41 @@ class AbstractModelCache(ABC):
             The built cache key.
         """
         raise NotImplementedError
+
+
+class AbstractResponseCache(ABC):
+    """
+    Abstract base class for caching encoded HTTP responses.
+    """
+
+    @abstractmethod
+    async def set_response(
+        self,
+        key: str,
+        response: CachedResponse,
+        cache_expire: int,
+        tags: Iterable[str] = (),
+    ) -> None:
+        """
+        Set an encoded response in the cache.
+
+        Args:
+            key (str): The key to use for caching the response.
+            response (CachedResponse): The response to cache.
+            cache_expire (int): The number of seconds until the response expires.
+            tags (Iterable[str]): The tags to invalidate the response by.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_response(self, key: str) -> CacheEntry[CachedResponse] | None:
+        """
+        Get an encoded response and its remaining time to live from the cache.
+
+        Args:
+            key (str): The key used for caching the response.
+
+        Returns:
+            The cache entry, or None if the response is not in the cache.
+        """
+        raise NotImplementedError
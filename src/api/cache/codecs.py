@@ -0,0 +1,154 @@
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Any
+
+from src.api.cache.abstract import AbstractBaseModel
+
+
+class AbstractCodec(ABC):
+    """
+    Abstract class for serializing models stored in the cache.
+
+    Every codec has a unique one-byte header written in front of the encoded
+    data, so values written by different codecs can be read side by side.
+    """
+
+    header: bytes
+
+    @abstractmethod
+    def encode(self, value: AbstractBaseModel) -> bytes:
+        """
+        Serialize a model.
+
+        Args:
+            value (AbstractBaseModel): The model to serialize.
+
+        Returns:
+            bytes: The serialized model without the header.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def decode(
+        self, data: bytes, model: type[AbstractBaseModel]
+    ) -> AbstractBaseModel:
+        """
+        Deserialize a model.
+
+        Args:
+            data (bytes): The serialized model without the header.
+            model (AbstractBaseModel): The model class to cast the data to.
+
+        Returns:
+            AbstractBaseModel: The deserialized model.
+        """
+        raise NotImplementedError
+
+
+class JSONCodec(AbstractCodec):
+    """Pydantic JSON."""
+
+    header = b"\x01"
+
+    def encode(self, value: AbstractBaseModel) -> bytes:
+        return value.__pydantic_serializer__.to_json(value)
+
+    def decode(
+        self, data: bytes, model: type[AbstractBaseModel]
+    ) -> AbstractBaseModel:
+        return model.model_validate_json(data)
+
+
+class MsgpackCodec(AbstractCodec):
+    """MessagePack, requires the `msgpack` package."""
+
+    header = b"\x02"
+
+    def __init__(self):
+        import msgpack
+
+        self.__msgpack = msgpack
+
+    def encode(self, value: AbstractBaseModel) -> bytes:
+        return self.__msgpack.packb(value.model_dump(mode="json"))
+
+    def decode(
+        self, data: bytes, model: type[AbstractBaseModel]
+    ) -> AbstractBaseModel:
+        return model.model_validate(self.__msgpack.unpackb(data))
+
+
+class ZstdCodec(AbstractCodec):
+    """
+    Zstandard compression on top of another codec, requires the `zstandard`
+    package.
+    """
+
+    def __init__(self, codec: AbstractCodec, level: int = 3):
+        import zstandard
+
+        self.__codec = codec
+        self.__compressor = zstandard.ZstdCompressor(level=level)
+        self.__decompressor = zstandard.ZstdDecompressor()
+        self.header = bytes([codec.header[0] | 0x10])
+
+    def encode(self, value: AbstractBaseModel) -> bytes:
+        return self.__compressor.compress(self.__codec.encode(value))
+
+    def decode(
+        self, data: bytes, model: type[AbstractBaseModel]
+    ) -> AbstractBaseModel:
+        return self.__codec.decode(self.__decompressor.decompress(data), model)
+
+
+CODECS: dict[str, Any] = {
+    "json": JSONCodec,
+    "msgpack": MsgpackCodec,
+    "zstd-json": lambda: ZstdCodec(JSONCodec()),
+    "zstd-msgpack": lambda: ZstdCodec(MsgpackCodec()),
+}
+HEADERS: dict[bytes, str] = {
+    b"\x01": "json",
+    b"\x02": "msgpack",
+    b"\x11": "zstd-json",
+    b"\x12": "zstd-msgpack",
+}
+
+
+def get_codec(name: str) -> AbstractCodec:
+    """
+    Create a codec by its name.
+
+    Args:
+        name (str): One of `json`, `msgpack`, `zstd-json`, `zstd-msgpack`.
+
+    Raises:
+        ValueError: If the codec is unknown.
+
+    Returns:
+        AbstractCodec: The codec.
+    """
+    if name not in CODECS:
+        raise ValueError(
+            f"Unknown cache codec `{name}`, expected one of {list(CODECS)}."
+        )
+    return CODECS[name]()
+
+
+@lru_cache
+def get_codec_by_header(header: bytes) -> AbstractCodec:
+    """
+    Get the codec that wrote data with the given header.
+
+    Args:
+        header (bytes): The first byte of the cached data.
+
+    Raises:
+        ValueError: If no codec uses the header.
+
+    Returns:
+        AbstractCodec: The codec.
+    """
+    if header not in HEADERS:
+        raise ValueError(f"Unknown cache codec header `{header!r}`.")
+    return get_codec(HEADERS[header])
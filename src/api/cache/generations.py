@@ -0,0 +1,123 @@
+import asyncio
+from collections.abc import Iterable
+from logging import Logger
+
+from redis.asyncio import Redis
+
+GENERATION_PREFIX = "Generation"
+
+
+class Generations:
+    """
+    Поколения ключей кэша по индексам Elastic.
+
+    Номер поколения индекса хранится в Redis и входит в ключи кэша всех
+    записей, собранных из этого индекса. Увеличение номера (например,
+    после переиндексации) мгновенно делает недоступными все прежние
+    записи индекса: новые запросы читают и пишут новые ключи, а старые
+    истекают сами, без SCAN и DEL.
+
+    Номера читаются из Redis одним запросом раз в `refresh_interval`
+    секунд и хранятся в процессе, поэтому другие воркеры замечают новое
+    поколение не позже чем через `refresh_interval` секунд. Если Redis
+    недоступен, используются последние прочитанные номера.
+
+    Args:
+        redis (Redis): объект для работы с Redis
+        indexes (Iterable[str]): индексы, поколения которых отслеживаются
+        refresh_interval (float): интервал чтения номеров в секундах
+        logger (Logger): объект для записи в журналы
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        indexes: Iterable[str],
+        refresh_interval: float,
+        logger: Logger,
+    ):
+        self.__redis = redis
+        self.__generations = dict.fromkeys(indexes, 0)
+        self.__refresh_interval = refresh_interval
+        self.__logger = logger
+        self.__task: asyncio.Task[None] | None = None
+
+    def get(self, index: str) -> int:
+        """
+        Получить известный процессу номер поколения индекса.
+
+        Args:
+            index (str): имя индекса
+
+        Returns:
+            int: номер поколения, 0 если поколение не задавалось
+        """
+        return self.__generations.get(index, 0)
+
+    async def refresh(self) -> None:
+        """Прочитать номера поколений всех индексов из Redis."""
+        indexes = list(self.__generations)
+        values = await self.__redis.mget(
+            [self.build_key(index) for index in indexes]
+        )
+        for index, value in zip(indexes, values):
+            self.__generations[index] = int(value or 0)
+
+    async def bump(self, index: str) -> int:
+        """
+        Начать новое поколение ключей индекса.
+
+        Args:
+            index (str): имя индекса
+
+        Returns:
+            int: номер нового поколения
+        """
+        generation = await self.__redis.incr(self.build_key(index))
+        self.__generations[index] = generation
+        return generation
+
+    async def start(self) -> None:
+        """
+        Прочитать номера поколений и запустить их периодическое чтение в
+        фоне.
+
+        Ошибка первого чтения не прерывает запуск, а только записывается в
+        журнал.
+        """
+        await self.__refresh_logged()
+        if self.__task is None:
+            self.__task = asyncio.create_task(self.__refresh_forever())
+
+    async def close(self) -> None:
+        """Остановить чтение номеров поколений."""
+        if self.__task is not None:
+            self.__task.cancel()
+            await asyncio.gather(self.__task, return_exceptions=True)
+            self.__task = None
+
+    async def __refresh_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.__refresh_interval)
+            await self.__refresh_logged()
+
+    async def __refresh_logged(self) -> None:
+        try:
+            await self.refresh()
+        except Exception as refresh_error:
+            self.__logger.warning(
+                "Error refreshing cache generations: %s.", refresh_error
+            )
+
+    @staticmethod
+    def build_key(index: str) -> str:
+        """
+        Создать ключ номера поколения индекса в Redis.
+
+        Args:
+            index (str): имя индекса
+
+        Returns:
+            str: ключ, например `Generation-movies`
+        """
+        return f"{GENERATION_PREFIX}-{index}"
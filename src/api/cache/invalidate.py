@@ -0,0 +1,101 @@
+"""
+Сброс записей кэша Redis по тегам, например после обновления фильма в
+индексе, или по индексам, например после переиндексации.
+
+Запуск:
+    python -m src.api.cache.invalidate film:<uuid> [person:<uuid> ...]
+    python -m src.api.cache.invalidate --index movies [--index persons]
+
+Сброс по индексу начинает новое поколение ключей индекса: прежние записи
+перестают читаться воркерами в пределах интервала обновления поколений и
+истекают сами.
+
+Теги:
+    film:<uuid>, genre:<uuid>, person:<uuid> - записи, содержащие данные
+        сущности, включая списки, страницы поиска, фильмы персоны и ответы
+        из кэша ответов
+    film:lists, genre:lists, person:lists - все списки сущностей, например
+        после добавления новой сущности
+"""
+
+import argparse
+import asyncio
+
+from src.api.cache.generations import Generations
+from src.api.cache.redis import RedisCache
+from src.api.core.config import settings
+from src.api.core.connections import create_redis
+from src.core.utils.logger import create_logger
+
+
+async def invalidate(tags: list[str]) -> int:
+    """
+    Удалить из кэша Redis все записи с любым из тегов.
+
+    Args:
+        tags (list[str]): теги для сброса
+
+    Returns:
+        int: количество удалённых записей
+    """
+    cache = RedisCache(
+        create_redis(settings.redis),
+        logger=create_logger("API cache invalidation"),
+    )
+    try:
+        return await cache.invalidate_tags(tags)
+    finally:
+        await cache.close()
+
+
+async def bump_generations(indexes: list[str]) -> dict[str, int]:
+    """
+    Начать новые поколения ключей кэша индексов.
+
+    Args:
+        indexes (list[str]): имена индексов
+
+    Returns:
+        dict[str, int]: номера новых поколений по индексам
+    """
+    redis = create_redis(settings.redis)
+    generations = Generations(
+        redis,
+        indexes,
+        refresh_interval=settings.cache_generations_refresh,
+        logger=create_logger("API cache invalidation"),
+    )
+    try:
+        return {index: await generations.bump(index) for index in indexes}
+    finally:
+        await redis.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Invalidate the api cache entries by tags."
+    )
+    parser.add_argument(
+        "tags", nargs="*", help="tags to invalidate, e.g. film:<uuid>"
+    )
+    parser.add_argument(
+        "--index",
+        action="append",
+        default=[],
+        help="index to start a new cache generation for, e.g. movies",
+    )
+    args = parser.parse_args()
+    if not args.tags and not args.index:
+        parser.error("at least one tag or --index is required")
+    if args.tags:
+        deleted = asyncio.run(invalidate(args.tags))
+        print(f"Deleted {deleted} cache entries.")
+    if args.index:
+        for index, generation in asyncio.run(
+            bump_generations(args.index)
+        ).items():
+            print(f"Started cache generation {generation} of `{index}`.")
+
+
+if __name__ == "__main__":
+    main()
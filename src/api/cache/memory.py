@@ -0,0 +1,376 @@
+import time
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping
+from logging import Logger
+from typing import Any, NamedTuple
+
+from src.api.cache.abstract import (
+    AbstractBaseModel,
+    AbstractModelCache,
+    CacheEntry,
+)
+from src.api.core.metrics import (
+    MEMORY_CACHE_EVICTIONS,
+    MEMORY_CACHE_REQUESTS,
+    get_key_prefix,
+)
+
+
+class _Entry(NamedTuple):
+    value: Any
+    expires_at: float
+    cache_expires_at: float
+    size: int
+    list_key: str
+
+
+class MemoryCache(AbstractModelCache):
+    """
+    Локальный (in-process) кэш моделей перед основным кэшем.
+
+    Хранит уже десериализованные модели в LRU со временем жизни записей и
+    ограничением по количеству записей и занимаемой памяти. Промахи
+    читаются из основного кэша, запись выполняется в оба уровня. Попадания,
+    промахи и вытеснения учитываются в метриках по префиксам ключей.
+
+    Args:
+        cache (AbstractModelCache): основной кэш (например, RedisCache)
+        ttl (int): время жизни локальной записи в секундах
+        max_entries (int): максимальное количество записей
+        max_memory (int): максимальный объём записей в байтах
+        logger (Logger): объект для записи в журналы
+
+    """
+
+    __cache: AbstractModelCache
+    __logger: Logger
+
+    def __init__(
+        self,
+        cache: AbstractModelCache,
+        ttl: int,
+        max_entries: int,
+        max_memory: int,
+        logger: Logger,
+    ):
+        self.__cache = cache
+        self.__logger = logger
+        self.__ttl = ttl
+        self.__max_entries = max_entries
+        self.__max_memory = max_memory
+        self.__entries: OrderedDict[str, _Entry] = OrderedDict()
+        self.__ranges: dict[str, set[str]] = {}
+        self.__memory = 0
+
+    async def set_one_model(
+        self,
+        key: str,
+        value: AbstractBaseModel,
+        cache_expire: int,
+        tags: Iterable[str] = (),
+    ) -> None:
+        """
+        Записать одну модель в локальный и основной кэш.
+
+        Args:
+            key (str): ключ для записи модели
+            value (AbstractBaseModel): модель для записи
+            cache_expire (int): время жизни кэша в секундах
+            tags (Iterable[str]): теги, по которым сбрасывается запись
+
+        """
+        await self.__cache.set_one_model(key, value, cache_expire, tags)
+        self.__put(key, value, self.__size_of([value]), cache_expire)
+
+    async def set_empty(
+        self, key: str, cache_expire: int, tags: Iterable[str] = ()
+    ) -> None:
+        """
+        Записать отметку об отсутствии модели в локальный и основной кэш.
+
+        Args:
+            key (str): ключ для записи отметки
+            cache_expire (int): время жизни отметки в секундах
+            tags (Iterable[str]): теги, по которым сбрасывается отметка
+
+        """
+        await self.__cache.set_empty(key, cache_expire, tags)
+        self.__put(key, None, 0, cache_expire)
+
+    async def get_one_model(
+        self, key: str, model: type[AbstractBaseModel]
+    ) -> AbstractBaseModel | None:
+        """
+        Получить одну модель из локального кэша, а при промахе из основного.
+
+        Args:
+            key (str): ключ для получения модели
+            model (AbstractBaseModel): модель для десериализации
+
+        Returns:
+            AbstractBaseModel | None: возвращает одну модель или None, если модель не найдена
+
+        """
+        entry = await self.get_one_entry(key, model)
+        return entry.value if entry else None
+
+    async def set_list_model(
+        self,
+        key: str,
+        values: list[AbstractBaseModel],
+        cache_expire: int,
+        tags: Iterable[str] = (),
+    ) -> None:
+        """
+        Записать список моделей в локальный и основной кэш.
+
+        Args:
+            key (str): ключ для записи списка моделей
+            values (list[AbstractBaseModel]): список моделей для записи
+            cache_expire (int): время жизни кэша в секундах
+            tags (Iterable[str]): теги, по которым сбрасывается список
+
+        """
+        await self.__cache.set_list_model(key, values, cache_expire, tags)
+        for range_key in self.__ranges.pop(key, set()):
+            self.__remove(range_key)
+        self.__put(
+            key, list(values) or None, self.__size_of(values), cache_expire
+        )
+
+    async def get_list_model(
+        self, key: str, model: type[AbstractBaseModel]
+    ) -> list[AbstractBaseModel] | None:
+        """
+        Получить список моделей из локального кэша, а при промахе из основного.
+
+        Args:
+            key (str): ключ для получения списка моделей
+            model (AbstractBaseModel): модель для десериализации
+
+        Returns:
+            list[AbstractBaseModel] | None: возвращает список моделей или None, если список не найден
+
+        """
+        entry = await self.get_list_entry(key, model)
+        return entry.value if entry else None
+
+    async def get_one_entry(
+        self, key: str, model: type[AbstractBaseModel]
+    ) -> CacheEntry[AbstractBaseModel | None] | None:
+        """
+        Получить одну модель и оставшееся время её жизни в основном кэше.
+
+        Args:
+            key (str): ключ для получения модели
+            model (AbstractBaseModel): модель для десериализации
+
+        Returns:
+            CacheEntry[AbstractBaseModel | None] | None: возвращает запись кэша или None, если модель не найдена
+
+        """
+        entry = self.__get(key)
+        if entry is not None:
+            return entry
+        entry = await self.__cache.get_one_entry(key, model)
+        if entry is not None:
+            size = self.__size_of([entry.value]) if entry.value else 0
+            self.__put(key, entry.value, size, entry.ttl)
+        return entry
+
+    async def get_list_entry(
+        self,
+        key: str,
+        model: type[AbstractBaseModel],
+        start: int = 0,
+        stop: int = -1,
+    ) -> CacheEntry[list[AbstractBaseModel] | None] | None:
+        """
+        Получить список моделей и оставшееся время его жизни в основном кэше.
+
+        Часть списка хранится в локальном кэше отдельно от целого списка,
+        под ключом с диапазоном, и удаляется при записи списка.
+
+        Args:
+            key (str): ключ для получения списка моделей
+            model (AbstractBaseModel): модель для десериализации
+            start (int): индекс первой модели
+            stop (int): индекс последней модели, -1 для конца списка
+
+        Returns:
+            CacheEntry[list[AbstractBaseModel] | None] | None: возвращает запись кэша или None, если список не найден
+
+        """
+        local_key = (
+            key if (start, stop) == (0, -1) else f"{key}[{start}:{stop}]"
+        )
+        entry = self.__get(local_key)
+        if entry is not None:
+            return CacheEntry(
+                None if entry.value is None else list(entry.value), entry.ttl
+            )
+        entry = await self.__cache.get_list_entry(key, model, start, stop)
+        if entry is not None:
+            values = None if entry.value is None else list(entry.value)
+            self.__put(
+                local_key,
+                values,
+                self.__size_of(values or []),
+                entry.ttl,
+                list_key="" if local_key == key else key,
+            )
+        return entry
+
+    async def set_many_models(
+        self,
+        values: Mapping[str, AbstractBaseModel | None],
+        cache_expire: int,
+        tags: Mapping[str, Iterable[str]] | None = None,
+    ) -> None:
+        """
+        Записать несколько моделей в локальный и основной кэш.
+
+        Args:
+            values (Mapping[str, AbstractBaseModel | None]): модели по ключам,
+                None записывается как отметка об отсутствии модели
+            cache_expire (int): время жизни кэша в секундах
+            tags (Mapping[str, Iterable[str]] | None): теги, по которым
+                сбрасываются модели, по ключам
+
+        """
+        await self.__cache.set_many_models(values, cache_expire, tags)
+        for key, value in values.items():
+            size = self.__size_of([value]) if value else 0
+            self.__put(key, value, size, cache_expire)
+
+    async def get_many_models(
+        self, keys: list[str], model: type[AbstractBaseModel]
+    ) -> list[CacheEntry[AbstractBaseModel | None] | None]:
+        """
+        Получить несколько моделей из локального кэша, а промахи одним
+        запросом из основного.
+
+        Args:
+            keys (list[str]): ключи для получения моделей
+            model (AbstractBaseModel): модель для десериализации
+
+        Returns:
+            list[CacheEntry[AbstractBaseModel | None] | None]: записи кэша в порядке ключей, None для отсутствующих
+
+        """
+        entries = [self.__get(key) for key in keys]
+        missing = [key for key, entry in zip(keys, entries) if entry is None]
+        if not missing:
+            return entries
+        found = dict(
+            zip(missing, await self.__cache.get_many_models(missing, model))
+        )
+        for key, entry in found.items():
+            if entry is not None:
+                size = self.__size_of([entry.value]) if entry.value else 0
+                self.__put(key, entry.value, size, entry.ttl)
+        return [
+            entry if entry is not None else found[key]
+            for key, entry in zip(keys, entries)
+        ]
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> int:
+        """
+        Удалить записи с тегами из основного кэша и очистить локальный.
+
+        Локальный кэш не хранит теги, поэтому очищается целиком. Локальные
+        кэши других процессов не очищаются и устаревают не позже чем через
+        `ttl` секунд.
+
+        Args:
+            tags (Iterable[str]): теги для сброса
+
+        Returns:
+            int: количество удалённых записей основного кэша
+
+        """
+        deleted = await self.__cache.invalidate_tags(tags)
+        self.__entries.clear()
+        self.__ranges.clear()
+        self.__memory = 0
+        return deleted
+
+    def build_key(self, key_prefix: str, *args: Any) -> str:
+        """
+        Создать ключ кэша средствами основного кэша.
+
+        Args:
+            key_prefix (str): префикс ключа
+            *args: аргументы для создания ключа
+
+        Returns:
+            str: созданный ключ
+
+        """
+        return self.__cache.build_key(key_prefix, *args)
+
+    def __get(self, key: str) -> CacheEntry[Any] | None:
+        entry = self.__entries.get(key)
+        now = time.monotonic()
+        if entry is None:
+            self.__count(key, "miss")
+            return None
+        if entry.expires_at <= now:
+            self.__remove(key)
+            self.__count(key, "miss")
+            return None
+        self.__entries.move_to_end(key)
+        self.__count(key, "hit")
+        return CacheEntry(entry.value, entry.cache_expires_at - now)
+
+    def __put(
+        self, key: str, value: Any, size: int, ttl: float, list_key: str = ""
+    ) -> None:
+        self.__remove(key)
+        local_ttl = min(ttl, self.__ttl)
+        if (
+            local_ttl <= 0
+            or self.__max_entries <= 0
+            or size > self.__max_memory
+        ):
+            return
+        now = time.monotonic()
+        self.__entries[key] = _Entry(
+            value, now + local_ttl, now + ttl, size, list_key
+        )
+        self.__memory += size
+        if list_key:
+            self.__ranges.setdefault(list_key, set()).add(key)
+        while (
+            len(self.__entries) > self.__max_entries
+            or self.__memory > self.__max_memory
+        ):
+            evicted_key, evicted = self.__entries.popitem(last=False)
+            self.__forget(evicted_key, evicted)
+            MEMORY_CACHE_EVICTIONS.labels(get_key_prefix(evicted_key)).inc()
+            self.__logger.debug("Evicted key `%s` from memory.", evicted_key)
+
+    def __remove(self, key: str) -> None:
+        entry = self.__entries.pop(key, None)
+        if entry is not None:
+            self.__forget(key, entry)
+
+    def __forget(self, key: str, entry: _Entry) -> None:
+        """Учесть удаление записи в объёме и в диапазонах списков."""
+        self.__memory -= entry.size
+        ranges = self.__ranges.get(entry.list_key)
+        if ranges is not None:
+            ranges.discard(key)
+            if not ranges:
+                del self.__ranges[entry.list_key]
+
+    @staticmethod
+    def __count(key: str, result: str) -> None:
+        MEMORY_CACHE_REQUESTS.labels(get_key_prefix(key), result).inc()
+
+    @staticmethod
+    def __size_of(values: list[AbstractBaseModel]) -> int:
+        return sum(
+            len(value.__pydantic_serializer__.to_json(value))
+            for value in values
+        )
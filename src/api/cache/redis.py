@@ -1,33 +1,98 @@
+import json
+import math
+import time
+from collections.abc import (
+    Awaitable,
+    Iterable,
+    Iterator,
+    Mapping,
+    Sequence,
+)
+from contextlib import contextmanager
 from logging import Logger
-from typing import Any
+from typing import Any, cast
 
 from redis.asyncio import Redis
+from redis.asyncio.client import Pipeline
+
+from src.api.cache.abstract import (
+    AbstractBaseModel,
+    AbstractModelCache,
+    AbstractResponseCache,
+    CachedResponse,
+    CacheEntry,
+)
+from src.api.cache.codecs import AbstractCodec, JSONCodec, get_codec_by_header
+from src.api.cache.generations import Generations
+from src.api.core.context import add_timing, server_timing
+from src.api.core.metrics import REDIS_LATENCY, count_cache, get_key_prefix
+
+EMPTY_VALUE = b""
+# Версия формата записей, входит во все ключи. Повышается при несовместимом
+# изменении формата, чтобы не читать записи, оставленные прошлыми версиями.
+KEY_VERSION = "v3"
+MISSING_KEY_TTL = -2
+TAG_PREFIX = "Tag"
+
+
+class RedisCache(AbstractModelCache, AbstractResponseCache):
+    """
+    Клиент для работы api с Redis.
 
-from src.api.cache.abstract import AbstractBaseModel, AbstractModelCache
+    Модели хранятся в формате кодека `codec` с однобайтовым заголовком,
+    по которому при чтении выбирается кодек, записавший значение. Значения
+    без заголовка читаются как JSON. Ответы HTTP хранятся в хэшах Redis.
 
+    Если задан `tag_expire`, ключи записей добавляются в сортированные
+    множества их тегов в той же транзакции, что и сами записи, с временем
+    истечения записи в качестве веса. При каждой записи из множества
+    удаляются ключи истёкших записей, поэтому множество не растёт, даже
+    если в тег постоянно пишут. Множество тега живёт `tag_expire` секунд с
+    последней записи, это время должно быть не меньше времени жизни самых
+    долгих записей.
 
-class RedisCache(AbstractModelCache):
-    """
-    Клиент для работы api с Redis.
+    Если заданы `generations`, в ключи с префиксами из `namespaces`
+    добавляются номера поколений индексов, из которых собраны записи, и
+    новое поколение индекса сбрасывает все его записи.
 
     Args:
         redis (Redis): объект для работы с Redis
         logger (Logger): объект для записи в журналы
+        codec (AbstractCodec): кодек для записи моделей
+        tag_expire (int): время жизни множеств тегов в секундах, 0 отключает
+            запись тегов
+        generations (Generations | None): поколения ключей по индексам
+        namespaces (Mapping[str, Sequence[str]] | None): индексы, от
+            которых зависят записи, по префиксам ключей
 
     """
 
     __redis: Redis
     __logger: Logger
+    __codec: AbstractCodec
 
-    def __init__(self, redis: Redis, logger: Logger):
+    def __init__(
+        self,
+        redis: Redis,
+        logger: Logger,
+        codec: AbstractCodec | None = None,
+        tag_expire: int = 0,
+        generations: Generations | None = None,
+        namespaces: Mapping[str, Sequence[str]] | None = None,
+    ):
         self.__redis = redis
         self.__logger = logger
+        self.__codec = codec or JSONCodec()
+        self.__tag_expire = tag_expire
+        self.__generations = generations
+        self.__namespaces = namespaces or {}
 
     async def set_one_model(
         self,
         key: str,
         value: AbstractBaseModel,
         cache_expire: int,
+        tags: Iterable[str] = (),
     ) -> None:
         """
         Записать одну модель в кэш Redis.
@@ -36,11 +101,16 @@ class RedisCache(AbstractModelCache):
             key (str): ключ для записи модели
             value (AbstractBaseModel): модель для записи
             cache_expire (int): время жизни кэша в секундах
+            tags (Iterable[str]): теги, по которым сбрасывается запись
 
         """
-        data = value.model_dump_json()
+        data = self.__encode(value)
         try:
-            await self.__redis.set(key, data, cache_expire)
+            with self.__observe("set_one_model", key):
+                async with self.__redis.pipeline(transaction=True) as pipe:
+                    pipe.set(key, data, cache_expire)
+                    self.__tag(pipe, key, tags, cache_expire)
+                    await pipe.execute()
         except Exception as set_error:
             self.__logger.error(
                 "Error setting value with key `%s::%s`: %s.",
@@ -50,6 +120,32 @@ class RedisCache(AbstractModelCache):
             )
             raise
 
+    async def set_empty(
+        self, key: str, cache_expire: int, tags: Iterable[str] = ()
+    ) -> None:
+        """
+        Записать в кэш Redis отметку об отсутствии модели.
+
+        Args:
+            key (str): ключ для записи отметки
+            cache_expire (int): время жизни отметки в секундах
+            tags (Iterable[str]): теги, по которым сбрасывается отметка
+
+        """
+        try:
+            with self.__observe("set_empty", key):
+                async with self.__redis.pipeline(transaction=True) as pipe:
+                    pipe.set(key, EMPTY_VALUE, cache_expire)
+                    self.__tag(pipe, key, tags, cache_expire)
+                    await pipe.execute()
+        except Exception as set_error:
+            self.__logger.error(
+                "Error setting empty value with key `%s`: %s.",
+                key,
+                set_error,
+            )
+            raise
+
     async def get_one_model(
         self, key: str, model: type[AbstractBaseModel]
     ) -> AbstractBaseModel | None:
@@ -65,7 +161,8 @@ class RedisCache(AbstractModelCache):
 
         """
         try:
-            value = await self.__redis.get(key)
+            with self.__observe("get_one_model", key):
+                value = await self.__redis.get(key)
             if not value:
                 return None
         except Exception as get_error:
@@ -73,28 +170,39 @@ class RedisCache(AbstractModelCache):
                 "Error getting value with key `%s`: %s.", key, get_error
             )
             raise
-        data = model.model_validate_json(value)
-        return data
+        return self.__decode(cast(bytes, value), model)
 
     async def set_list_model(
         self,
         key: str,
         values: list[AbstractBaseModel],
         cache_expire: int,
+        tags: Iterable[str] = (),
     ) -> None:
         """
         Записать список моделей в кэш Redis.
 
+        Список перезаписывается целиком вместе с временем жизни в одной
+        транзакции MULTI/EXEC, поэтому читатели никогда не увидят
+        частично записанный список или список без TTL. Пустой список
+        записывается как отметка об отсутствии моделей.
+
         Args:
             key (str): ключ для записи списка моделей
             values (list[AbstractBaseModel]): список моделей для записи
             cache_expire (int): время жизни кэша в секундах
+            tags (Iterable[str]): теги, по которым сбрасывается список
 
         """
+        data = [self.__encode(value) for value in values] or [EMPTY_VALUE]
         try:
-            for value in values:
-                await self.__redis.lpush(key, value.model_dump_json())  # type: ignore
-            await self.__redis.expire(key, cache_expire)
+            with self.__observe("set_list_model", key):
+                async with self.__redis.pipeline(transaction=True) as pipe:
+                    pipe.delete(key)
+                    pipe.rpush(key, *data)
+                    pipe.expire(key, cache_expire)
+                    self.__tag(pipe, key, tags, cache_expire)
+                    await pipe.execute()
         except Exception as set_error:
             self.__logger.error(
                 "Error setting values with key `%s::%s`: %s.",
@@ -119,9 +227,10 @@ class RedisCache(AbstractModelCache):
 
         """
         try:
-            list_count = await self.__redis.llen(key)  # type: ignore
-            values = await self.__redis.lrange(key, 0, list_count)  # type: ignore
-            values.reverse()
+            with self.__observe("get_list_model", key):
+                values = await cast(
+                    Awaitable[list[bytes]], self.__redis.lrange(key, 0, -1)
+                )
             if not values:
                 return None
         except Exception as get_error:
@@ -129,15 +238,299 @@ class RedisCache(AbstractModelCache):
                 "Error getting values with key `%s`: %s.", key, get_error
             )
             raise
-        data = []
-        for value in values:
-            data.append(model.model_validate_json(value))
-        return data
+        return self.__decode_list(values, model)
+
+    async def get_one_entry(
+        self, key: str, model: type[AbstractBaseModel]
+    ) -> CacheEntry[AbstractBaseModel | None] | None:
+        """
+        Получить одну модель и оставшееся время её жизни из кэша Redis.
+
+        Значение и TTL читаются за один запрос к Redis.
+
+        Args:
+            key (str): ключ для получения модели
+            model (AbstractBaseModel): модель для десериализации
+
+        Returns:
+            CacheEntry[AbstractBaseModel | None] | None: возвращает запись кэша или None, если модель не найдена
+
+        """
+        try:
+            with self.__observe("get_one_entry", key):
+                async with self.__redis.pipeline(transaction=False) as pipe:
+                    pipe.get(key)
+                    pipe.pttl(key)
+                    value, ttl = await pipe.execute()
+            if value is None:
+                return None
+        except Exception as get_error:
+            self.__logger.error(
+                "Error getting value with key `%s`: %s.", key, get_error
+            )
+            raise
+        if value == EMPTY_VALUE:
+            return CacheEntry(None, self.__ttl(ttl))
+        return CacheEntry(self.__decode(value, model), self.__ttl(ttl))
+
+    async def get_list_entry(
+        self,
+        key: str,
+        model: type[AbstractBaseModel],
+        start: int = 0,
+        stop: int = -1,
+    ) -> CacheEntry[list[AbstractBaseModel] | None] | None:
+        """
+        Получить список моделей и оставшееся время его жизни из кэша Redis.
+
+        Список и TTL читаются за один запрос к Redis. Читаются и
+        десериализуются только модели с `start` по `stop` включительно.
+        Отметка об отсутствии моделей возвращается как запись со значением
+        None, а диапазон за концом списка как пустой список.
+
+        Args:
+            key (str): ключ для получения списка моделей
+            model (AbstractBaseModel): модель для десериализации
+            start (int): индекс первой модели
+            stop (int): индекс последней модели, -1 для конца списка
+
+        Returns:
+            CacheEntry[list[AbstractBaseModel] | None] | None: возвращает запись кэша или None, если список не найден
+
+        """
+        try:
+            with self.__observe("get_list_entry", key):
+                async with self.__redis.pipeline(transaction=False) as pipe:
+                    pipe.lrange(key, start, stop)
+                    pipe.pttl(key)
+                    if start != 0:
+                        pipe.lindex(key, 0)
+                    values, ttl, *head = await pipe.execute()
+            if not values and ttl == MISSING_KEY_TTL:
+                return None
+        except Exception as get_error:
+            self.__logger.error(
+                "Error getting values with key `%s`: %s.", key, get_error
+            )
+            raise
+        first = head[0] if head else values[0] if values else None
+        if first == EMPTY_VALUE:
+            return CacheEntry(None, self.__ttl(ttl))
+        return CacheEntry(self.__decode_list(values, model), self.__ttl(ttl))
+
+    async def set_many_models(
+        self,
+        values: Mapping[str, AbstractBaseModel | None],
+        cache_expire: int,
+        tags: Mapping[str, Iterable[str]] | None = None,
+    ) -> None:
+        """
+        Записать несколько моделей в кэш Redis за один запрос.
+
+        Args:
+            values (Mapping[str, AbstractBaseModel | None]): модели по ключам,
+                None записывается как отметка об отсутствии модели
+            cache_expire (int): время жизни кэша в секундах
+            tags (Mapping[str, Iterable[str]] | None): теги, по которым
+                сбрасываются модели, по ключам
+
+        """
+        if not values:
+            return
+        try:
+            with self.__observe("set_many_models", next(iter(values))):
+                async with self.__redis.pipeline(transaction=True) as pipe:
+                    for key, value in values.items():
+                        data = (
+                            EMPTY_VALUE
+                            if value is None
+                            else self.__encode(value)
+                        )
+                        pipe.set(key, data, cache_expire)
+                        if tags:
+                            self.__tag(
+                                pipe, key, tags.get(key, ()), cache_expire
+                            )
+                    await pipe.execute()
+        except Exception as set_error:
+            self.__logger.error(
+                "Error setting values with keys `%s`: %s.",
+                list(values),
+                set_error,
+            )
+            raise
+
+    async def get_many_models(
+        self, keys: list[str], model: type[AbstractBaseModel]
+    ) -> list[CacheEntry[AbstractBaseModel | None] | None]:
+        """
+        Получить несколько моделей и оставшееся время их жизни из кэша Redis.
+
+        Значения (MGET) и TTL читаются за один запрос к Redis.
+
+        Args:
+            keys (list[str]): ключи для получения моделей
+            model (AbstractBaseModel): модель для десериализации
+
+        Returns:
+            list[CacheEntry[AbstractBaseModel | None] | None]: записи кэша в порядке ключей, None для отсутствующих
+
+        """
+        if not keys:
+            return []
+        try:
+            with self.__observe("get_many_models", keys[0]):
+                async with self.__redis.pipeline(transaction=False) as pipe:
+                    pipe.mget(keys)
+                    for key in keys:
+                        pipe.pttl(key)
+                    values, *ttls = await pipe.execute()
+        except Exception as get_error:
+            self.__logger.error(
+                "Error getting values with keys `%s`: %s.", keys, get_error
+            )
+            raise
+        entries: list[CacheEntry[AbstractBaseModel | None] | None] = []
+        for value, ttl in zip(values, ttls):
+            if value is None:
+                entries.append(None)
+            elif value == EMPTY_VALUE:
+                entries.append(CacheEntry(None, self.__ttl(ttl)))
+            else:
+                entries.append(
+                    CacheEntry(self.__decode(value, model), self.__ttl(ttl))
+                )
+        return entries
+
+    async def set_response(
+        self,
+        key: str,
+        response: CachedResponse,
+        cache_expire: int,
+        tags: Iterable[str] = (),
+    ) -> None:
+        """
+        Записать ответ HTTP в кэш Redis.
+
+        Ответ записывается хэшем вместе с временем жизни в одной транзакции.
+
+        Args:
+            key (str): ключ для записи ответа
+            response (CachedResponse): ответ для записи
+            cache_expire (int): время жизни кэша в секундах
+            tags (Iterable[str]): теги, по которым сбрасывается ответ
+
+        """
+        headers = [
+            [name.decode("latin-1"), value.decode("latin-1")]
+            for name, value in response.headers
+        ]
+        try:
+            with self.__observe("set_response", key):
+                async with self.__redis.pipeline(transaction=True) as pipe:
+                    pipe.delete(key)
+                    pipe.hset(
+                        key,
+                        mapping={
+                            "body": response.body,
+                            "headers": json.dumps(headers),
+                            "etag": response.etag,
+                        },
+                    )
+                    pipe.expire(key, cache_expire)
+                    self.__tag(pipe, key, tags, cache_expire)
+                    await pipe.execute()
+        except Exception as set_error:
+            self.__logger.error(
+                "Error setting response with key `%s`: %s.", key, set_error
+            )
+            raise
+
+    async def get_response(self, key: str) -> CacheEntry[CachedResponse] | None:
+        """
+        Получить ответ HTTP и оставшееся время его жизни из кэша Redis.
+
+        Ответ и TTL читаются за один запрос к Redis.
+
+        Args:
+            key (str): ключ для получения ответа
+
+        Returns:
+            CacheEntry[CachedResponse] | None: возвращает запись кэша или None, если ответ не найден
+
+        """
+        try:
+            with self.__observe("get_response", key):
+                async with self.__redis.pipeline(transaction=False) as pipe:
+                    pipe.hgetall(key)
+                    pipe.pttl(key)
+                    values, ttl = await pipe.execute()
+            if b"etag" not in values:
+                return None
+        except Exception as get_error:
+            self.__logger.error(
+                "Error getting response with key `%s`: %s.", key, get_error
+            )
+            raise
+        response = CachedResponse(
+            body=values[b"body"],
+            headers=[
+                (name.encode("latin-1"), value.encode("latin-1"))
+                for name, value in json.loads(values[b"headers"])
+            ],
+            etag=values[b"etag"].decode(),
+        )
+        return CacheEntry(response, self.__ttl(ttl))
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> int:
+        """
+        Удалить из кэша Redis все записи с любым из тегов.
+
+        Множества тегов читаются одним запросом, затем все записи удаляются
+        и исключаются из множеств в одной транзакции. Ключи, добавленные в
+        множества между этими запросами, остаются в множествах и будут
+        удалены при следующем сбросе или истечении.
+
+        Args:
+            tags (Iterable[str]): теги для сброса
+
+        Returns:
+            int: количество удалённых записей
+
+        """
+        tag_keys = [self.build_key(TAG_PREFIX, tag) for tag in tags]
+        if not tag_keys:
+            return 0
+        try:
+            with self.__observe("invalidate_tags", tag_keys[0]):
+                async with self.__redis.pipeline(transaction=False) as pipe:
+                    for tag_key in tag_keys:
+                        pipe.zrange(tag_key, 0, -1)
+                    members = await pipe.execute()
+                keys = set().union(*members)
+                if not keys:
+                    return 0
+                async with self.__redis.pipeline(transaction=True) as pipe:
+                    pipe.delete(*keys)
+                    for tag_key, tag_members in zip(tag_keys, members):
+                        if tag_members:
+                            pipe.zrem(tag_key, *tag_members)
+                    deleted, *_ = await pipe.execute()
+        except Exception as invalidate_error:
+            self.__logger.error(
+                "Error invalidating tags `%s`: %s.", tag_keys, invalidate_error
+            )
+            raise
+        return deleted
 
     def build_key(self, key_prefix: str, *args: Any) -> str:
         """
         Создать ключ для кэша Redis.
 
+        Ключ включает версию формата записей и номера поколений индексов,
+        от которых зависят записи с префиксом `key_prefix`, например
+        `FilmService-v3:g3:<uuid>:`.
+
         Args:
             key_prefix (str): префикс ключа
             *args: аргументы для создания ключа
@@ -155,7 +548,86 @@ class RedisCache(AbstractModelCache):
         if not key:
             self.__logger.error("key value is required")
             raise
-        return f"{key_prefix}-{key}"
+        generation = self.__get_generation(key_prefix)
+        return f"{key_prefix}-{KEY_VERSION}:{generation}{key}"
+
+    def __get_generation(self, key_prefix: str) -> str:
+        indexes = self.__namespaces.get(key_prefix)
+        if not self.__generations or not indexes:
+            return ""
+        generations = ".".join(
+            str(self.__generations.get(index)) for index in indexes
+        )
+        return f"g{generations}:"
+
+    def __tag(
+        self,
+        pipe: Pipeline,
+        key: str,
+        tags: Iterable[str],
+        cache_expire: int,
+    ) -> None:
+        """
+        Добавить в транзакцию запись ключа в множества его тегов и удаление
+        из них ключей истёкших записей.
+        """
+        if not self.__tag_expire:
+            return
+        now = time.time()
+        for tag in set(tags):
+            tag_key = self.build_key(TAG_PREFIX, tag)
+            pipe.zremrangebyscore(tag_key, "-inf", now)
+            pipe.zadd(tag_key, {key: now + cache_expire})
+            pipe.expire(tag_key, self.__tag_expire)
+
+    def __encode(self, value: AbstractBaseModel) -> bytes:
+        return self.__codec.header + self.__codec.encode(value)
+
+    def __decode(
+        self, data: bytes, model: type[AbstractBaseModel]
+    ) -> AbstractBaseModel:
+        with server_timing("build"):
+            return self.__decode_value(data, model)
+
+    def __decode_value(
+        self, data: bytes, model: type[AbstractBaseModel]
+    ) -> AbstractBaseModel:
+        header = data[:1]
+        if header == self.__codec.header:
+            return self.__codec.decode(data[1:], model)
+        if header == b"{":
+            return model.model_validate_json(data)
+        return get_codec_by_header(header).decode(data[1:], model)
+
+    def __decode_list(
+        self, values: list[bytes], model: type[AbstractBaseModel]
+    ) -> list[AbstractBaseModel]:
+        if values == [EMPTY_VALUE]:
+            return []
+        with server_timing("build"):
+            return [self.__decode_value(value, model) for value in values]
+
+    @staticmethod
+    @contextmanager
+    def __observe(operation: str, key: str) -> Iterator[None]:
+        """
+        Учесть время запроса к Redis в метриках и в `Server-Timing`, а
+        ошибку по префиксу ключа.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            count_cache(get_key_prefix(key), "error")
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            REDIS_LATENCY.labels(operation).observe(elapsed)
+            add_timing("cache", elapsed)
+
+    @staticmethod
+    def __ttl(pttl: int) -> float:
+        return pttl / 1000 if pttl >= 0 else math.inf
 
     async def close(self) -> None:
         """
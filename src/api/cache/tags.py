@@ -0,0 +1,68 @@
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from pydantic import BaseModel
+
+LIST_TAG = "lists"
+NESTED_TAGS = {
+    "genre": "genre",
+    "directors": "person",
+    "actors": "person",
+    "writers": "person",
+    "films": "film",
+}
+
+
+def build_tag(entity: str, obj_id: str) -> str:
+    """
+    Создать тег записей кэша, зависящих от одной сущности.
+
+    Args:
+        entity (str): тип сущности, например `film`
+        obj_id (str): идентификатор сущности
+
+    Returns:
+        str: тег, например `film:<uuid>`
+    """
+    return f"{entity}:{obj_id}"
+
+
+def build_list_tag(entity: str) -> str:
+    """
+    Создать тег всех списков сущностей одного типа.
+
+    По этому тегу сбрасываются списки, в которые могла попасть новая
+    сущность.
+
+    Args:
+        entity (str): тип сущности, например `film`
+
+    Returns:
+        str: тег, например `film:lists`
+    """
+    return build_tag(entity, LIST_TAG)
+
+
+def get_model_tags(entity: str, values: Iterable[BaseModel]) -> Iterator[str]:
+    """
+    Получить теги сущностей, данные которых содержатся в моделях.
+
+    Кроме самих моделей учитываются вложенные сущности: жанры и участники
+    фильма, фильмы персоны.
+
+    Args:
+        entity (str): тип сущности моделей
+        values (Iterable[BaseModel]): модели
+
+    Yields:
+        str: теги моделей и вложенных сущностей
+    """
+    for value in values:
+        yield build_tag(entity, value.uuid)  # type: ignore[attr-defined]
+        for field, nested_entity in NESTED_TAGS.items():
+            for item in getattr(value, field, None) or ():
+                yield build_tag(nested_entity, _get_uuid(item))
+
+
+def _get_uuid(item: Any) -> str:
+    return item["uuid"] if isinstance(item, dict) else item.uuid
@@ -0,0 +1,78 @@
+from abc import ABC, abstractmethod
+from typing import NamedTuple
+
+OPERATION_CREATE = "create"
+OPERATION_UPDATE = "update"
+OPERATION_DELETE = "delete"
+OPERATIONS = (OPERATION_CREATE, OPERATION_UPDATE, OPERATION_DELETE)
+
+
+class ChangeEvent(NamedTuple):
+    """
+    Change of one entity in the catalog.
+
+    Attributes:
+        entity (str): The entity type: `film`, `genre` or `person`.
+        obj_id (str): The ID of the changed entity.
+        operation (str): `create`, `update` or `delete`.
+    """
+
+    entity: str
+    obj_id: str
+    operation: str = OPERATION_UPDATE
+
+
+class AbstractChangeFeed(ABC):
+    """
+    Abstract base class for a feed of catalog change events.
+
+    Events are delivered at least once: an event read but not acknowledged
+    is delivered again.
+    """
+
+    @abstractmethod
+    async def start(self) -> None:
+        """
+        Prepare the feed for reading, e.g. create a consumer group.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def read(
+        self, count: int, timeout: float
+    ) -> list[tuple[str, ChangeEvent | None]]:
+        """
+        Read the next events.
+
+        Args:
+            count (int): The maximum number of events to read.
+            timeout (float): The number of seconds to wait for an event.
+
+        Returns:
+            The message IDs with their events. The event is None for a
+            malformed message, which should be acknowledged and skipped.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def ack(self, message_ids: list[str]) -> None:
+        """
+        Acknowledge processed events so they are not delivered again.
+
+        Args:
+            message_ids (list[str]): The IDs of the processed messages.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def publish(self, event: ChangeEvent) -> str:
+        """
+        Publish an event to the feed.
+
+        Args:
+            event (ChangeEvent): The event to publish.
+
+        Returns:
+            The ID of the published message.
+        """
+        raise NotImplementedError
@@ -0,0 +1,141 @@
+import asyncio
+from collections import defaultdict
+from collections.abc import Awaitable, Callable, Mapping
+from contextvars import Context
+from logging import Logger
+from typing import Any
+
+from src.api.changes.abstract import (
+    OPERATION_UPDATE,
+    AbstractChangeFeed,
+    ChangeEvent,
+)
+from src.api.core.metrics import CHANGE_EVENTS
+
+Reload = Callable[[list[str], bool], Awaitable[Any]]
+
+
+class ChangeFeedConsumer:
+    """
+    Фоновое обновление кэша по событиям изменения каталога.
+
+    События читаются из ленты пакетами до `batch_size` штук и
+    группируются по типу сущности. Изменённые сущности каждого типа
+    перезагружаются в кэш одним вызовом `reloads[entity]`, а если
+    сущности добавлены или удалены, сбрасываются и списки этого типа.
+    События подтверждаются только после успешной перезагрузки, поэтому
+    при ошибке (например, если Elastic недоступен) они будут обработаны
+    повторно. События неизвестных сущностей и некорректные сообщения
+    подтверждаются и пропускаются.
+
+    Args:
+        feed (AbstractChangeFeed): лента событий
+        reloads (Mapping[str, Reload]): перезагрузка сущностей в кэш по
+            типу сущности, принимает идентификаторы и признак сброса
+            списков
+        batch_size (int): максимальное количество событий в пакете
+        timeout (float): время ожидания событий в секундах
+        retry_delay (float): пауза после ошибки чтения ленты в секундах
+        logger (Logger): объект для записи в журналы
+    """
+
+    def __init__(
+        self,
+        feed: AbstractChangeFeed,
+        reloads: Mapping[str, Reload],
+        batch_size: int,
+        timeout: float,
+        retry_delay: float,
+        logger: Logger,
+    ):
+        self.__feed = feed
+        self.__reloads = reloads
+        self.__batch_size = batch_size
+        self.__timeout = timeout
+        self.__retry_delay = retry_delay
+        self.__logger = logger
+        self.__task: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        """
+        Подготовить ленту и запустить обработку событий в фоне.
+
+        Ошибка подготовки ленты не прерывает запуск: она повторяется в
+        фоне перед чтением событий.
+        """
+        if self.__task is None:
+            self.__task = asyncio.create_task(self.__run(), context=Context())
+
+    async def close(self) -> None:
+        """Остановить обработку событий."""
+        if self.__task is not None:
+            self.__task.cancel()
+            await asyncio.gather(self.__task, return_exceptions=True)
+            self.__task = None
+
+    async def consume(self) -> int:
+        """
+        Прочитать и обработать один пакет событий.
+
+        Returns:
+            int: количество прочитанных сообщений
+        """
+        messages = await self.__feed.read(self.__batch_size, self.__timeout)
+        if not messages:
+            return 0
+        skipped: list[str] = []
+        batches: dict[str, list[tuple[str, ChangeEvent]]] = defaultdict(list)
+        for message_id, event in messages:
+            if event is None or event.entity not in self.__reloads:
+                CHANGE_EVENTS.labels(
+                    event.entity if event else "unknown", "skipped"
+                ).inc()
+                skipped.append(message_id)
+            else:
+                batches[event.entity].append((message_id, event))
+        acked = await asyncio.gather(
+            *(self.__reload(entity, batch) for entity, batch in batches.items())
+        )
+        await self.__feed.ack(
+            skipped + [message_id for ids in acked for message_id in ids]
+        )
+        return len(messages)
+
+    async def __reload(
+        self, entity: str, batch: list[tuple[str, ChangeEvent]]
+    ) -> list[str]:
+        """
+        Перезагрузить сущности одного типа.
+
+        Returns:
+            list[str]: идентификаторы сообщений, которые можно подтвердить
+        """
+        obj_ids = list(dict.fromkeys(event.obj_id for _, event in batch))
+        lists = any(event.operation != OPERATION_UPDATE for _, event in batch)
+        try:
+            await self.__reloads[entity](obj_ids, lists)
+        except Exception as reload_error:
+            CHANGE_EVENTS.labels(entity, "failed").inc(len(batch))
+            self.__logger.error(
+                "Error reloading %d %s entities: %s.",
+                len(obj_ids),
+                entity,
+                reload_error,
+            )
+            return []
+        CHANGE_EVENTS.labels(entity, "reloaded").inc(len(batch))
+        return [message_id for message_id, _ in batch]
+
+    async def __run(self) -> None:
+        started = False
+        while True:
+            try:
+                if not started:
+                    await self.__feed.start()
+                    started = True
+                await self.consume()
+            except Exception as consume_error:
+                self.__logger.error(
+                    "Error consuming change events: %s.", consume_error
+                )
+                await asyncio.sleep(self.__retry_delay)
@@ -0,0 +1,87 @@
+import asyncio
+import itertools
+import time
+
+from src.api.changes.abstract import AbstractChangeFeed, ChangeEvent
+
+
+class MemoryChangeFeed(AbstractChangeFeed):
+    """
+    Лента изменений каталога в локальной очереди процесса.
+
+    Используется для тестов и запуска без Redis: события доставляются
+    только потребителю в этом же процессе и не сохраняются между
+    перезапусками. Событие, прочитанное, но не подтверждённое за
+    `claim_idle` секунд, доставляется повторно раньше новых.
+
+    Args:
+        claim_idle (float): время, после которого неподтверждённое событие
+            обрабатывается повторно, в секундах
+    """
+
+    def __init__(self, claim_idle: float = 0) -> None:
+        self.__queue: asyncio.Queue[tuple[str, ChangeEvent]] = asyncio.Queue()
+        self.__ids = itertools.count(1)
+        self.__claim_idle = claim_idle
+        self.pending: dict[str, tuple[ChangeEvent, float]] = {}
+
+    async def start(self) -> None:
+        """Ничего не делает: очередь готова сразу."""
+
+    async def read(
+        self, count: int, timeout: float
+    ) -> list[tuple[str, ChangeEvent | None]]:
+        """
+        Прочитать следующие события.
+
+        Сначала забираются зависшие неподтверждённые события, а если их
+        нет, читаются новые с ожиданием до `timeout` секунд.
+
+        Args:
+            count (int): максимальное количество событий
+            timeout (float): время ожидания первого события в секундах
+
+        Returns:
+            list[tuple[str, ChangeEvent | None]]: идентификаторы сообщений и
+            события
+        """
+        now = time.monotonic()
+        messages = [
+            (message_id, event)
+            for message_id, (event, read_at) in self.pending.items()
+            if now - read_at >= self.__claim_idle
+        ][:count]
+        if not messages:
+            try:
+                messages = [await asyncio.wait_for(self.__queue.get(), timeout)]
+            except TimeoutError:
+                return []
+            while len(messages) < count and not self.__queue.empty():
+                messages.append(self.__queue.get_nowait())
+        for message_id, event in messages:
+            self.pending[message_id] = (event, time.monotonic())
+        return list(messages)
+
+    async def ack(self, message_ids: list[str]) -> None:
+        """
+        Подтвердить обработку событий.
+
+        Args:
+            message_ids (list[str]): идентификаторы сообщений
+        """
+        for message_id in message_ids:
+            self.pending.pop(message_id, None)
+
+    async def publish(self, event: ChangeEvent) -> str:
+        """
+        Добавить событие в очередь.
+
+        Args:
+            event (ChangeEvent): событие
+
+        Returns:
+            str: идентификатор сообщения
+        """
+        message_id = str(next(self.__ids))
+        await self.__queue.put((message_id, event))
+        return message_id
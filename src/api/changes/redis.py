@@ -0,0 +1,158 @@
+from logging import Logger
+from typing import Any, cast
+
+from redis.asyncio import Redis
+from redis.exceptions import ResponseError
+
+from src.api.changes.abstract import (
+    OPERATION_UPDATE,
+    OPERATIONS,
+    AbstractChangeFeed,
+    ChangeEvent,
+)
+
+
+class RedisChangeFeed(AbstractChangeFeed):
+    """
+    Лента изменений каталога в потоке Redis (Redis Stream).
+
+    События читаются группой потребителей `group`, поэтому каждое событие
+    обрабатывает один воркер группы. Событие, прочитанное, но не
+    подтверждённое за `claim_idle` секунд (например, если воркер упал или
+    Elastic был недоступен), забирается на повторную обработку.
+
+    Поля сообщения: `entity` (`film`, `genre`, `person`), `id` и
+    необязательное `operation` (`create`, `update`, `delete`).
+
+    Время ожидания чтения должно быть меньше тайм-аута сокета Redis.
+
+    Args:
+        redis (Redis): объект для работы с Redis
+        stream (str): ключ потока
+        group (str): имя группы потребителей
+        consumer (str): имя потребителя, уникальное для воркера
+        claim_idle (float): время, после которого неподтверждённое событие
+            обрабатывается повторно, в секундах
+        max_length (int): приблизительная максимальная длина потока при
+            публикации
+        logger (Logger): объект для записи в журналы
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        stream: str,
+        group: str,
+        consumer: str,
+        claim_idle: float,
+        max_length: int,
+        logger: Logger,
+    ):
+        self.__redis = redis
+        self.__stream = stream
+        self.__group = group
+        self.__consumer = consumer
+        self.__claim_idle = claim_idle
+        self.__max_length = max_length
+        self.__logger = logger
+
+    async def start(self) -> None:
+        """Создать поток и группу потребителей, если их нет."""
+        try:
+            await self.__redis.xgroup_create(
+                self.__stream, self.__group, id="$", mkstream=True
+            )
+        except ResponseError as create_error:
+            if "BUSYGROUP" not in str(create_error):
+                raise
+
+    async def read(
+        self, count: int, timeout: float
+    ) -> list[tuple[str, ChangeEvent | None]]:
+        """
+        Прочитать следующие события.
+
+        Сначала забираются зависшие неподтверждённые события группы, а если
+        их нет, читаются новые с ожиданием до `timeout` секунд.
+
+        Args:
+            count (int): максимальное количество событий
+            timeout (float): время ожидания в секундах
+
+        Returns:
+            list[tuple[str, ChangeEvent | None]]: идентификаторы сообщений и
+            события, None для некорректных сообщений
+        """
+        _, messages, *_ = await self.__redis.xautoclaim(
+            self.__stream,
+            self.__group,
+            self.__consumer,
+            min_idle_time=int(self.__claim_idle * 1000),
+            start_id="0-0",
+            count=count,
+        )
+        if not messages:
+            response = await self.__redis.xreadgroup(
+                self.__group,
+                self.__consumer,
+                {self.__stream: ">"},
+                count=count,
+                block=max(int(timeout * 1000), 1),
+            )
+            streams = cast(list[list[Any]], response)
+            messages = streams[0][1] if streams else []
+        return [
+            (message_id.decode(), self.__parse(message_id, fields))
+            for message_id, fields in messages
+        ]
+
+    async def ack(self, message_ids: list[str]) -> None:
+        """
+        Подтвердить обработку событий.
+
+        Args:
+            message_ids (list[str]): идентификаторы сообщений
+        """
+        if message_ids:
+            await self.__redis.xack(self.__stream, self.__group, *message_ids)
+
+    async def publish(self, event: ChangeEvent) -> str:
+        """
+        Опубликовать событие в потоке.
+
+        Args:
+            event (ChangeEvent): событие
+
+        Returns:
+            str: идентификатор сообщения
+        """
+        message_id = await self.__redis.xadd(
+            self.__stream,
+            {
+                "entity": event.entity,
+                "id": event.obj_id,
+                "operation": event.operation,
+            },
+            maxlen=self.__max_length,
+            approximate=True,
+        )
+        return cast(bytes, message_id).decode()
+
+    def __parse(
+        self, message_id: bytes, fields: dict[bytes, bytes] | None
+    ) -> ChangeEvent | None:
+        values: dict[str, Any] = {
+            name.decode(): value.decode()
+            for name, value in (fields or {}).items()
+        }
+        operation = values.get("operation", OPERATION_UPDATE)
+        if not values.get("entity") or not values.get("id"):
+            operation = None
+        if operation not in OPERATIONS:
+            self.__logger.warning(
+                "Skipping malformed change event `%s`: %s.",
+                message_id.decode(),
+                values,
+            )
+            return None
+        return ChangeEvent(values["entity"], values["id"], operation)
@@ -0,0 +1,80 @@
+import time
+from enum import Enum
+
+
+class CircuitState(str, Enum):
+    closed = "closed"
+    open = "open"
+    half_open = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Предохранитель для обращений к внешнему сервису.
+
+    После `failure_threshold` ошибок подряд предохранитель размыкается и
+    `recovery_timeout` секунд запрещает обращения. Затем пропускается одно
+    пробное обращение: при успехе предохранитель замыкается, при ошибке
+    снова размыкается. Если исход пробного обращения не зарегистрирован за
+    `recovery_timeout` секунд, пропускается следующее пробное обращение.
+
+    Args:
+        failure_threshold (int): количество ошибок подряд для размыкания
+        recovery_timeout (float): время до пробного обращения в секундах
+    """
+
+    def __init__(self, failure_threshold: int, recovery_timeout: float):
+        self.__failure_threshold = failure_threshold
+        self.__recovery_timeout = recovery_timeout
+        self.__failures = 0
+        self.__opened_at = 0.0
+        self.__state = CircuitState.closed
+
+    @property
+    def state(self) -> CircuitState:
+        return self.__state
+
+    @property
+    def recovery_timeout(self) -> float:
+        return self.__recovery_timeout
+
+    def allow(self) -> bool:
+        """
+        Проверить, можно ли выполнить обращение.
+
+        Returns:
+            bool: True, если обращение разрешено
+        """
+        if self.__state == CircuitState.closed:
+            return True
+        now = time.monotonic()
+        if now - self.__opened_at >= self.__recovery_timeout:
+            self.__state = CircuitState.half_open
+            self.__opened_at = now
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Зарегистрировать успешное обращение."""
+        self.__failures = 0
+        self.__state = CircuitState.closed
+
+    def release(self) -> None:
+        """
+        Завершить обращение без исхода, например отменённое.
+
+        Ошибка не учитывается, а если обращение было пробным, следующее
+        пробное обращение пропускается сразу.
+        """
+        if self.__state == CircuitState.half_open:
+            self.__opened_at -= self.__recovery_timeout
+
+    def record_failure(self) -> None:
+        """Зарегистрировать ошибку обращения."""
+        self.__failures += 1
+        if (
+            self.__state == CircuitState.half_open
+            or self.__failures >= self.__failure_threshold
+        ):
+            self.__state = CircuitState.open
+            self.__opened_at = time.monotonic()
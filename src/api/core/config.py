@@ -2,6 +2,7 @@ import os
 from logging import config as logging_config
 
 from dotenv.main import find_dotenv, load_dotenv
+from pydantic import field_validator
 from pydantic.fields import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -11,9 +12,29 @@ from src.core.configs.redis import RedisSettings
 
 load_dotenv(find_dotenv(".env"))
 
+# Значение `index.max_result_window` Elastic по умолчанию: поиск не отдаёт
+# документы дальше этой позиции.
+ELASTIC_MAX_RESULT_WINDOW = 10000
+
 logging_config.dictConfig(LOGGING)
 
 
+class LocalCacheSettings(BaseSettings):
+    """
+    Настройки локального (in-process) кэша одного сервиса.
+
+    Переменные окружения задаются с префиксом сервиса, например
+    `API_LOCAL_CACHE_FOR_FILM_SERVICE_TTL`.
+    """
+
+    model_config = SettingsConfigDict(
+        env_file=".env", env_file_encoding="utf-8", extra="ignore"
+    )
+    ttl: int = 5
+    max_entries: int = 1000
+    max_memory: int = 16 * 1024 * 1024
+
+
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
         env_file=".env", env_file_encoding="utf-8", extra="ignore"
@@ -38,6 +59,113 @@ class Settings(BaseSettings):
     cache_ex_for_persons: int = Field(
         ..., alias="API_CACHE_EXPIRE_FOR_PERSON_SERVICE"
     )
+    cache_stale_ex_for_films: int = Field(
+        0, alias="API_CACHE_STALE_EXPIRE_FOR_FILM_SERVICE"
+    )
+    cache_stale_ex_for_genres: int = Field(
+        0, alias="API_CACHE_STALE_EXPIRE_FOR_GENRES_SERVICE"
+    )
+    cache_stale_ex_for_persons: int = Field(
+        0, alias="API_CACHE_STALE_EXPIRE_FOR_PERSON_SERVICE"
+    )
+    cache_error_ex: int = Field(3600, alias="API_CACHE_STALE_IF_ERROR_EXPIRE")
+    cache_empty_ex: int = Field(30, alias="API_CACHE_EMPTY_EXPIRE")
+    cache_codec: str = Field("json", alias="API_CACHE_CODEC")
+    cache_tags_enabled: bool = Field(True, alias="API_CACHE_TAGS_ENABLED")
+    cache_generations_enabled: bool = Field(
+        True, alias="API_CACHE_GENERATIONS_ENABLED"
+    )
+    cache_generations_refresh: float = Field(
+        1, alias="API_CACHE_GENERATIONS_REFRESH_INTERVAL"
+    )
+
+    batch_max_ids: int = Field(50, alias="API_BATCH_MAX_IDS")
+    superpage_size: int = Field(500, alias="API_SUPERPAGE_SIZE")
+    prefetch_enabled: bool = Field(False, alias="API_PREFETCH_ENABLED")
+    prefetch_max_concurrency: int = Field(
+        4, alias="API_PREFETCH_MAX_CONCURRENCY"
+    )
+    prefetch_max_db_latency: float = Field(
+        0.1, alias="API_PREFETCH_MAX_DB_LATENCY"
+    )
+
+    response_cache_enabled: bool = Field(
+        True, alias="API_RESPONSE_CACHE_ENABLED"
+    )
+
+    change_feed_enabled: bool = Field(False, alias="API_CHANGE_FEED_ENABLED")
+    change_feed_stream: str = Field(
+        "content:changes", alias="API_CHANGE_FEED_STREAM"
+    )
+    change_feed_group: str = Field("api", alias="API_CHANGE_FEED_GROUP")
+    change_feed_batch_size: int = Field(100, alias="API_CHANGE_FEED_BATCH_SIZE")
+    change_feed_timeout: float = Field(0.5, alias="API_CHANGE_FEED_TIMEOUT")
+    change_feed_claim_idle: float = Field(
+        30, alias="API_CHANGE_FEED_CLAIM_IDLE"
+    )
+    change_feed_max_length: int = Field(
+        100000, alias="API_CHANGE_FEED_MAX_LENGTH"
+    )
+    change_feed_retry_delay: float = Field(
+        1, alias="API_CHANGE_FEED_RETRY_DELAY"
+    )
+
+    metrics_enabled: bool = Field(True, alias="API_METRICS_ENABLED")
+    server_timing_enabled: bool = Field(
+        False, alias="API_SERVER_TIMING_ENABLED"
+    )
+
+    health_check_timeout: float = Field(0.5, alias="API_HEALTH_CHECK_TIMEOUT")
+    health_check_cache_ttl: float = Field(1, alias="API_HEALTH_CHECK_CACHE_TTL")
+
+    elastic_breaker_failures: int = Field(
+        5, alias="API_ELASTIC_BREAKER_FAILURE_THRESHOLD"
+    )
+    elastic_breaker_timeout: float = Field(
+        10, alias="API_ELASTIC_BREAKER_RECOVERY_TIMEOUT"
+    )
+    elastic_msearch_window: float = Field(0, alias="API_ELASTIC_MSEARCH_WINDOW")
+    elastic_msearch_max_size: int = Field(
+        32, alias="API_ELASTIC_MSEARCH_MAX_SIZE"
+    )
+
+    local_cache_for_films: LocalCacheSettings = LocalCacheSettings(
+        _env_prefix="API_LOCAL_CACHE_FOR_FILM_SERVICE_"
+    )
+    local_cache_for_genres: LocalCacheSettings = LocalCacheSettings(
+        _env_prefix="API_LOCAL_CACHE_FOR_GENRES_SERVICE_"
+    )
+    local_cache_for_persons: LocalCacheSettings = LocalCacheSettings(
+        _env_prefix="API_LOCAL_CACHE_FOR_PERSON_SERVICE_"
+    )
+
+    @field_validator("superpage_size")
+    @classmethod
+    def check_superpage_size(cls, value: int) -> int:
+        """
+        Проверить, что окна укладываются в `max_result_window` Elastic без
+        остатка, иначе запрос последнего окна выходит за его границу.
+        """
+        if value < 0 or (value and ELASTIC_MAX_RESULT_WINDOW % value):
+            raise ValueError(
+                "API_SUPERPAGE_SIZE must be 0 or divide "
+                f"{ELASTIC_MAX_RESULT_WINDOW}"
+            )
+        return value
+
+    @property
+    def cache_tag_ex(self) -> int:
+        """
+        Время жизни множеств тегов кэша: не меньше времени жизни самых
+        долгих записей, 0 если теги выключены.
+        """
+        if not self.cache_tags_enabled:
+            return 0
+        return self.cache_error_ex + max(
+            self.cache_ex_for_films + self.cache_stale_ex_for_films,
+            self.cache_ex_for_genres + self.cache_stale_ex_for_genres,
+            self.cache_ex_for_persons + self.cache_stale_ex_for_persons,
+        )
 
 
 settings = Settings()
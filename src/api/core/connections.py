@@ -0,0 +1,117 @@
+import asyncio
+from logging import Logger
+from typing import Any
+
+from elastic_transport import NodeSelector, RandomSelector, RoundRobinSelector
+from elasticsearch import AsyncElasticsearch
+from redis.asyncio import BlockingConnectionPool, Redis
+from redis.asyncio.retry import Retry
+from redis.backoff import ExponentialBackoff
+
+from src.core.configs.elastic import ElasticSettings
+from src.core.configs.redis import RedisSettings
+
+NODE_SELECTORS: dict[str, type[NodeSelector]] = {
+    "round_robin": RoundRobinSelector,
+    "random": RandomSelector,
+}
+
+
+def create_redis(settings: RedisSettings) -> Redis:
+    """
+    Создать клиент Redis с ограниченным пулом соединений.
+
+    Когда все соединения пула заняты, запрос ждёт свободное соединение
+    `pool_timeout` секунд, а не открывает новое. Команды, завершившиеся
+    ошибкой соединения или тайм-аутом, повторяются `retries` раз с
+    экспоненциальной задержкой.
+
+    Args:
+        settings (RedisSettings): настройки подключения к Redis
+
+    Returns:
+        Redis: клиент Redis
+    """
+    pool = BlockingConnectionPool(
+        host=settings.host,
+        port=settings.port,
+        max_connections=settings.max_connections,
+        timeout=settings.pool_timeout,
+        socket_timeout=settings.socket_timeout,
+        socket_connect_timeout=settings.socket_connect_timeout,
+        socket_keepalive=settings.socket_keepalive,
+        health_check_interval=settings.health_check_interval,
+        retry=Retry(ExponentialBackoff(cap=0.5, base=0.05), settings.retries),
+        retry_on_timeout=True,
+    )
+    return Redis.from_pool(pool)
+
+
+def create_elastic(settings: ElasticSettings) -> AsyncElasticsearch:
+    """
+    Создать клиент Elastic для одного или нескольких узлов.
+
+    Запросы распределяются по узлам выбранным `node_selector` способом,
+    при включённом сниффинге список узлов обновляется из кластера.
+
+    Args:
+        settings (ElasticSettings): настройки подключения к Elastic
+
+    Returns:
+        AsyncElasticsearch: клиент Elastic
+    """
+    return AsyncElasticsearch(
+        hosts=settings.get_hosts,
+        request_timeout=settings.request_timeout,
+        max_retries=settings.max_retries,
+        retry_on_timeout=settings.retry_on_timeout,
+        connections_per_node=settings.connections_per_node,
+        node_selector_class=NODE_SELECTORS[settings.node_selector],
+        sniff_on_start=settings.sniff_on_start,
+        sniff_on_node_failure=settings.sniff_on_node_failure,
+        sniff_timeout=settings.sniff_timeout,
+    )
+
+
+async def warm_up(clients: dict[str, tuple[Any, int]], logger: Logger) -> None:
+    """
+    Открыть соединения заранее, чтобы первые запросы после запуска не
+    тратили время на их установку.
+
+    Для каждого клиента одновременно выполняется заданное число `ping`,
+    поэтому в пуле открывается столько же соединений. Ошибки не прерывают
+    запуск, а только записываются в журнал.
+
+    Args:
+        clients (dict[str, tuple[Any, int]]): клиенты с методом `ping` и
+            число соединений по именам
+        logger (Logger): объект для записи в журналы
+    """
+
+    async def warm_up_one(name: str, client: Any, connections: int) -> None:
+        results = await asyncio.gather(
+            *(client.ping() for _ in range(connections)),
+            return_exceptions=True,
+        )
+        failed = [
+            result
+            for result in results
+            if isinstance(result, BaseException) or not result
+        ]
+        if failed:
+            logger.warning(
+                "Warm-up of %s failed for %d of %d connections: %s.",
+                name,
+                len(failed),
+                connections,
+                failed[0],
+            )
+        else:
+            logger.info("Warmed up %d %s connections.", connections, name)
+
+    await asyncio.gather(
+        *(
+            warm_up_one(name, client, connections)
+            for name, (client, connections) in clients.items()
+        )
+    )
@@ -0,0 +1,230 @@
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+DEGRADED_HEADER = "X-Degraded"
+SERVER_TIMING_HEADER = "Server-Timing"
+SERVER_TIMING_REQUEST_HEADER = "X-Server-Timing"
+
+
+@dataclass
+class RequestContext:
+    """
+    Состояние обработки одного HTTP-запроса.
+
+    Attributes:
+        degraded (bool): ответ собран из устаревшего кэша, потому что
+            Elastic недоступен
+        stale (bool): ответ собран из устаревшей записи кэша, которая
+            обновляется в фоне
+        timings (dict[str, float] | None): суммарное время этапов обработки
+            в секундах или None, если замеры выключены
+        cache_hits (int): попадания в кэш
+        cache_misses (int): промахи кэша
+        tags (set[str] | None): теги сущностей, из которых собран ответ, или
+            None, если теги не собираются
+    """
+
+    degraded: bool = False
+    stale: bool = False
+    timings: dict[str, float] | None = None
+    cache_hits: int = 0
+    cache_misses: int = 0
+    tags: set[str] | None = None
+
+
+_request_context: ContextVar[RequestContext | None] = ContextVar(
+    "request_context", default=None
+)
+
+
+def get_request_context() -> RequestContext | None:
+    """
+    Получить состояние текущего HTTP-запроса.
+
+    Returns:
+        RequestContext | None: состояние запроса или None вне запроса
+    """
+    return _request_context.get()
+
+
+def mark_degraded() -> None:
+    """Отметить текущий ответ как собранный из устаревшего кэша."""
+    context = _request_context.get()
+    if context is not None:
+        context.degraded = True
+
+
+def mark_stale() -> None:
+    """Отметить текущий ответ как собранный из устаревшей записи кэша."""
+    context = _request_context.get()
+    if context is not None:
+        context.stale = True
+
+
+def add_timing(name: str, seconds: float) -> None:
+    """
+    Добавить время этапа обработки текущего HTTP-запроса.
+
+    Время одноимённых этапов суммируется. Вне запроса или при выключенных
+    замерах ничего не делает.
+
+    Args:
+        name (str): этап, например `cache` или `es`
+        seconds (float): время в секундах
+    """
+    context = _request_context.get()
+    if context is not None and context.timings is not None:
+        context.timings[name] = context.timings.get(name, 0) + seconds
+
+
+@contextmanager
+def server_timing(name: str) -> Iterator[None]:
+    """
+    Замерить время этапа обработки текущего HTTP-запроса.
+
+    Args:
+        name (str): этап, например `build` или `serialize`
+    """
+    context = _request_context.get()
+    if context is None or context.timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        context.timings[name] = (
+            context.timings.get(name, 0) + time.perf_counter() - start
+        )
+
+
+def mark_cache(hit: bool) -> None:
+    """
+    Учесть попадание или промах кэша в текущем HTTP-запросе.
+
+    Args:
+        hit (bool): было ли попадание
+    """
+    context = _request_context.get()
+    if context is None:
+        return
+    if hit:
+        context.cache_hits += 1
+    else:
+        context.cache_misses += 1
+
+
+def add_tags(tags: Iterable[str]) -> None:
+    """
+    Добавить теги сущностей, из которых собирается текущий ответ.
+
+    Вне запроса или если теги не собираются, `tags` не перебираются.
+
+    Args:
+        tags (Iterable[str]): теги, например `film:<uuid>`
+    """
+    context = _request_context.get()
+    if context is not None and context.tags is not None:
+        context.tags.update(tags)
+
+
+class RequestContextMiddleware:
+    """
+    ASGI middleware, создающий RequestContext для каждого HTTP-запроса.
+
+    Если ответ собран из устаревшего кэша, добавляет заголовок
+    `X-Degraded: elastic-unavailable`.
+
+    Если замеры включены настройкой или запрос передан с заголовком
+    `X-Server-Timing`, добавляет заголовок `Server-Timing` с суммарным
+    временем обращений к кэшу (`cache`, с результатом `hit`, `miss` или
+    `partial`), запросов к Elastic (`es`), сборки моделей (`build`),
+    сериализации ответа (`serialize`) и всей обработки (`total`) в
+    миллисекундах. Время параллельных обращений суммируется.
+
+    Args:
+        app (ASGIApp): приложение
+        server_timing (bool): добавлять ли `Server-Timing` ко всем ответам
+    """
+
+    def __init__(self, app: ASGIApp, server_timing: bool = False):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        context = RequestContext()
+        if (
+            self.server_timing
+            or SERVER_TIMING_REQUEST_HEADER.lower() in Headers(scope=scope)
+        ):
+            context.timings = {}
+        token = _request_context.set(context)
+        start = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and (
+                context.degraded or context.timings is not None
+            ):
+                headers = list(message.get("headers", []))
+                if context.degraded:
+                    headers.append(
+                        (
+                            DEGRADED_HEADER.lower().encode(),
+                            b"elastic-unavailable",
+                        )
+                    )
+                if context.timings is not None:
+                    headers.append(
+                        (
+                            SERVER_TIMING_HEADER.lower().encode(),
+                            self.build_server_timing(
+                                context, time.perf_counter() - start
+                            ).encode(),
+                        )
+                    )
+                message["headers"] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_context.reset(token)
+
+    @staticmethod
+    def build_server_timing(context: RequestContext, total: float) -> str:
+        """
+        Создать значение заголовка `Server-Timing`.
+
+        Args:
+            context (RequestContext): состояние запроса
+            total (float): время обработки запроса в секундах
+
+        Returns:
+            str: значение заголовка
+        """
+        timings = dict(context.timings or {})
+        metrics = []
+        if context.cache_hits and context.cache_misses:
+            status = "partial"
+        elif context.cache_hits:
+            status = "hit"
+        elif context.cache_misses:
+            status = "miss"
+        else:
+            status = None
+        if status or "cache" in timings:
+            cache = f'cache;desc="{status}"' if status else "cache"
+            metrics.append(f"{cache};dur={timings.pop('cache', 0) * 1000:.2f}")
+        for name, seconds in timings.items():
+            metrics.append(f"{name};dur={seconds * 1000:.2f}")
+        metrics.append(f"total;dur={total * 1000:.2f}")
+        return ", ".join(metrics)
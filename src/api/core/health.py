@@ -0,0 +1,105 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from src.api.core.singleflight import SingleFlight
+from src.api.models.api.health import DependencyHealth, Health
+
+STATUS_OK = "ok"
+STATUS_UNAVAILABLE = "unavailable"
+
+
+class HealthChecker:
+    """
+    Проверка готовности зависимостей api.
+
+    Все зависимости проверяются одновременно, каждая с ограничением по
+    времени. Результат хранится `cache_ttl` секунд, а одновременные
+    проверки объединяются в одну, поэтому частые запросы балансировщика
+    не нагружают Redis и Elastic.
+
+    Args:
+        checks (dict[str, Callable[[], Awaitable[Any]]]): проверки по именам
+            зависимостей, зависимость доступна, если проверка вернула
+            истинное значение
+        timeout (float): время ожидания одной проверки в секундах
+        cache_ttl (float): время хранения результата в секундах
+    """
+
+    def __init__(
+        self,
+        checks: dict[str, Callable[[], Awaitable[Any]]],
+        timeout: float,
+        cache_ttl: float,
+    ):
+        self.__checks = checks
+        self.__timeout = timeout
+        self.__cache_ttl = cache_ttl
+        self.__result: Health | None = None
+        self.__checked_at = 0.0
+        self.__flight = SingleFlight("HealthChecker")
+
+    async def check(self) -> Health:
+        """
+        Получить состояние зависимостей.
+
+        Returns:
+            Health: состояние `ok`, если доступны все зависимости, иначе
+            `unavailable`, и результаты проверки каждой зависимости
+        """
+        if (
+            self.__result is not None
+            and time.monotonic() - self.__checked_at < self.__cache_ttl
+        ):
+            return self.__result
+        return await self.__flight.do("health", self.__run)
+
+    async def __run(self) -> Health:
+        results = await asyncio.gather(
+            *(self.__check_one(check) for check in self.__checks.values())
+        )
+        checks = dict(zip(self.__checks, results))
+        status = (
+            STATUS_OK
+            if all(result.status == STATUS_OK for result in results)
+            else STATUS_UNAVAILABLE
+        )
+        self.__result = Health(status=status, checks=checks)
+        self.__checked_at = time.monotonic()
+        return self.__result
+
+    async def __check_one(
+        self, check: Callable[[], Awaitable[Any]]
+    ) -> DependencyHealth:
+        start = time.perf_counter()
+        try:
+            ok = await asyncio.wait_for(check(), self.__timeout)
+        except asyncio.TimeoutError:
+            return DependencyHealth(
+                status=STATUS_UNAVAILABLE,
+                latency_ms=self.__elapsed_ms(start),
+                error="timeout",
+            )
+        except Exception as check_error:
+            return DependencyHealth(
+                status=STATUS_UNAVAILABLE,
+                latency_ms=self.__elapsed_ms(start),
+                error=type(check_error).__name__,
+            )
+        return DependencyHealth(
+            status=STATUS_OK if ok else STATUS_UNAVAILABLE,
+            latency_ms=self.__elapsed_ms(start),
+            error=None if ok else "ping failed",
+        )
+
+    @staticmethod
+    def __elapsed_ms(start: float) -> float:
+        return round((time.perf_counter() - start) * 1000, 2)
+
+
+health_checker: HealthChecker | None = None
+
+
+async def get_health_checker() -> HealthChecker | None:
+    return health_checker
@@ -0,0 +1,201 @@
+import os
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+UNMATCHED_ROUTE = "<unmatched>"
+
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+BATCH_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+REQUEST_LATENCY = Histogram(
+    "api_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+RESPONSE_SIZE = Histogram(
+    "api_response_size_bytes",
+    "HTTP response body size by route template.",
+    ["method", "route"],
+    buckets=SIZE_BUCKETS,
+)
+CACHE_REQUESTS = Counter(
+    "api_cache_requests_total",
+    "Cache lookups by key prefix and result (hit, miss, error).",
+    ["prefix", "result"],
+)
+MEMORY_CACHE_REQUESTS = Counter(
+    "api_memory_cache_requests_total",
+    "In-process cache lookups by key prefix and result (hit, miss).",
+    ["prefix", "result"],
+)
+MEMORY_CACHE_EVICTIONS = Counter(
+    "api_memory_cache_evictions_total",
+    "Entries evicted from the in-process cache by key prefix.",
+    ["prefix"],
+)
+REDIS_LATENCY = Histogram(
+    "api_redis_duration_seconds",
+    "Redis command latency by cache operation.",
+    ["operation"],
+    buckets=LATENCY_BUCKETS,
+)
+ELASTIC_LATENCY = Histogram(
+    "api_elastic_duration_seconds",
+    "Elastic request latency by index and operation.",
+    ["index", "operation"],
+    buckets=LATENCY_BUCKETS,
+)
+ELASTIC_ERRORS = Counter(
+    "api_elastic_errors_total",
+    "Failed or rejected Elastic requests by index and operation.",
+    ["index", "operation"],
+)
+ELASTIC_MSEARCH_BATCH_SIZE = Histogram(
+    "api_elastic_msearch_batch_size",
+    "Searches sent in one Elastic _msearch request.",
+    buckets=BATCH_BUCKETS,
+)
+SINGLEFLIGHT_CALLS = Counter(
+    "api_singleflight_calls_total",
+    "Calls by service and result (executed, coalesced into a running call).",
+    ["service", "result"],
+)
+PREFETCHES = Counter(
+    "api_prefetch_total",
+    "Next page prefetches by key prefix and result "
+    "(fetched, cached, skipped_busy, skipped_slow, failed).",
+    ["prefix", "result"],
+)
+PREFETCHES_USED = Counter(
+    "api_prefetch_used_total",
+    "Prefetched pages later served from the cache by key prefix.",
+    ["prefix"],
+)
+CHANGE_EVENTS = Counter(
+    "api_change_events_total",
+    "Catalog change events by entity and result (reloaded, failed, skipped).",
+    ["entity", "result"],
+)
+
+
+def count_cache(prefix: str, result: str) -> None:
+    """
+    Учесть обращение к кэшу.
+
+    Args:
+        prefix (str): префикс ключей кэша, например `FilmService`
+        result (str): `hit`, `miss` или `error`
+    """
+    CACHE_REQUESTS.labels(prefix, result).inc()
+
+
+def get_key_prefix(key: str) -> str:
+    """
+    Получить префикс ключа кэша, созданного `build_key`.
+
+    Args:
+        key (str): ключ кэша
+
+    Returns:
+        str: префикс ключа
+    """
+    return key.partition("-")[0]
+
+
+def generate_metrics() -> tuple[bytes, str]:
+    """
+    Собрать метрики в текстовом формате Prometheus.
+
+    Если задана переменная окружения `PROMETHEUS_MULTIPROC_DIR`, метрики
+    собираются из файлов всех воркеров gunicorn, иначе из текущего процесса.
+
+    Returns:
+        tuple[bytes, str]: метрики и тип содержимого ответа
+    """
+    if os.environ.get(MULTIPROC_DIR_ENV):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware, измеряющий время обработки и размер тела ответов
+    HTTP-запросов.
+
+    Метрики размечаются шаблоном маршрута, например
+    `/api/v1/films/{film_id}`, а не путём запроса, чтобы число рядов не
+    зависело от идентификаторов. Маршрут берётся из запроса после
+    обработки, а если запрос не дошёл до роутера (например, ответ отдан
+    из кэша ответов), подбирается по маршрутам приложения.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = 500
+        size = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            route = self.__get_route(scope)
+            method = scope["method"]
+            REQUEST_LATENCY.labels(method, route, str(status)).observe(elapsed)
+            RESPONSE_SIZE.labels(method, route).observe(size)
+
+    @staticmethod
+    def __get_route(scope: Scope) -> str:
+        route = scope.get("route")
+        if route is not None:
+            return route.path
+        app = scope.get("app")
+        for candidate in getattr(app, "routes", ()):
+            match, _ = candidate.matches(scope)
+            if match == Match.FULL:
+                return candidate.path
+        return UNMATCHED_ROUTE
@@ -0,0 +1,249 @@
+import hashlib
+import math
+from urllib.parse import parse_qsl, urlencode
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.api.cache.abstract import CachedResponse
+from src.api.cache.redis import get_redis
+from src.api.core.context import get_request_context, mark_cache
+from src.api.core.metrics import count_cache
+from src.core.utils.logger import create_logger
+
+CACHE_HEADER = "X-Cache"
+BYPASS_HEADER = "X-Cache-Bypass"
+KEY_PREFIX = "ResponseCache"
+CACHED_HEADERS = {b"content-type", b"x-next-cursor"}
+
+logger = create_logger("API ResponseCacheMiddleware")
+
+
+class ResponseCacheMiddleware:
+    """
+    ASGI middleware, кэширующий готовые ответы GET-запросов в Redis и
+    обрабатывающий условные запросы.
+
+    Ответ ищется в кэше по пути и отсортированным параметрам запроса и при
+    попадании отдаётся как есть, без обращения к эндпоинту и pydantic.
+    Кэшируются только успешные ответы, собранные не из устаревших или
+    просроченных записей кэша моделей, иначе время устаревания ответа
+    складывалось бы с временем устаревания записей. Такие ответы получают
+    `Cache-Control: max-age=0`. Поэтому middleware должен располагаться
+    внутри RequestContextMiddleware. Ошибки кэша не прерывают запрос, а
+    записываются в журнал и учитываются в метриках кэша.
+    Запрос с заголовком `X-Cache-Bypass` обходит кэш. В ответ добавляется
+    заголовок `X-Cache: HIT` или `X-Cache: MISS`.
+
+    Пока ответ собирается, сервисы отмечают теги сущностей, из которых он
+    собран, и ответ записывается в кэш с этими тегами, чтобы сбрасываться
+    вместе с записями кэша моделей.
+
+    Успешные ответы получают сильный `ETag`, который хранится в кэше вместе
+    с ответом, и `Cache-Control: max-age` по оставшемуся времени жизни
+    ответа. Если `ETag` совпадает с `If-None-Match`, отдаётся
+    304 Not Modified без тела. Условные запросы обрабатываются и при
+    выключенном кэше ответов.
+
+    Args:
+        app (ASGIApp): приложение
+        ttls (dict[str, int]): время жизни ответов в секундах по префиксам
+            путей
+        enabled (bool): включён ли кэш ответов
+    """
+
+    def __init__(
+        self, app: ASGIApp, ttls: dict[str, int], enabled: bool = True
+    ):
+        self.app = app
+        self.ttls = ttls
+        self.enabled = enabled
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        ttl = self.__get_ttl(scope)
+        if not ttl:
+            await self.app(scope, receive, send)
+            return
+        request_headers = Headers(scope=scope)
+        if_none_match = request_headers.get("if-none-match")
+        cache = None
+        if self.enabled and BYPASS_HEADER.lower() not in request_headers:
+            cache = await get_redis()
+        key = (
+            cache.build_key(KEY_PREFIX, self.build_key(scope)) if cache else ""
+        )
+        entry = None
+        if cache:
+            try:
+                entry = await cache.get_response(key)
+            except Exception as get_error:
+                logger.warning(
+                    "Error getting cached response `%s`: %s.", key, get_error
+                )
+                entry = None
+            else:
+                count_cache(KEY_PREFIX, "hit" if entry else "miss")
+                mark_cache(bool(entry))
+        if entry:
+            await self.__send(
+                send,
+                entry.value,
+                max_age=entry.ttl,
+                cache_status=b"HIT",
+                not_modified=self.__matches(if_none_match, entry.value.etag),
+            )
+            return
+
+        context = get_request_context()
+        if cache and context:
+            context.tags = set()
+        start: Message = {}
+        body: list[bytes] = []
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start
+            if start.get("status", 200) != 200:
+                await send(message)
+            elif message["type"] == "http.response.start":
+                start = message
+                if message["status"] != 200:
+                    await send(message)
+            elif message["type"] == "http.response.body":
+                body.append(message.get("body", b""))
+            else:
+                await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+        if start.get("status") != 200:
+            return
+        uncacheable = bool(context and (context.degraded or context.stale))
+        content = b"".join(body)
+        headers = list(start.get("headers", []))
+        response = CachedResponse(
+            body=content,
+            headers=[
+                (name, value)
+                for name, value in headers
+                if name.lower() not in (b"content-length", b"etag")
+            ],
+            etag=self.build_etag(content),
+        )
+        await self.__send(
+            send,
+            response,
+            max_age=0 if uncacheable else ttl,
+            cache_status=b"MISS" if cache else None,
+            not_modified=self.__matches(if_none_match, response.etag),
+        )
+        if not cache or uncacheable:
+            return
+        response = response._replace(
+            headers=[
+                (name, value)
+                for name, value in response.headers
+                if name.lower() in CACHED_HEADERS
+            ]
+        )
+        try:
+            await cache.set_response(
+                key,
+                response,
+                ttl,
+                context.tags if context and context.tags else (),
+            )
+        except Exception as set_error:
+            logger.warning("Error caching response `%s`: %s.", key, set_error)
+
+    @staticmethod
+    def build_key(scope: Scope) -> str:
+        """
+        Создать часть ключа кэша из пути и параметров запроса.
+
+        Параметры сортируются по имени, порядок повторяющихся параметров
+        сохраняется. Полный ключ с префиксом и поколениями индексов
+        создаёт кэш.
+
+        Args:
+            scope (Scope): запрос
+
+        Returns:
+            str: путь и параметры запроса
+        """
+        params = sorted(
+            parse_qsl(
+                scope["query_string"].decode("latin-1"),
+                keep_blank_values=True,
+            ),
+            key=lambda param: param[0],
+        )
+        return f"{scope['path'].lower()}?{urlencode(params)}"
+
+    @staticmethod
+    def build_etag(body: bytes) -> str:
+        """
+        Создать сильный ETag для тела ответа.
+
+        Args:
+            body (bytes): тело ответа
+
+        Returns:
+            str: ETag в кавычках
+        """
+        return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+    def __get_ttl(self, scope: Scope) -> int:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            return 0
+        for prefix, ttl in self.ttls.items():
+            if scope["path"].startswith(prefix):
+                return ttl
+        return 0
+
+    @staticmethod
+    def __matches(if_none_match: str | None, etag: str) -> bool:
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        return any(
+            tag.strip().removeprefix("W/") == etag
+            for tag in if_none_match.split(",")
+        )
+
+    @staticmethod
+    async def __send(
+        send: Send,
+        response: CachedResponse,
+        max_age: float,
+        cache_status: bytes | None,
+        not_modified: bool,
+    ) -> None:
+        max_age = 0 if math.isinf(max_age) else int(max_age)
+        headers = [
+            (b"etag", response.etag.encode()),
+            (b"cache-control", f"max-age={max_age}".encode()),
+        ]
+        if cache_status:
+            headers.append((CACHE_HEADER.lower().encode(), cache_status))
+        if not_modified:
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 304,
+                    "headers": headers,
+                }
+            )
+            await send({"type": "http.response.body", "body": b""})
+            return
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    *response.headers,
+                    (b"content-length", str(len(response.body)).encode()),
+                    *headers,
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": response.body})
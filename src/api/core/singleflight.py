@@ -0,0 +1,52 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+from src.api.core.metrics import SINGLEFLIGHT_CALLS
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Объединение одновременных вызовов с одинаковым ключом.
+
+    Пока вызов для ключа выполняется, остальные вызовы с тем же ключом не
+    запускают свой, а ожидают результат уже выполняющегося. Выполненные и
+    объединённые вызовы учитываются в метриках по имени сервиса.
+
+    Args:
+        service (str): имя сервиса для метрик
+    """
+
+    def __init__(self, service: str):
+        self.__calls: dict[str, asyncio.Future[Any]] = {}
+        self.__executed = SINGLEFLIGHT_CALLS.labels(service, "executed")
+        self.__coalesced = SINGLEFLIGHT_CALLS.labels(service, "coalesced")
+
+    async def do(self, key: str, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Выполнить вызов или присоединиться к уже выполняющемуся.
+
+        Args:
+            key (str): ключ вызова
+            func (Callable[[], Awaitable[T]]): функция для выполнения
+
+        Returns:
+            T: результат вызова
+        """
+        call = self.__calls.get(key)
+        if call is None:
+            call = asyncio.ensure_future(func())
+            self.__calls[key] = call
+            call.add_done_callback(lambda done: self.__forget(key, done))
+            self.__executed.inc()
+        else:
+            self.__coalesced.inc()
+        return await asyncio.shield(call)
+
+    def __forget(self, key: str, call: asyncio.Future[Any]) -> None:
+        if self.__calls.get(key) is call:
+            del self.__calls[key]
+        if not call.cancelled():
+            call.exception()
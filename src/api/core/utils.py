@@ -1,12 +1,46 @@
-from src.api.models.api.v1.person import FilmForPerson
+from functools import lru_cache
+from typing import Any
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from src.api.core.context import server_timing
 from src.api.models.db.person import PersonDB
 
 
-def build_films_field(person: PersonDB) -> list[FilmForPerson] | None:
-    if person.films:
-        return [
-            FilmForPerson(uuid=film.uuid, roles=film.roles)
-            for film in person.films
-        ]
-    else:
-        return None
+def build_person(person: PersonDB) -> dict[str, Any]:
+    return {
+        "uuid": person.uuid,
+        "full_name": person.full_name,
+        "films": person.films or None,
+    }
+
+
+@lru_cache
+def get_type_adapter(response_type: Any) -> TypeAdapter[Any]:
+    return TypeAdapter(response_type)
+
+
+def json_response(response_type: Any, content: Any) -> Response:
+    """
+    Собрать JSON-ответ из моделей базы данных.
+
+    Модели ответа собираются из атрибутов моделей базы данных и сразу
+    сериализуются в JSON в pydantic-core, минуя пересоздание моделей в
+    эндпоинте и повторную валидацию и сериализацию по `response_model`
+    в FastAPI.
+
+    Args:
+        response_type (Any): тип ответа, например `Film` или
+            `list[FilmForFilmsList]`
+        content (Any): модели базы данных или словари с полями ответа
+
+    Returns:
+        Response: JSON-ответ
+    """
+    adapter = get_type_adapter(response_type)
+    with server_timing("serialize"):
+        body = adapter.dump_json(
+            adapter.validate_python(content, from_attributes=True)
+        )
+    return Response(content=body, media_type="application/json")
@@ -6,11 +6,35 @@ from pydantic import BaseModel
 AbstractBaseModel = TypeVar("AbstractBaseModel", bound=BaseModel)
 
 
+class DBUnavailableError(Exception):
+    """
+    Raised when the database cannot serve a request.
+    """
+
+
+class InvalidCursorError(ValueError):
+    """
+    Raised when page cursor values do not match the sort of the request.
+    """
+
+
 class AbstractDBClient(ABC):
     """
     Abstract class for interacting with a database.
+
+    Only the fields of the requested model are read from the database unless
+    the `source_includes` or `source_excludes` arguments say otherwise.
     """
 
+    @property
+    def latency(self) -> float:
+        """
+        Smoothed latency of recent requests to the database in seconds.
+
+        Implementations that do not track latency always return 0.
+        """
+        return 0.0
+
     @abstractmethod
     async def get_by_id(
         self, obj_id: str, model: type[AbstractBaseModel], **kwargs: Any
@@ -28,6 +52,23 @@ class AbstractDBClient(ABC):
         """
         raise NotImplementedError
 
+    @abstractmethod
+    async def get_by_ids(
+        self, obj_ids: list[str], model: type[AbstractBaseModel], **kwargs: Any
+    ) -> list[AbstractBaseModel | None]:
+        """
+        Retrieve many objects by their IDs in one request.
+
+        Args:
+            obj_ids (list[str]): The IDs of the objects to retrieve.
+            model (AbstractBaseModel): The model to get.
+            **kwargs: Additional arguments to pass to the database.
+
+        Returns:
+            list[AbstractBaseModel | None]: The objects in the order of the IDs, None for objects that were not found.
+        """
+        raise NotImplementedError
+
     @abstractmethod
     async def get_all(
         self,
@@ -75,3 +116,28 @@ class AbstractDBClient(ABC):
             list[AbstractBaseModel] | None: A list of objects that match the search query, or None if no objects were found.
         """
         raise NotImplementedError
+
+    @abstractmethod
+    async def get_page_after(
+        self,
+        page_size: int,
+        model: type[AbstractBaseModel],
+        search_after: list[Any] | None,
+        **kwargs: Any,
+    ) -> tuple[list[AbstractBaseModel], list[Any] | None]:
+        """
+        Retrieve a page of objects following the given sort values.
+
+        The cost of a page does not depend on how deep it is.
+
+        Args:
+            page_size (int): The number of objects to retrieve per page.
+            model (AbstractBaseModel): The model to get.
+            search_after (list[Any] | None): The sort values of the last object
+                of the previous page, or None for the first page.
+            **kwargs: Additional arguments to pass to the database.
+
+        Returns:
+            tuple[list[AbstractBaseModel], list[Any] | None]: The objects and the sort values of the last of them, or None if there is no next page.
+        """
+        raise NotImplementedError
@@ -1,26 +1,85 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
 from logging import Logger
-from typing import Any
+from typing import Any, NoReturn, get_args
 
-from elasticsearch import AsyncElasticsearch, NotFoundError
+from elasticsearch import (
+    ApiError,
+    AsyncElasticsearch,
+    NotFoundError,
+    TransportError,
+)
 
-from src.api.db.abstract import AbstractBaseModel, AbstractDBClient
+from src.api.core.circuit_breaker import CircuitBreaker
+from src.api.core.context import add_timing, server_timing
+from src.api.core.metrics import ELASTIC_ERRORS, ELASTIC_LATENCY
+from src.api.db.abstract import (
+    AbstractBaseModel,
+    AbstractDBClient,
+    DBUnavailableError,
+    InvalidCursorError,
+)
+from src.api.db.msearch import MSearchBatcher, MSearchError
+
+LATENCY_SMOOTHING = 0.2
+SEARCH_BODY_FIELDS = {"from_": "from"}
+SEARCH_SKIPPED_PARAMS = {
+    "index",
+    "filter_path",
+    "source_includes",
+    "source_excludes",
+}
+# Так Elastic передаёт в значениях сортировки бесконечности, например
+# значение сортировки документа без числового поля.
+INFINITY_SORT_VALUES = ("Infinity", "-Infinity")
+MSEARCH_FILTER_PATH = (
+    "responses.hits.hits._source,responses.hits.hits.sort,"
+    "responses.error,responses.status"
+)
 
 
 class ElasticDB(AbstractDBClient):
-    """Клиент для работы api с Elastic."""
+    """Клиент для работы api с Elastic.
+
+    Если задано `msearch_window`, поисковые запросы, поступившие в течение
+    этого времени, отправляются в Elastic одним запросом `_msearch`.
+    """
 
     __es: AsyncElasticsearch
     __logger: Logger
+    __breaker: CircuitBreaker
+    __batcher: MSearchBatcher | None
+    __latency: float
 
-    def __init__(self, es: AsyncElasticsearch, logger: Logger):
+    def __init__(
+        self,
+        es: AsyncElasticsearch,
+        logger: Logger,
+        breaker: CircuitBreaker,
+        msearch_window: float = 0,
+        msearch_max_size: int = 32,
+    ):
         """Инициализация экземпляра класса.
 
         Args:
             es (AsyncElasticsearch): экземпляр класса AsyncElasticsearch
             logger (Logger): экземпляр класса Logger
+            breaker (CircuitBreaker): предохранитель для запросов к Elastic
+            msearch_window (float): время сбора поисковых запросов в один
+                `_msearch` в секундах, 0 отключает объединение
+            msearch_max_size (int): максимальное количество поисковых
+                запросов в одном `_msearch`
         """
         self.__es = es
         self.__logger = logger
+        self.__breaker = breaker
+        self.__batcher = None
+        self.__latency = 0.0
+        if msearch_window > 0:
+            self.__batcher = MSearchBatcher(
+                self.__msearch, msearch_window, msearch_max_size
+            )
 
     async def get_by_id(
         self, obj_id: str, model: type[AbstractBaseModel], **kwargs: Any
@@ -40,10 +99,49 @@ class ElasticDB(AbstractDBClient):
             return None
         await self.__validate_index(index)
         try:
-            doc = await self.__es.get(index=index, id=obj_id)
-        except (NotFoundError, ConnectionError):
+            doc = await self.__request(
+                self.__es.get,
+                index=index,
+                id=obj_id,
+                **self.__source(model, kwargs),
+            )
+        except NotFoundError:
             return None
-        return model(**doc["_source"])
+        with server_timing("build"):
+            return model(**doc["_source"])
+
+    async def get_by_ids(
+        self, obj_ids: list[str], model: type[AbstractBaseModel], **kwargs: Any
+    ) -> list[AbstractBaseModel | None]:
+        """Получить объекты по их идентификаторам одним запросом `_mget`.
+
+        Args:
+            obj_ids (list[str]): идентификаторы объектов
+            model (AbstractBaseModel): модель для выдачи
+            **kwargs: дополнительные параметры запроса
+
+        Returns:
+            list[AbstractBaseModel | None]: возвращает объекты в порядке идентификаторов, None для ненайденных
+        """
+        index = kwargs.get("index")
+        if not index or not obj_ids:
+            return [None] * len(obj_ids)
+        await self.__validate_index(index)
+        try:
+            docs = await self.__request(
+                self.__es.mget,
+                index=index,
+                ids=obj_ids,
+                filter_path="docs.found,docs._source",
+                **self.__source(model, kwargs),
+            )
+        except NotFoundError:
+            return [None] * len(obj_ids)
+        with server_timing("build"):
+            return [
+                model(**doc["_source"]) if doc.get("found") else None
+                for doc in docs["docs"]
+            ]
 
     async def get_all(
         self,
@@ -68,19 +166,21 @@ class ElasticDB(AbstractDBClient):
             return None
         await self.__validate_index(index)
         try:
-            docs = await self.__es.search(
+            docs = await self.__search(
                 index=index,
                 filter_path=kwargs.get("filter_path"),
                 query=kwargs.get("query"),
                 from_=(page_number - 1) * page_size,
                 size=page_size,
                 sort=kwargs.get("sort"),
+                **self.__source(model, kwargs),
             )
-        except (NotFoundError, ConnectionError):
+        except NotFoundError:
             return None
         if not docs:
             return None
-        return [model(**doc["_source"]) for doc in docs["hits"]["hits"]]
+        with server_timing("build"):
+            return [model(**doc["_source"]) for doc in docs["hits"]["hits"]]
 
     async def get_search_by_query(
         self,
@@ -113,19 +213,245 @@ class ElasticDB(AbstractDBClient):
         else:
             body = None
         try:
-            docs = await self.__es.search(
+            docs = await self.__search(
                 index=index,
                 filter_path="hits.hits._source",
                 query=body,
                 from_=(page_number - 1) * page_size,
                 size=page_size,
                 sort=kwargs.get("sort"),
+                **self.__source(model, kwargs),
             )
-        except (NotFoundError, ConnectionError):
+        except NotFoundError:
             return None
         if not docs:
             return None
-        return [model(**doc["_source"]) for doc in docs["hits"]["hits"]]
+        with server_timing("build"):
+            return [model(**doc["_source"]) for doc in docs["hits"]["hits"]]
+
+    async def get_page_after(
+        self,
+        page_size: int,
+        model: type[AbstractBaseModel],
+        search_after: list[Any] | None,
+        **kwargs: Any,
+    ) -> tuple[list[AbstractBaseModel], list[Any] | None]:
+        """Получить страницу объектов после заданных значений сортировки.
+
+        Используется `search_after` с сортировкой по `uuid` для разрешения
+        равенств, поэтому стоимость запроса не зависит от глубины страницы.
+        Запрашивается на один объект больше, чтобы узнать, есть ли следующая
+        страница.
+
+        Args:
+            page_size (int): количество объектов на странице
+            model (AbstractBaseModel): модель для десериализации
+            search_after (list[Any] | None): значения сортировки последнего
+                объекта предыдущей страницы или None для первой страницы
+            **kwargs: дополнительные параметры запроса
+
+        Returns:
+            tuple[list[AbstractBaseModel], list[Any] | None]: возвращает список объектов и значения сортировки последнего из них или None, если следующей страницы нет
+        """
+        index = kwargs.get("index")
+        if not index:
+            return [], None
+        await self.__validate_index(index)
+        sort = [*(kwargs.get("sort") or ["_score"]), {"uuid": "asc"}]
+        if search_after is not None:
+            self.__check_search_after(search_after, sort, model)
+        try:
+            docs = await self.__search(
+                index=index,
+                filter_path="hits.hits._source,hits.hits.sort",
+                query=kwargs.get("query"),
+                size=page_size + 1,
+                sort=sort,
+                search_after=search_after,
+                track_total_hits=False,
+                **self.__source(model, kwargs),
+            )
+        except NotFoundError:
+            return [], None
+        except (ApiError, MSearchError) as search_error:
+            status = (
+                search_error.status
+                if isinstance(search_error, MSearchError)
+                else search_error.meta.status
+            )
+            if search_after is None or status >= 500:
+                raise
+            raise InvalidCursorError(str(search_error)) from search_error
+        hits = docs["hits"]["hits"] if docs else []
+        next_search_after = None
+        if len(hits) > page_size:
+            hits = hits[:page_size]
+            next_search_after = hits[-1]["sort"]
+        with server_timing("build"):
+            return [model(**hit["_source"]) for hit in hits], next_search_after
+
+    @staticmethod
+    def __check_search_after(
+        search_after: list[Any],
+        sort: list[Any],
+        model: type[AbstractBaseModel],
+    ) -> None:
+        """Проверить, что значения курсора подходят к сортировке запроса.
+
+        Значений должно быть столько же, сколько полей сортировки, включая
+        `uuid`. Для `_score` и числовых полей модели значения должны быть
+        числами, для остальных полей строками.
+
+        Args:
+            search_after (list[Any]): значения сортировки из курсора
+            sort (list[Any]): сортировка запроса
+            model (AbstractBaseModel): модель для десериализации
+
+        Raises:
+            InvalidCursorError: если значения не подходят к сортировке
+        """
+        if len(search_after) != len(sort):
+            raise InvalidCursorError(
+                f"Cursor has {len(search_after)} values, expected {len(sort)}."
+            )
+        for value, field in zip(search_after, sort):
+            name = field if isinstance(field, str) else next(iter(field))
+            info = model.model_fields.get(name.split(".")[0])
+            annotation = info.annotation if info else str
+            types = get_args(annotation) or (annotation,)
+            if name == "_score" or float in types or int in types:
+                valid = (
+                    isinstance(value, int | float)
+                    and not isinstance(value, bool)
+                ) or value in INFINITY_SORT_VALUES
+            else:
+                valid = isinstance(value, str)
+            if not valid:
+                raise InvalidCursorError(
+                    f"Cursor value `{value}` does not match field `{name}`."
+                )
+
+    @staticmethod
+    def __source(
+        model: type[AbstractBaseModel], kwargs: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Получить параметры `_source` для запроса.
+
+        По умолчанию из Elastic запрашиваются только поля модели.
+
+        Args:
+            model (AbstractBaseModel): модель для десериализации
+            kwargs (dict[str, Any]): дополнительные параметры запроса
+
+        Returns:
+            dict[str, Any]: параметры `source_includes` и `source_excludes`
+        """
+        includes = kwargs.get("source_includes")
+        if includes is None:
+            includes = [
+                field.alias or name
+                for name, field in model.model_fields.items()
+            ]
+        source: dict[str, Any] = {"source_includes": includes}
+        if kwargs.get("source_excludes"):
+            source["source_excludes"] = kwargs["source_excludes"]
+        return source
+
+    async def __search(self, **params: Any) -> Any:
+        """Выполнить поисковый запрос к Elastic.
+
+        Если включено объединение запросов, поиск отправляется в составе
+        `_msearch`, иначе отдельным запросом `_search`.
+
+        Args:
+            **params: параметры метода `search` клиента Elastic
+
+        Returns:
+            Any: ответ Elastic
+        """
+        if self.__batcher is None:
+            return await self.__request(self.__es.search, **params)
+        body = {
+            SEARCH_BODY_FIELDS.get(name, name): value
+            for name, value in params.items()
+            if value is not None and name not in SEARCH_SKIPPED_PARAMS
+        }
+        source = {
+            kind: params[f"source_{kind}"]
+            for kind in ("includes", "excludes")
+            if params.get(f"source_{kind}") is not None
+        }
+        if source:
+            body["_source"] = source
+        return await self.__batcher.search(params["index"], body)
+
+    async def __msearch(self, searches: list[dict[str, Any]]) -> Any:
+        return await self.__request(
+            self.__es.msearch,
+            searches=searches,
+            filter_path=MSEARCH_FILTER_PATH,
+        )
+
+    async def __request(
+        self, method: Callable[..., Awaitable[Any]], **params: Any
+    ) -> Any:
+        """Выполнить запрос к Elastic через предохранитель.
+
+        Время запроса и ошибки учитываются в метриках по индексу и методу
+        клиента, время запроса также в `Server-Timing`.
+
+        Args:
+            method (Callable): метод клиента Elastic
+            **params: параметры запроса
+
+        Raises:
+            DBUnavailableError: если Elastic недоступен или предохранитель разомкнут
+
+        Returns:
+            Any: ответ Elastic
+        """
+        labels = (str(params.get("index", "*")), method.__name__)
+        if not self.__breaker.allow():
+            ELASTIC_ERRORS.labels(*labels).inc()
+            raise DBUnavailableError("Elastic is unavailable.")
+        start = time.perf_counter()
+        try:
+            response = await method(**params)
+        except ApiError as api_error:
+            if api_error.meta.status < 500:
+                self.__breaker.record_success()
+                raise
+            ELASTIC_ERRORS.labels(*labels).inc()
+            self.__on_failure(api_error)
+        except TransportError as transport_error:
+            ELASTIC_ERRORS.labels(*labels).inc()
+            self.__on_failure(transport_error)
+        except asyncio.CancelledError:
+            # Отмена (остановка сервиса, отключение клиента) ничего не
+            # говорит о состоянии Elastic, но освобождает пробное обращение.
+            self.__breaker.release()
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            ELASTIC_LATENCY.labels(*labels).observe(elapsed)
+            add_timing("es", elapsed)
+            self.__latency += LATENCY_SMOOTHING * (elapsed - self.__latency)
+        self.__breaker.record_success()
+        return response
+
+    @property
+    def latency(self) -> float:
+        """Сглаженная задержка последних запросов к Elastic в секундах."""
+        return self.__latency
+
+    def __on_failure(self, error: Exception) -> NoReturn:
+        self.__breaker.record_failure()
+        self.__logger.error(
+            "Elastic request failed, circuit is %s: %s.",
+            self.__breaker.state.value,
+            error,
+        )
+        raise DBUnavailableError("Elastic is unavailable.") from error
 
     async def __validate_index(self, index: str | None) -> str | None:
         """Проверить, что индекс существует.
@@ -0,0 +1,119 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from contextvars import Context
+from typing import Any
+
+from src.api.core.context import server_timing
+from src.api.core.metrics import ELASTIC_MSEARCH_BATCH_SIZE
+from src.api.db.abstract import DBUnavailableError
+
+
+class MSearchError(Exception):
+    """Ошибка одного поиска из запроса `_msearch`."""
+
+    def __init__(self, status: int, error: Any):
+        super().__init__(f"Search failed with status {status}: {error}")
+        self.status = status
+        self.error = error
+
+
+class MSearchBatcher:
+    """
+    Объединение одновременных поисковых запросов к Elastic в `_msearch`.
+
+    Поиски, поступившие в течение `window` секунд после первого из них,
+    отправляются одним запросом `_msearch`, а результаты раздаются
+    ожидающим вызовам. Пакет отправляется сразу, если в нём набралось
+    `max_size` поисков. Размеры пакетов учитываются в метриках.
+
+    Отсутствующий индекс (404) возвращается как None, ошибки Elastic
+    (5xx) как DBUnavailableError, остальные ошибки как MSearchError. Если
+    не удался весь запрос, его ошибка передаётся всем вызовам пакета.
+
+    Args:
+        send (Callable[[list[dict[str, Any]]], Awaitable[Any]]): функция,
+            отправляющая тела запроса `_msearch` и возвращающая ответ
+        window (float): время сбора пакета в секундах
+        max_size (int): максимальное количество поисков в пакете
+    """
+
+    def __init__(
+        self,
+        send: Callable[[list[dict[str, Any]]], Awaitable[Any]],
+        window: float,
+        max_size: int,
+    ):
+        self.__send = send
+        self.__window = window
+        self.__max_size = max_size
+        self.__pending: list[
+            tuple[dict[str, Any], dict[str, Any], asyncio.Future[Any]]
+        ] = []
+        self.__timer: asyncio.TimerHandle | None = None
+        self.__tasks: set[asyncio.Task[None]] = set()
+
+    async def search(self, index: str, body: dict[str, Any]) -> Any:
+        """
+        Выполнить поиск в составе пакета.
+
+        Args:
+            index (str): имя индекса
+            body (dict[str, Any]): тело поискового запроса
+
+        Returns:
+            Any: ответ поиска или None, если индекс не найден
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.__pending.append(({"index": index}, body, future))
+        if len(self.__pending) >= self.__max_size:
+            self.__flush()
+        elif self.__timer is None:
+            self.__timer = loop.call_later(
+                self.__window, self.__flush, context=Context()
+            )
+        with server_timing("es"):
+            return await future
+
+    def __flush(self) -> None:
+        if self.__timer is not None:
+            self.__timer.cancel()
+            self.__timer = None
+        batch, self.__pending = self.__pending, []
+        if not batch:
+            return
+        # Пакет выполняется вне контекста запросов, время ожидания
+        # учитывается в Server-Timing каждого запроса отдельно.
+        task = asyncio.create_task(self.__execute(batch), context=Context())
+        self.__tasks.add(task)
+        task.add_done_callback(self.__tasks.discard)
+
+    async def __execute(
+        self,
+        batch: list[tuple[dict[str, Any], dict[str, Any], asyncio.Future[Any]]],
+    ) -> None:
+        ELASTIC_MSEARCH_BATCH_SIZE.observe(len(batch))
+        searches: list[dict[str, Any]] = []
+        for header, body, _ in batch:
+            searches.extend((header, body))
+        try:
+            response = await self.__send(searches)
+        except Exception as send_error:
+            for *_, future in batch:
+                if not future.done():
+                    future.set_exception(send_error)
+            return
+        for (*_, future), item in zip(batch, response["responses"]):
+            if future.done():
+                continue
+            status = item.pop("status", 200)
+            if "error" not in item:
+                future.set_result(item)
+            elif status == 404:
+                future.set_result(None)
+            elif status >= 500:
+                future.set_exception(
+                    DBUnavailableError("Elastic is unavailable.")
+                )
+            else:
+                future.set_exception(MSearchError(status, item["error"]))
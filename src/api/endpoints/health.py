@@ -0,0 +1,46 @@
+from http import HTTPStatus
+
+from fastapi import APIRouter, Depends, Response
+
+from src.api.core.health import STATUS_OK, HealthChecker, get_health_checker
+from src.api.core.utils import json_response
+from src.api.models.api.health import Health
+
+router = APIRouter()
+
+
+@router.get("/live", response_model=Health, summary="Liveness probe")
+async def live() -> Response:
+    """Check that the worker is running and its event loop responds
+
+    Does not touch Redis or Elastic.
+
+    Returns:
+    - **Health**: Always `ok`
+    """
+    return json_response(Health, {"status": STATUS_OK})
+
+
+@router.get(
+    "/ready",
+    response_model=Health,
+    summary="Readiness probe",
+    responses={HTTPStatus.SERVICE_UNAVAILABLE: {"model": Health}},
+)
+async def ready(
+    health_checker: HealthChecker = Depends(get_health_checker),
+) -> Response:
+    """Check that the worker can reach Redis and Elastic
+
+    Both dependencies are pinged concurrently with a timeout, the result is
+    cached for a short interval.
+
+    Returns:
+    - **Health**: The overall status and the status and latency of every
+      dependency, with the 503 status code if any dependency is unavailable
+    """
+    health = await health_checker.check()
+    response = json_response(Health, health)
+    if health.status != STATUS_OK:
+        response.status_code = HTTPStatus.SERVICE_UNAVAILABLE
+    return response
@@ -0,0 +1,12 @@
+from fastapi import APIRouter, Response
+
+from src.api.core.metrics import generate_metrics
+
+router = APIRouter()
+
+
+@router.get("", include_in_schema=False)
+def metrics() -> Response:
+    """Get the metrics of all api workers in the Prometheus text format"""
+    content, media_type = generate_metrics()
+    return Response(content, media_type=media_type)
@@ -2,10 +2,17 @@ from http import HTTPStatus
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Path, Query
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Response
 
-from src.api.models.api.v1.film import Film, FilmForFilmsList
+from src.api.core.utils import json_response
+from src.api.models.api.v1.film import Film, FilmForFilmsList, FilmsBatch
 from src.api.services.film import FilmService, get_film_service
+from src.api.validators.batch import batch_ids_validators
+from src.api.validators.cursor import (
+    cursor_validators,
+    decode_cursor,
+    set_next_cursor,
+)
 from src.api.validators.films import FilmFieldsToSort
 from src.api.validators.pagination import PaginatedParams, get_paginated_params
 from src.api.validators.search import search_query_validators
@@ -13,6 +20,36 @@ from src.api.validators.search import search_query_validators
 router = APIRouter()
 
 
+@router.get(
+    "/batch", response_model=FilmsBatch, summary="Get film details by ids"
+)
+async def films_batch(
+    film_uuids: Annotated[list[UUID], batch_ids_validators],
+    film_service: FilmService = Depends(get_film_service),
+) -> Response:
+    """
+    Get film details by ids
+
+    Args:
+    - **ids** (list[str]): The UUIDs of the films to get
+
+    Returns:
+    - **FilmsBatch**: The found films in the order of the ids and the ids
+      of the films that do not exist
+    """
+    film_ids = [str(film_uuid) for film_uuid in film_uuids]
+    films = await film_service.get_by_ids(film_ids)
+    return json_response(
+        FilmsBatch,
+        {
+            "items": [film for film in films if film],
+            "missing": [
+                film_id for film_id, film in zip(film_ids, films) if not film
+            ],
+        },
+    )
+
+
 @router.get("/{film_id}", response_model=Film, summary="Get film details by id")
 async def film_details(
     film_uuid: Annotated[
@@ -25,7 +62,7 @@ async def film_details(
         ),
     ],
     film_service: FilmService = Depends(get_film_service),
-) -> Film:
+) -> Response:
     """
     Get film details by id
 
@@ -43,16 +80,7 @@ async def film_details(
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND, detail="film not found"
         )
-    return Film(
-        uuid=film.uuid,
-        title=film.title,
-        imdb_rating=film.imdb_rating,
-        genre=film.genre,
-        description=film.description,
-        directors=film.directors,
-        actors=film.actors,
-        writers=film.writers,
-    )
+    return json_response(Film, film)
 
 
 @router.get(
@@ -79,9 +107,10 @@ async def films(
             examples=["-imdb_rating", "imdb_rating", "-title.raw", "title.raw"],
         ),
     ] = FilmFieldsToSort.desc_rating,
+    cursor: Annotated[str | None, cursor_validators] = None,
     paginated_params: PaginatedParams = Depends(get_paginated_params),
     film_service: FilmService = Depends(get_film_service),
-) -> list[FilmForFilmsList]:
+) -> Response:
     """
     Get a list of films.
 
@@ -90,6 +119,8 @@ async def films(
     - **page_size** (int): The size of the page to get (default: 5)
     - **genre** (str): The UUID of the genre to filter movies
     - **sort** (ValidFieldsToSort): The name of the field to sort movies
+    - **cursor** (str): The cursor of the page to get, the cursor of the next
+      page is returned in the `X-Next-Cursor` header
 
     Returns:
     - **list[FilmForFilmsList]**: The list of films
@@ -97,6 +128,21 @@ async def films(
     Raises:
         HTTPException: If no films are found
     """
+    if cursor is not None:
+        paginated_params.validate(1, page_size)
+        page = await film_service.get_films_page(
+            page_size=page_size,
+            search_after=decode_cursor(cursor),
+            genre_uuid=str(genre_uuid) if genre_uuid else None,
+            sort=sort,
+        )
+        if not page or not page.items:
+            raise HTTPException(
+                status_code=HTTPStatus.NOT_FOUND, detail="films not found"
+            )
+        response = json_response(list[FilmForFilmsList], page.items)
+        set_next_cursor(response, page.next_search_after)
+        return response
     paginated_params.validate(page_number, page_size)
     films = await film_service.get_films(
         **paginated_params.get(), genre_uuid=genre_uuid, sort=sort
@@ -105,12 +151,7 @@ async def films(
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND, detail="films not found"
         )
-    return [
-        FilmForFilmsList(
-            uuid=film.uuid, title=film.title, imdb_rating=film.imdb_rating
-        )
-        for film in films
-    ]
+    return json_response(list[FilmForFilmsList], films)
 
 
 @router.get(
@@ -125,9 +166,10 @@ async def films_search_by_title(
         str | None,
         search_query_validators,
     ] = "",
+    cursor: Annotated[str | None, cursor_validators] = None,
     paginated_params: PaginatedParams = Depends(get_paginated_params),
     film_service: FilmService = Depends(get_film_service),
-) -> list[FilmForFilmsList]:
+) -> Response:
     """
     Get a list of films based on a search query.
 
@@ -135,6 +177,8 @@ async def films_search_by_title(
     - **page_number** (int): The number of the page to get (default: 1)
     - **page_size** (int): The size of the page to get (default: 5)
     - **query** (str): The query to search movies
+    - **cursor** (str): The cursor of the page to get, the cursor of the next
+      page is returned in the `X-Next-Cursor` header
 
     Returns:
     - **list[FilmForFilmsList]**: The list of films
@@ -143,6 +187,21 @@ async def films_search_by_title(
         HTTPException: If no films are found
     """
     field = "title"
+    if cursor is not None:
+        paginated_params.validate(1, page_size)
+        page = await film_service.get_search_page(
+            page_size=page_size,
+            search_after=decode_cursor(cursor),
+            search_query=search_query,
+            field=field,
+        )
+        if not page or not page.items:
+            raise HTTPException(
+                status_code=HTTPStatus.NOT_FOUND, detail="films not found"
+            )
+        response = json_response(list[FilmForFilmsList], page.items)
+        set_next_cursor(response, page.next_search_after)
+        return response
     paginated_params.validate(page_number, page_size)
     films = await film_service.get_search(
         **paginated_params.get(), search_query=search_query, field=field
@@ -151,9 +210,4 @@ async def films_search_by_title(
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND, detail="films not found"
         )
-    return [
-        FilmForFilmsList(
-            uuid=film.uuid, title=film.title, imdb_rating=film.imdb_rating
-        )
-        for film in films
-    ]
+    return json_response(list[FilmForFilmsList], films)
@@ -2,15 +2,53 @@ from http import HTTPStatus
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Path
+from fastapi import APIRouter, Depends, HTTPException, Path, Response
 
-from src.api.models.api.v1.genre import Genre
+from src.api.core.utils import json_response
+from src.api.models.api.v1.genre import Genre, GenresBatch
 from src.api.services.genre import GenreService, get_genre_service
+from src.api.validators.batch import batch_ids_validators
+from src.api.validators.cursor import (
+    cursor_validators,
+    decode_cursor,
+    set_next_cursor,
+)
 from src.api.validators.pagination import PaginatedParams, get_paginated_params
 
 router = APIRouter()
 
 
+@router.get(
+    "/batch", response_model=GenresBatch, summary="Get genre details by ids"
+)
+async def genres_batch(
+    genre_uuids: Annotated[list[UUID], batch_ids_validators],
+    genre_service: GenreService = Depends(get_genre_service),
+) -> Response:
+    """Get genre details by ids
+
+    Args:
+    - **ids** (list[str]): The UUIDs of the genres to get
+
+    Returns:
+    - **GenresBatch**: The found genres in the order of the ids and the ids
+      of the genres that do not exist
+    """
+    genre_ids = [str(genre_uuid) for genre_uuid in genre_uuids]
+    genres = await genre_service.get_by_ids(genre_ids)
+    return json_response(
+        GenresBatch,
+        {
+            "items": [genre for genre in genres if genre],
+            "missing": [
+                genre_id
+                for genre_id, genre in zip(genre_ids, genres)
+                if not genre
+            ],
+        },
+    )
+
+
 @router.get(
     "/{genre_id}", response_model=Genre, summary="Get genre details by id"
 )
@@ -25,7 +63,7 @@ async def genre_details(
         ),
     ],
     genre_service: GenreService = Depends(get_genre_service),
-) -> Genre:
+) -> Response:
     """Get genre details by id
 
     Args:
@@ -42,21 +80,24 @@ async def genre_details(
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND, detail="genre not found"
         )
-    return Genre(uuid=genre.uuid, name=genre.name)
+    return json_response(Genre, genre)
 
 
 @router.get("/", response_model=list[Genre], summary="Get a list of genres")
 async def genres(
     page_number: int = 1,
     page_size: int = 50,
+    cursor: Annotated[str | None, cursor_validators] = None,
     paginated_params: PaginatedParams = Depends(get_paginated_params),
     genre_service: GenreService = Depends(get_genre_service),
-) -> list[Genre]:
+) -> Response:
     """Get a list of genres
 
     Args:
     - **page_number** (int, optional): The number of the page to get (default: 1)
     - **page_size** (int, optional): The size of the page to get (default: 5)
+    - **cursor** (str, optional): The cursor of the page to get, the cursor of
+      the next page is returned in the `X-Next-Cursor` header
 
     Returns:
     - **list[Genre]**: The list of genres
@@ -64,10 +105,21 @@ async def genres(
     Raises:
         HTTPException: If the genres are not found
     """
-    paginated_params.validate(page_number, page_size)
-    genres = await genre_service.get_genres(**paginated_params.get())
+    if cursor is not None:
+        paginated_params.validate(1, page_size)
+        page = await genre_service.get_genres_page(
+            page_size=page_size, search_after=decode_cursor(cursor)
+        )
+        genres = page.items if page else None
+        next_search_after = page.next_search_after if page else None
+    else:
+        paginated_params.validate(page_number, page_size)
+        genres = await genre_service.get_genres(**paginated_params.get())
+        next_search_after = None
     if not genres:
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND, detail="genres not found"
         )
-    return [Genre(uuid=genre.uuid, name=genre.name) for genre in genres]
+    response = json_response(list[Genre], genres)
+    set_next_cursor(response, next_search_after)
+    return response
@@ -2,22 +2,60 @@ from http import HTTPStatus
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Path
+from fastapi import APIRouter, Depends, HTTPException, Path, Response
 
-from src.api.core.utils import (
-    build_films_field,
-)
+from src.api.core.utils import build_person, json_response
 from src.api.models.api.v1.person import (
     FilmForFilms,
     Person,
+    PersonsBatch,
 )
 from src.api.services.person import PersonService, get_person_service
+from src.api.validators.batch import batch_ids_validators
+from src.api.validators.cursor import (
+    cursor_validators,
+    decode_cursor,
+    set_next_cursor,
+)
 from src.api.validators.pagination import PaginatedParams, get_paginated_params
 from src.api.validators.search import search_query_validators
 
 router = APIRouter()
 
 
+@router.get(
+    "/batch",
+    response_model=PersonsBatch,
+    summary="Get the details of persons by ids",
+)
+async def persons_batch(
+    person_uuids: Annotated[list[UUID], batch_ids_validators],
+    person_service: PersonService = Depends(get_person_service),
+) -> Response:
+    """Get the details of persons by ids.
+
+    Args:
+    - **ids** (list[str]): The UUIDs of the persons to get.
+
+    Returns:
+    - **PersonsBatch**: The found persons in the order of the ids and the ids
+      of the persons that do not exist.
+    """
+    person_ids = [str(person_uuid) for person_uuid in person_uuids]
+    persons = await person_service.get_by_ids(person_ids)
+    return json_response(
+        PersonsBatch,
+        {
+            "items": [build_person(person) for person in persons if person],
+            "missing": [
+                person_id
+                for person_id, person in zip(person_ids, persons)
+                if not person
+            ],
+        },
+    )
+
+
 @router.get(
     "/{person_id}", response_model=Person, summary="Get the details of a person"
 )
@@ -32,7 +70,7 @@ async def person_details(
         ),
     ],
     person_service: PersonService = Depends(get_person_service),
-) -> Person:
+) -> Response:
     """Get the details of a person.
 
     Args:
@@ -49,11 +87,7 @@ async def person_details(
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND, detail="person not found"
         )
-    return Person(
-        uuid=person.uuid,
-        full_name=person.full_name,
-        films=build_films_field(person),
-    )
+    return json_response(Person, build_person(person))
 
 
 @router.get(
@@ -68,15 +102,18 @@ async def persons_search_by_full_name(
         str | None,
         search_query_validators,
     ] = "",
+    cursor: Annotated[str | None, cursor_validators] = None,
     paginated_params: PaginatedParams = Depends(get_paginated_params),
     person_service: PersonService = Depends(get_person_service),
-) -> list[Person]:
+) -> Response:
     """Get a list of persons based on a search query
 
     Args:
     - **page_number** (int, optional): The number of the page to get. Defaults to 1.
     - **page_size** (int, optional): The size of the page to get. Defaults to 5.
     - **query** (str, optional): The query to search persons. Defaults to None.
+    - **cursor** (str, optional): The cursor of the page to get, the cursor of
+      the next page is returned in the `X-Next-Cursor` header. Defaults to None.
 
     Returns:
     - **list[Person]**: A list of persons.
@@ -85,22 +122,31 @@ async def persons_search_by_full_name(
         HTTPException: If the persons are not found.
     """
     field = "full_name"
-    paginated_params.validate(page_number, page_size)
-    persons = await person_service.get_search(
-        **paginated_params.get(), search_query=search_query, field=field
-    )
+    if cursor is not None:
+        paginated_params.validate(1, page_size)
+        page = await person_service.get_search_page(
+            page_size=page_size,
+            search_after=decode_cursor(cursor),
+            search_query=search_query,
+            field=field,
+        )
+        persons = page.items if page else None
+        next_search_after = page.next_search_after if page else None
+    else:
+        paginated_params.validate(page_number, page_size)
+        persons = await person_service.get_search(
+            **paginated_params.get(), search_query=search_query, field=field
+        )
+        next_search_after = None
     if not persons:
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND, detail="persons not found"
         )
-    return [
-        Person(
-            uuid=person.uuid,
-            full_name=person.full_name,
-            films=build_films_field(person),
-        )
-        for person in persons
-    ]
+    response = json_response(
+        list[Person], [build_person(person) for person in persons]
+    )
+    set_next_cursor(response, next_search_after)
+    return response
 
 
 @router.get(
@@ -119,7 +165,7 @@ async def person_details_films(
         ),
     ],
     person_service: PersonService = Depends(get_person_service),
-) -> list[FilmForFilms]:
+) -> Response:
     """Get a list of films for a specific person
 
     Args:
@@ -136,9 +182,4 @@ async def person_details_films(
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND, detail="films not found"
         )
-    return [
-        FilmForFilms(
-            uuid=film.uuid, title=film.title, imdb_rating=film.imdb_rating
-        )
-        for film in films
-    ]
+    return json_response(list[FilmForFilms], films)
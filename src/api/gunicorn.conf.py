@@ -0,0 +1,6 @@
+from prometheus_client import multiprocess
+
+
+def child_exit(server, worker):
+    """Удалить метрики завершившегося воркера из общего каталога."""
+    multiprocess.mark_process_dead(worker.pid)
@@ -1,31 +1,134 @@
 import logging
+import os
+import socket
 from contextlib import asynccontextmanager
+from http import HTTPStatus
 from typing import Any
 
 import uvicorn
-from elasticsearch import AsyncElasticsearch
-from fastapi import FastAPI
-from redis.asyncio import Redis
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 
 from src.api.cache import redis
+from src.api.cache.codecs import get_codec
+from src.api.cache.generations import Generations
+from src.api.changes.consumer import ChangeFeedConsumer
+from src.api.changes.redis import RedisChangeFeed
+from src.api.core import health
+from src.api.core.circuit_breaker import CircuitBreaker
 from src.api.core.config import settings
+from src.api.core.connections import create_elastic, create_redis, warm_up
+from src.api.core.context import RequestContextMiddleware
 from src.api.core.logger import LOGGING
+from src.api.core.metrics import MetricsMiddleware
+from src.api.core.response_cache import KEY_PREFIX as RESPONSE_CACHE_PREFIX
+from src.api.core.response_cache import ResponseCacheMiddleware
 from src.api.db import elastic
+from src.api.db.abstract import DBUnavailableError, InvalidCursorError
+from src.api.endpoints import health as health_endpoints
+from src.api.endpoints import metrics
 from src.api.endpoints.v1 import films, genres, persons
+from src.api.services import prefetch
+from src.api.services.film import get_film_service
+from src.api.services.genre import get_genre_service
+from src.api.services.person import get_person_service
 from src.core.utils.logger import create_logger
 
+INDEXES = ("movies", "genres", "persons")
+CACHE_NAMESPACES = {
+    "FilmService": ("movies",),
+    "GenreService": ("genres",),
+    "PersonService": ("persons",),
+    "PersonService_films": ("persons",),
+    RESPONSE_CACHE_PREFIX: INDEXES,
+}
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> Any:
+    redis_client = create_redis(settings.redis)
+    generations = None
+    if settings.cache_generations_enabled:
+        generations = Generations(
+            redis_client,
+            INDEXES,
+            refresh_interval=settings.cache_generations_refresh,
+            logger=create_logger("API cache generations"),
+        )
+        await generations.start()
     redis.redis = redis.RedisCache(
-        Redis(host=settings.redis.host, port=settings.redis.port),
+        redis_client,
         logger=create_logger("API RedisCache"),
+        codec=get_codec(settings.cache_codec),
+        tag_expire=settings.cache_tag_ex,
+        generations=generations,
+        namespaces=CACHE_NAMESPACES,
     )
     elastic.elastic = elastic.ElasticDB(
-        AsyncElasticsearch(hosts=settings.elastic.get_host),
+        create_elastic(settings.elastic),
         logger=create_logger("API ElasticDB"),
+        breaker=CircuitBreaker(
+            failure_threshold=settings.elastic_breaker_failures,
+            recovery_timeout=settings.elastic_breaker_timeout,
+        ),
+        msearch_window=settings.elastic_msearch_window,
+        msearch_max_size=settings.elastic_msearch_max_size,
+    )
+    if settings.prefetch_enabled:
+        prefetch.prefetcher = prefetch.Prefetcher(
+            max_concurrency=settings.prefetch_max_concurrency,
+            max_db_latency=settings.prefetch_max_db_latency,
+        )
+    health.health_checker = health.HealthChecker(
+        {"redis": redis.redis.ping, "elastic": elastic.elastic.ping},
+        timeout=settings.health_check_timeout,
+        cache_ttl=settings.health_check_cache_ttl,
+    )
+    change_consumer = None
+    if settings.change_feed_enabled:
+        change_consumer = ChangeFeedConsumer(
+            RedisChangeFeed(
+                redis_client,
+                stream=settings.change_feed_stream,
+                group=settings.change_feed_group,
+                consumer=f"{socket.gethostname()}-{os.getpid()}",
+                claim_idle=settings.change_feed_claim_idle,
+                max_length=settings.change_feed_max_length,
+                logger=create_logger("API RedisChangeFeed"),
+            ),
+            reloads={
+                "film": get_film_service(
+                    cache=redis.redis,
+                    db=elastic.elastic,
+                    prefetcher=prefetch.prefetcher,
+                ).reload,
+                "genre": get_genre_service(
+                    cache=redis.redis, db=elastic.elastic
+                ).reload,
+                "person": get_person_service(
+                    cache=redis.redis,
+                    db=elastic.elastic,
+                    prefetcher=prefetch.prefetcher,
+                ).reload,
+            },
+            batch_size=settings.change_feed_batch_size,
+            timeout=settings.change_feed_timeout,
+            retry_delay=settings.change_feed_retry_delay,
+            logger=create_logger("API ChangeFeedConsumer"),
+        )
+        await change_consumer.start()
+    await warm_up(
+        {
+            "redis": (redis.redis, settings.redis.warmup_connections),
+            "elastic": (elastic.elastic, settings.elastic.warmup_connections),
+        },
+        logger=create_logger("API warm-up"),
     )
     yield
+    if change_consumer:
+        await change_consumer.close()
+    if generations:
+        await generations.close()
     await redis.redis.close()
     await elastic.elastic.close()
 
@@ -37,10 +140,49 @@ app = FastAPI(
     openapi_url=settings.openapi_url,
     lifespan=lifespan,
 )
+app.add_middleware(
+    ResponseCacheMiddleware,
+    ttls={
+        "/api/v1/films": settings.cache_ex_for_films,
+        "/api/v1/genres": settings.cache_ex_for_genres,
+        "/api/v1/persons": settings.cache_ex_for_persons,
+    },
+    enabled=settings.response_cache_enabled,
+)
+app.add_middleware(
+    RequestContextMiddleware, server_timing=settings.server_timing_enabled
+)
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+
+
+@app.exception_handler(DBUnavailableError)
+async def db_unavailable_handler(
+    request: Request, exc: DBUnavailableError
+) -> JSONResponse:
+    return JSONResponse(
+        status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+        content={"detail": "service temporarily unavailable"},
+        headers={"Retry-After": str(int(settings.elastic_breaker_timeout))},
+    )
+
+
+@app.exception_handler(InvalidCursorError)
+async def invalid_cursor_handler(
+    request: Request, exc: InvalidCursorError
+) -> JSONResponse:
+    return JSONResponse(
+        status_code=HTTPStatus.UNPROCESSABLE_ENTITY,
+        content={"detail": "Cursor is invalid"},
+    )
+
 
 app.include_router(films.router, prefix="/api/v1/films", tags=["films"])
 app.include_router(genres.router, prefix="/api/v1/genres", tags=["genres"])
 app.include_router(persons.router, prefix="/api/v1/persons", tags=["persons"])
+app.include_router(health_endpoints.router, prefix="/health", tags=["health"])
+if settings.metrics_enabled:
+    app.include_router(metrics.router, prefix="/metrics")
 
 if __name__ == "__main__":
     uvicorn.run(
@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+
+
+class DependencyHealth(BaseModel):
+    status: str
+    latency_ms: float | None = None
+    error: str | None = None
+
+
+class Health(BaseModel):
+    status: str
+    checks: dict[str, DependencyHealth] = {}
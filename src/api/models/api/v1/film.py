@@ -1,3 +1,5 @@
+from pydantic import BaseModel
+
 from src.api.models.base import FilmFullMixin, FilmMixin
 
 
@@ -7,3 +9,8 @@ class Film(FilmFullMixin):
 
 class FilmForFilmsList(FilmMixin):
     pass
+
+
+class FilmsBatch(BaseModel):
+    items: list[Film]
+    missing: list[str]
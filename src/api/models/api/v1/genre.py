@@ -1,5 +1,12 @@
+from pydantic import BaseModel
+
 from src.api.models.base import UUIDMixin
 
 
 class Genre(UUIDMixin):
     name: str
+
+
+class GenresBatch(BaseModel):
+    items: list[Genre]
+    missing: list[str]
@@ -1,3 +1,5 @@
+from pydantic import BaseModel
+
 from src.api.models.base import FilmMixin, UUIDMixin
 
 
@@ -12,3 +14,8 @@ class Person(UUIDMixin):
 
 class FilmForFilms(FilmMixin):
     pass
+
+
+class PersonsBatch(BaseModel):
+    items: list[Person]
+    missing: list[str]
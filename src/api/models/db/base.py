@@ -0,0 +1,5 @@
+from src.api.models.base import UUIDMixin
+
+
+class UUIDDB(UUIDMixin):
+    pass
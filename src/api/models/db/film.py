@@ -1,5 +1,9 @@
-from src.api.models.base import FilmFullMixin
+from src.api.models.base import FilmFullMixin, FilmMixin
 
 
 class FilmDB(FilmFullMixin):
     pass
+
+
+class FilmListItemDB(FilmMixin):
+    pass
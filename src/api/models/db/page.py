@@ -0,0 +1,10 @@
+from typing import Any, Generic, TypeVar
+
+from pydantic import BaseModel
+
+ModelDB = TypeVar("ModelDB", bound=BaseModel)
+
+
+class CursorPageDB(BaseModel, Generic[ModelDB]):
+    items: list[ModelDB]
+    next_search_after: list[Any] | None
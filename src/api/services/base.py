@@ -1,40 +1,241 @@
-from typing import Generic, TypeVar
+import asyncio
+import json
+from collections.abc import Awaitable, Callable, Iterable
+from functools import partial
+from typing import Any, Generic, TypeVar
 
 from pydantic import BaseModel
 
-from src.api.cache.abstract import AbstractModelCache
-from src.api.db.abstract import AbstractDBClient
+from src.api.cache.abstract import AbstractModelCache, CacheEntry
+from src.api.cache.tags import build_list_tag, build_tag, get_model_tags
+from src.api.core.context import (
+    add_tags,
+    mark_cache,
+    mark_degraded,
+    mark_stale,
+)
+from src.api.core.metrics import count_cache
+from src.api.core.singleflight import SingleFlight
+from src.api.db.abstract import AbstractDBClient, DBUnavailableError
+from src.api.models.db.base import UUIDDB
+from src.api.models.db.page import CursorPageDB
+from src.api.services.prefetch import Prefetcher
+from src.core.utils.logger import create_logger
 
 ModelDB = TypeVar("ModelDB", bound=BaseModel)
+Model = TypeVar("Model", bound=BaseModel)
+
+logger = create_logger("API BaseElasticService")
 
 
 class BaseElasticService(Generic[ModelDB]):
+    """
+    Базовый сервис чтения моделей из Elastic через кэш.
+
+    Записи кэша живут `cache_ex + cache_stale_ex + cache_error_ex` секунд.
+    Первые `cache_ex` секунд запись свежая, затем в течение `cache_stale_ex`
+    секунд устаревшая запись сразу отдаётся клиенту, а в фоне обновляется
+    из Elastic. Оставшиеся `cache_error_ex` секунд запись считается
+    просроченной и отдаётся только если Elastic недоступен.
+
+    Отсутствие документа или пустой результат поиска кэшируется на
+    `cache_empty_ex` секунд.
+
+    Если задан `superpage_size`, постраничные списки запрашиваются у
+    Elastic и кэшируются окнами по `superpage_size` документов, а страницы
+    вырезаются из окна. Соседние страницы и страницы разного размера
+    внутри одного окна обходятся одним запросом к Elastic и одной записью
+    кэша.
+
+    Постраничные списки хранят в кэше только упорядоченные идентификаторы,
+    а модели берутся из записей кэша по идентификаторам, общих для всех
+    списков и запросов модели по идентификатору. Промахи запрашиваются у
+    Elastic одним запросом и прогревают эти записи.
+
+    Записи кэша записываются с тегами сущностей `_entity`, данные которых
+    они содержат (например, `film:<uuid>`), а списки ещё и с тегом всех
+    списков сущности (`film:lists`). Теги возвращённых моделей отмечаются
+    в контексте запроса для кэша ответов.
+
+    Args:
+        cache (AbstractModelCache): кэш моделей
+        cache_ex (int): время, в течение которого запись свежая, в секундах
+        db (AbstractDBClient): клиент базы данных
+        cache_stale_ex (int): время, в течение которого устаревшая запись
+            отдаётся с фоновым обновлением, в секундах
+        cache_error_ex (int): время, в течение которого просроченная запись
+            отдаётся при недоступности Elastic, в секундах
+        cache_empty_ex (int): время жизни отметки об отсутствии документа
+            в секундах
+        superpage_size (int): размер окна документов для постраничных
+            списков, 0 отключает окна
+        prefetcher (Prefetcher | None): фоновая загрузка следующих страниц
+            постраничных списков
+    """
+
     _key_prefix: str
     _index: str
+    _entity: str
 
     def __init__(
         self,
         cache: AbstractModelCache,
         cache_ex: int,
         db: AbstractDBClient,
+        cache_stale_ex: int = 0,
+        cache_error_ex: int = 0,
+        cache_empty_ex: int = 0,
+        superpage_size: int = 0,
+        prefetcher: Prefetcher | None = None,
     ):
         self._cache = cache
         self._db = db
         self._cache_ex = cache_ex
+        self._cache_stale_ex = cache_stale_ex
+        self._cache_error_ex = cache_error_ex
+        self._cache_empty_ex = cache_empty_ex
+        self._superpage_size = superpage_size
+        self._prefetcher = prefetcher
+        self._flight = SingleFlight(self._key_prefix)
+        self._background: set[asyncio.Task[Any]] = set()
 
     async def _get_by_id(
         self, obj_id: str, model: type[ModelDB]
     ) -> ModelDB | None:
         key = self._cache.build_key(self._key_prefix, obj_id)
-        doc = await self._cache.get_one_model(key, model)
-        if not doc:
-            doc = await self._db.get_by_id(
+        return await self._get_one(
+            key,
+            model,
+            lambda: self._db.get_by_id(
                 obj_id=obj_id, model=model, index=self._index
+            ),
+            lambda doc: self.__get_tags(obj_id, doc),
+        )
+
+    async def _get_by_ids(
+        self, obj_ids: list[str], model: type[ModelDB]
+    ) -> list[ModelDB | None]:
+        """
+        Получить модели по идентификаторам из кэша, а промахи одним запросом
+        из базы данных.
+
+        Кэш читается одним запросом, все промахи запрашиваются у базы данных
+        одним запросом и записываются в кэш одним запросом. Устаревшие записи
+        отдаются сразу и обновляются в фоне так же одним запросом. Если база
+        данных недоступна, отдаются просроченные записи кэша.
+
+        Raises:
+            DBUnavailableError: если база данных недоступна, а в кэше нет
+                записи хотя бы для одного идентификатора
+
+        Returns:
+            list[ModelDB | None]: модели в порядке идентификаторов, None для
+            ненайденных
+        """
+        ids = list(dict.fromkeys(obj_ids))
+        keys = [
+            self._cache.build_key(self._key_prefix, obj_id) for obj_id in ids
+        ]
+        entries = await self._cache.get_many_models(keys, model)
+        found: dict[str, ModelDB | None] = {}
+        missing: dict[str, CacheEntry[ModelDB | None] | None] = {}
+        stale: list[str] = []
+        for obj_id, entry in zip(ids, entries):
+            if entry and (
+                entry.value is None or not self._is_expired(entry.ttl)
+            ):
+                self.__count_hit()
+                found[obj_id] = entry.value
+                if entry.value is not None and self._is_stale(entry.ttl):
+                    stale.append(obj_id)
+            else:
+                self.__count_miss()
+                missing[obj_id] = entry
+        if stale:
+            self._refresh(
+                self._cache.build_key(self._key_prefix, "batch", *stale),
+                lambda: self._fill_by_ids(stale, model),
             )
-            if not doc:
-                return None
-            await self._cache.set_one_model(key, doc, self._cache_ex)
-        return doc
+        if missing:
+            try:
+                found.update(await self._fill_by_ids(list(missing), model))
+            except DBUnavailableError:
+                if not all(missing.values()):
+                    raise
+                mark_degraded()
+                found.update(
+                    (obj_id, entry.value)  # type: ignore[union-attr]
+                    for obj_id, entry in missing.items()
+                )
+        add_tags(
+            tag
+            for obj_id in ids
+            for tag in self.__get_tags(obj_id, found[obj_id])
+        )
+        return [found[obj_id] for obj_id in obj_ids]
+
+    async def _reload_by_ids(
+        self, obj_ids: list[str], model: type[ModelDB], lists: bool = False
+    ) -> None:
+        """
+        Обновить кэш после изменения моделей в базе данных.
+
+        Записи, содержащие данные моделей (списки, страницы поиска, ответы
+        из кэша ответов и модели других сущностей), удаляются по тегам, а
+        записи самих моделей перезаписываются из базы данных одним
+        запросом. Удалённые модели записываются как отсутствующие.
+
+        Args:
+            obj_ids (list[str]): идентификаторы изменённых моделей
+            model (type[ModelDB]): модель для десериализации
+            lists (bool): удалить и все списки сущности, например если
+                модели добавлены или удалены
+        """
+        tags = [build_tag(self._entity, obj_id) for obj_id in obj_ids]
+        if lists:
+            tags.append(build_list_tag(self._entity))
+        await self._cache.invalidate_tags(tags)
+        await self._fill_by_ids(obj_ids, model)
+
+    async def _fill_by_ids(
+        self, obj_ids: list[str], model: type[ModelDB]
+    ) -> dict[str, ModelDB | None]:
+        """Запросить модели у базы данных и записать их в кэш."""
+        docs = await self._db.get_by_ids(
+            obj_ids=obj_ids, model=model, index=self._index
+        )
+        result = dict(zip(obj_ids, docs))
+        tags = {
+            self._cache.build_key(self._key_prefix, obj_id): list(
+                self.__get_tags(obj_id, doc)
+            )
+            for obj_id, doc in result.items()
+        }
+        writes = [
+            self._cache.set_many_models(
+                {
+                    self._cache.build_key(self._key_prefix, obj_id): doc
+                    for obj_id, doc in result.items()
+                    if doc is not None
+                },
+                self._cache_expire,
+                tags,
+            )
+        ]
+        if self._cache_empty_ex:
+            writes.append(
+                self._cache.set_many_models(
+                    {
+                        self._cache.build_key(self._key_prefix, obj_id): None
+                        for obj_id, doc in result.items()
+                        if doc is None
+                    },
+                    self._cache_empty_ex,
+                    tags,
+                )
+            )
+        await asyncio.gather(*writes)
+        return result
 
     async def _get_search(
         self,
@@ -44,20 +245,429 @@ class BaseElasticService(Generic[ModelDB]):
         field: str,
         model: type[ModelDB],
     ) -> list[ModelDB] | None:
+        return await self._get_paginated(
+            page_number,
+            page_size,
+            model,
+            lambda number, size: self._db.get_search_by_query(
+                page_number=number,
+                page_size=size,
+                field=field,
+                query=search_query,
+                model=UUIDDB,
+                index=self._index,
+            ),
+            search_query,
+        )
+
+    async def _get_paginated(
+        self,
+        page_number: int,
+        page_size: int,
+        model: type[ModelDB],
+        fetch: Callable[[int, int], Awaitable[list[UUIDDB] | None]],
+        *key_args: Any,
+    ) -> list[ModelDB] | None:
+        """
+        Получить страницу моделей из кэша, а при промахе из базы данных.
+
+        В кэше списка хранятся только идентификаторы моделей, сами модели
+        берутся по идентификаторам через `_get_by_ids`. Модели, удалённые
+        из базы данных после записи списка, пропускаются.
+
+        Если окна включены, страница вырезается из одного или двух окон по
+        `superpage_size` моделей, выровненных по размеру окна. Из кэша
+        читается только нужная часть окна.
+
+        Если страница заполнена и задан `prefetcher`, следующая страница
+        (или окно, в которое она попадает) загружается в кэш в фоне вместе
+        с моделями этой страницы.
+
+        Args:
+            page_number (int): номер страницы
+            page_size (int): количество моделей на странице
+            model (type[ModelDB]): модель для десериализации
+            fetch (Callable[[int, int], Awaitable[list[UUIDDB] | None]]):
+                запрос идентификаторов страницы к базе данных по номеру и
+                размеру страницы
+            *key_args: параметры запроса для ключа кэша
+
+        Returns:
+            list[ModelDB] | None: модели страницы или None, если моделей нет
+        """
+        parts = self.__page_parts(page_number, page_size, fetch, key_args)
+        slices = await asyncio.gather(
+            *(
+                self._get_list(key, UUIDDB, part_fetch, start=start, stop=stop)
+                for key, part_fetch, start, stop in parts
+            )
+        )
+        ids = [ref.uuid for refs in slices for ref in refs or []]
+        if self._prefetcher and len(ids) == page_size:
+            keys = {key for key, *_ in parts}
+            for key, part_fetch, start, stop in self.__page_parts(
+                page_number + 1, page_size, fetch, key_args
+            ):
+                if key not in keys:
+                    self._prefetcher.schedule(
+                        self._key_prefix,
+                        key,
+                        self._db,
+                        partial(
+                            self.__prefetch, key, model, part_fetch, start, stop
+                        ),
+                    )
+        if not ids:
+            return None
+        docs = await self._get_by_ids(ids, model)
+        return [doc for doc in docs if doc is not None] or None
+
+    def __page_parts(
+        self,
+        page_number: int,
+        page_size: int,
+        fetch: Callable[[int, int], Awaitable[list[UUIDDB] | None]],
+        key_args: tuple[Any, ...],
+    ) -> list[
+        tuple[str, Callable[[], Awaitable[list[UUIDDB] | None]], int, int]
+    ]:
+        """
+        Получить ключи кэша, запросы к базе данных и диапазоны списков, из
+        которых собирается страница.
+        """
+        window = self._superpage_size
+        if not window:
+            key = self._cache.build_key(
+                self._key_prefix, page_number, page_size, *key_args
+            )
+            return [(key, partial(fetch, page_number, page_size), 0, -1)]
+        start = (page_number - 1) * page_size
+        stop = start + page_size - 1
+        return [
+            (
+                self._cache.build_key(
+                    self._key_prefix, "window", window, number, *key_args
+                ),
+                partial(fetch, number + 1, window),
+                max(start - number * window, 0),
+                min(stop - number * window, window - 1),
+            )
+            for number in range(start // window, stop // window + 1)
+        ]
+
+    async def __prefetch(
+        self,
+        key: str,
+        model: type[ModelDB],
+        fetch: Callable[[], Awaitable[list[UUIDDB] | None]],
+        start: int,
+        stop: int,
+    ) -> bool:
+        """
+        Загрузить список идентификаторов и модели с `start` по `stop` в кэш,
+        если их там нет или они устарели.
+
+        Returns:
+            bool: False, если свежий список и модели уже были в кэше
+        """
+        fetched = False
+        refs: list[UUIDDB] | None
+        entry = await self._cache.get_list_entry(key, UUIDDB, start, stop)
+        if entry and not self._is_stale(entry.ttl):
+            refs = entry.value
+        else:
+            refs = await self._flight.do(
+                key, lambda: self.__fill_list(key, fetch, self._entity)
+            )
+            refs = refs[start : stop + 1] if refs else None
+            fetched = True
+        ids = [ref.uuid for ref in refs or []]
+        entries = await self._cache.get_many_models(
+            [self._cache.build_key(self._key_prefix, obj_id) for obj_id in ids],
+            model,
+        )
+        missing = [
+            obj_id
+            for obj_id, doc_entry in zip(ids, entries)
+            if not doc_entry
+            or (doc_entry.value is not None and self._is_stale(doc_entry.ttl))
+        ]
+        if missing:
+            await self._fill_by_ids(missing, model)
+            fetched = True
+        return fetched
+
+    async def _get_search_page(
+        self,
+        page_size: int,
+        search_after: list[Any] | None,
+        search_query: str | None,
+        field: str,
+        model: type[Model],
+    ) -> CursorPageDB[Model] | None:
+        if search_query:
+            query = {
+                "match": {field: {"query": search_query, "fuzziness": "auto"}}
+            }
+        else:
+            query = None
+        return await self._get_page(
+            page_size, search_after, model, search_query, query=query
+        )
+
+    async def _get_page(
+        self,
+        page_size: int,
+        search_after: list[Any] | None,
+        model: type[Model],
+        *key_args: Any,
+        query: dict[str, Any] | None = None,
+        sort: list[Any] | None = None,
+    ) -> CursorPageDB[Model] | None:
+        """
+        Получить страницу моделей после заданных значений сортировки из кэша,
+        а при промахе из базы данных.
+
+        Страница кэшируется по значениям сортировки, с которых она начинается.
+
+        Args:
+            page_size (int): количество моделей на странице
+            search_after (list[Any] | None): значения сортировки последней
+                модели предыдущей страницы или None для первой страницы
+            model (type[Model]): модель для десериализации
+            *key_args: параметры запроса для ключа кэша
+            query (dict[str, Any] | None): запрос к базе данных
+            sort (list[Any] | None): сортировка
+
+        Returns:
+            CursorPageDB[Model] | None: страница или None, если моделей нет
+        """
         key = self._cache.build_key(
-            self._key_prefix, page_number, page_size, search_query
+            self._key_prefix,
+            "cursor",
+            page_size,
+            *key_args,
+            json.dumps(search_after, separators=(",", ":")),
         )
-        persons = await self._cache.get_list_model(key, model)
-        if not persons:
-            persons = await self._db.get_search_by_query(
-                page_number=page_number,
+
+        async def fetch() -> CursorPageDB[Model] | None:
+            docs, next_search_after = await self._db.get_page_after(
                 page_size=page_size,
-                field=field,
-                query=search_query,
                 model=model,
+                search_after=search_after,
                 index=self._index,
+                query=query,
+                sort=sort,
             )
-            if not persons:
+            if not docs:
                 return None
-            await self._cache.set_list_model(key, persons, self._cache_ex)
-        return persons
+            return CursorPageDB[model](  # type: ignore[valid-type]
+                items=docs, next_search_after=next_search_after
+            )
+
+        return await self._get_one(
+            key,
+            CursorPageDB[model],  # type: ignore[valid-type]
+            fetch,
+            lambda page: self.__get_list_tags(
+                self._entity, page.items if page else []
+            ),
+        )
+
+    async def _get_one(
+        self,
+        key: str,
+        model: type[Model],
+        fetch: Callable[[], Awaitable[Model | None]],
+        get_tags: Callable[[Model | None], Iterable[str]],
+    ) -> Model | None:
+        """
+        Получить модель из кэша, а при промахе из базы данных.
+
+        Одновременные промахи по одному ключу выполняют один запрос к базе
+        данных и одну запись в кэш. Если база данных недоступна, отдаётся
+        просроченная запись кэша.
+
+        Args:
+            key (str): ключ кэша
+            model (type[Model]): модель для десериализации
+            fetch (Callable[[], Awaitable[Model | None]]): запрос к базе данных
+            get_tags (Callable[[Model | None], Iterable[str]]): теги записи
+                по модели или по её отсутствию
+
+        Raises:
+            DBUnavailableError: если база данных недоступна, а в кэше нет записи
+        """
+
+        async def fill() -> Model | None:
+            doc = await fetch()
+            if not doc:
+                if self._cache_empty_ex:
+                    await self._cache.set_empty(
+                        key, self._cache_empty_ex, get_tags(None)
+                    )
+                return None
+            await self._cache.set_one_model(
+                key, doc, self._cache_expire, get_tags(doc)
+            )
+            return doc
+
+        entry = await self._cache.get_one_entry(key, model)
+        if entry and entry.value is None:
+            self.__count_hit()
+            add_tags(get_tags(None))
+            return None
+        if entry and not self._is_expired(entry.ttl):
+            self.__count_hit()
+            if self._is_stale(entry.ttl):
+                self._refresh(key, fill)
+            add_tags(get_tags(entry.value))
+            return entry.value
+        self.__count_miss()
+        try:
+            doc = await self._flight.do(key, fill)
+        except DBUnavailableError:
+            if not entry:
+                raise
+            mark_degraded()
+            doc = entry.value
+        add_tags(get_tags(doc))
+        return doc
+
+    async def _get_list(
+        self,
+        key: str,
+        model: type[Model],
+        fetch: Callable[[], Awaitable[list[Model] | None]],
+        start: int = 0,
+        stop: int = -1,
+        entity: str | None = None,
+        tags: Iterable[str] = (),
+    ) -> list[Model] | None:
+        """
+        Получить список моделей из кэша, а при промахе из базы данных.
+
+        Одновременные промахи по одному ключу выполняют один запрос к базе
+        данных и одну запись в кэш. Если база данных недоступна, отдаётся
+        просроченная запись кэша. Если задан диапазон, кэшируется весь
+        список, а возвращаются модели с `start` по `stop` включительно.
+
+        Args:
+            key (str): ключ кэша
+            model (type[Model]): модель для десериализации
+            fetch (Callable[[], Awaitable[list[Model] | None]]): запрос к
+                базе данных
+            start (int): индекс первой модели
+            stop (int): индекс последней модели, -1 для конца списка
+            entity (str | None): тип сущностей списка, по умолчанию `_entity`
+            tags (Iterable[str]): дополнительные теги списка, например тег
+                сущности, которой принадлежит список
+
+        Raises:
+            DBUnavailableError: если база данных недоступна, а в кэше нет записи
+        """
+        entity = entity or self._entity
+        tags = tuple(tags)
+
+        def fill() -> Awaitable[list[Model] | None]:
+            return self.__fill_list(key, fetch, entity, tags)
+
+        entry = await self._cache.get_list_entry(key, model, start, stop)
+        if entry and self._prefetcher:
+            self._prefetcher.use(key)
+        if entry and entry.value is None:
+            self.__count_hit()
+            add_tags(self.__get_list_tags(entity, [], tags))
+            return None
+        if entry and not self._is_expired(entry.ttl):
+            self.__count_hit()
+            if self._is_stale(entry.ttl):
+                self._refresh(key, fill)
+            add_tags(self.__get_list_tags(entity, entry.value or [], tags))
+            return entry.value or None
+        self.__count_miss()
+        try:
+            docs = await self._flight.do(key, fill)
+            if docs is not None and (start, stop) != (0, -1):
+                docs = docs[start : stop + 1 if stop >= 0 else None] or None
+        except DBUnavailableError:
+            if not entry:
+                raise
+            mark_degraded()
+            docs = entry.value or None
+        add_tags(self.__get_list_tags(entity, docs or [], tags))
+        return docs
+
+    async def __fill_list(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[list[Model] | None]],
+        entity: str,
+        tags: Iterable[str] = (),
+    ) -> list[Model] | None:
+        """Запросить список у базы данных и записать его в кэш."""
+        docs = await fetch()
+        if not docs:
+            if self._cache_empty_ex:
+                await self._cache.set_list_model(
+                    key,
+                    [],
+                    self._cache_empty_ex,
+                    self.__get_list_tags(entity, [], tags),
+                )
+            return None
+        await self._cache.set_list_model(
+            key,
+            docs,
+            self._cache_expire,
+            self.__get_list_tags(entity, docs, tags),
+        )
+        return docs
+
+    def __get_tags(self, obj_id: str, doc: BaseModel | None) -> Iterable[str]:
+        """Получить теги записи модели или отметки о её отсутствии."""
+        if doc is None:
+            return (build_tag(self._entity, obj_id),)
+        return get_model_tags(self._entity, [doc])
+
+    @staticmethod
+    def __get_list_tags(
+        entity: str, docs: Iterable[BaseModel], tags: Iterable[str] = ()
+    ) -> Iterable[str]:
+        """Получить теги записи списка моделей."""
+        return [build_list_tag(entity), *tags, *get_model_tags(entity, docs)]
+
+    def __count_hit(self) -> None:
+        count_cache(self._key_prefix, "hit")
+        mark_cache(True)
+
+    def __count_miss(self) -> None:
+        count_cache(self._key_prefix, "miss")
+        mark_cache(False)
+
+    @property
+    def _cache_expire(self) -> int:
+        return self._cache_ex + self._cache_stale_ex + self._cache_error_ex
+
+    def _is_stale(self, ttl: float) -> bool:
+        return ttl < self._cache_stale_ex + self._cache_error_ex
+
+    def _is_expired(self, ttl: float) -> bool:
+        return ttl < self._cache_error_ex
+
+    def _refresh(self, key: str, fill: Callable[[], Awaitable[Any]]) -> None:
+        """
+        Обновить запись кэша в фоне, не дожидаясь результата, и отметить
+        ответ как собранный из устаревшей записи.
+        """
+        mark_stale()
+        task = asyncio.create_task(self._flight.do(key, fill))
+        self._background.add(task)
+        task.add_done_callback(self.__refreshed)
+
+    def __refreshed(self, task: asyncio.Task[Any]) -> None:
+        self._background.discard(task)
+        if not task.cancelled() and task.exception():
+            logger.error(
+                "Error refreshing stale cache entry: %s.", task.exception()
+            )
@@ -1,17 +1,24 @@
 from functools import lru_cache
+from typing import Any
 
 from fastapi import Depends
 
+from src.api.cache.memory import MemoryCache
 from src.api.cache.redis import RedisCache, get_redis
 from src.api.core.config import settings
 from src.api.db.elastic import ElasticDB, get_elastic
-from src.api.models.db.film import FilmDB
+from src.api.models.db.base import UUIDDB
+from src.api.models.db.film import FilmDB, FilmListItemDB
+from src.api.models.db.page import CursorPageDB
 from src.api.services.base import BaseElasticService
+from src.api.services.prefetch import Prefetcher, get_prefetcher
+from src.core.utils.logger import create_logger
 
 
 class FilmService(BaseElasticService[FilmDB]):
     _key_prefix = "FilmService"
     _index = "movies"
+    _entity = "film"
 
     async def get_by_id(self, film_id: str) -> FilmDB | None:
         return await self._get_by_id(
@@ -19,6 +26,15 @@ class FilmService(BaseElasticService[FilmDB]):
             model=FilmDB,
         )
 
+    async def get_by_ids(self, film_ids: list[str]) -> list[FilmDB | None]:
+        return await self._get_by_ids(
+            obj_ids=film_ids,
+            model=FilmDB,
+        )
+
+    async def reload(self, film_ids: list[str], lists: bool = False) -> None:
+        await self._reload_by_ids(film_ids, FilmDB, lists)
+
     async def get_films(
         self,
         page_number: int,
@@ -26,18 +42,16 @@ class FilmService(BaseElasticService[FilmDB]):
         genre_uuid: str | None,
         sort: str | None,
     ) -> list[FilmDB] | None:
-        key = self._cache.build_key(
-            self._key_prefix, page_number, page_size, genre_uuid, sort
+        return await self._get_paginated(
+            page_number,
+            page_size,
+            FilmDB,
+            lambda number, size: self.__get_films_from_elastic(
+                number, size, genre_uuid, sort
+            ),
+            genre_uuid,
+            sort,
         )
-        films = await self._cache.get_list_model(key, FilmDB)
-        if not films:
-            films = await self.__get_films_from_elastic(
-                page_number, page_size, genre_uuid, sort
-            )
-            if not films:
-                return None
-            await self._cache.set_list_model(key, films, self._cache_ex)
-        return films
 
     async def get_search(
         self,
@@ -54,20 +68,68 @@ class FilmService(BaseElasticService[FilmDB]):
             model=FilmDB,
         )
 
+    async def get_films_page(
+        self,
+        page_size: int,
+        search_after: list[Any] | None,
+        genre_uuid: str | None,
+        sort: str | None,
+    ) -> CursorPageDB[FilmListItemDB] | None:
+        return await self._get_page(
+            page_size,
+            search_after,
+            FilmListItemDB,
+            genre_uuid,
+            sort,
+            query=self.__build_query(genre_uuid),
+            sort=self.__build_sort(sort),
+        )
+
+    async def get_search_page(
+        self,
+        page_size: int,
+        search_after: list[Any] | None,
+        search_query: str | None,
+        field: str,
+    ) -> CursorPageDB[FilmListItemDB] | None:
+        return await self._get_search_page(
+            page_size=page_size,
+            search_after=search_after,
+            search_query=search_query,
+            field=field,
+            model=FilmListItemDB,
+        )
+
     async def __get_films_from_elastic(
         self,
         page_number: int,
         page_size: int,
         genre_uuid: str | None,
         sort_: str | None,
-    ) -> list[FilmDB] | None:
-        query = None
+    ) -> list[UUIDDB] | None:
+        return await self._db.get_all(
+            page_number=page_number,
+            page_size=page_size,
+            model=UUIDDB,
+            index=self._index,
+            filter_path="hits.hits._source",
+            query=self.__build_query(genre_uuid),
+            sort=self.__build_sort(sort_),
+        )
+
+    @staticmethod
+    def __build_sort(sort_: str | None) -> list[dict[str, str]] | None:
         sort = None
         if sort_:
             sort = []
             sort.append({sort_[1:]: "desc"}) if sort_[
                 0
             ] == "-" else sort.append({sort_: "asc"})
+        return sort
+
+    @staticmethod
+    def __build_query(genre_uuid: str | None) -> dict[str, Any] | None:
+        query = None
         if genre_uuid:
             query = {
                 "nested": {
@@ -79,25 +141,26 @@ class FilmService(BaseElasticService[FilmDB]):
                     },
                 }
             }
-
-        return await self._db.get_all(
-            page_number=page_number,
-            page_size=page_size,
-            model=FilmDB,
-            index=self._index,
-            filter_path="hits.hits._source",
-            query=query,
-            sort=sort,
-        )
+        return query
 
 
 @lru_cache
 def get_film_service(
     cache: RedisCache = Depends(get_redis),
     db: ElasticDB = Depends(get_elastic),
+    prefetcher: Prefetcher | None = Depends(get_prefetcher),
 ) -> FilmService:
     return FilmService(
-        cache=cache,
+        cache=MemoryCache(
+            cache,
+            **settings.local_cache_for_films.model_dump(),
+            logger=create_logger("API FilmService MemoryCache"),
+        ),
         cache_ex=settings.cache_ex_for_films,
+        cache_stale_ex=settings.cache_stale_ex_for_films,
+        cache_error_ex=settings.cache_error_ex,
+        cache_empty_ex=settings.cache_empty_ex,
+        superpage_size=settings.superpage_size,
+        prefetcher=prefetcher,
         db=db,
     )
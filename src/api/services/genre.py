@@ -1,17 +1,22 @@
 from functools import lru_cache
+from typing import Any
 
 from fastapi import Depends
 
+from src.api.cache.memory import MemoryCache
 from src.api.cache.redis import RedisCache, get_redis
 from src.api.core.config import settings
 from src.api.db.elastic import ElasticDB, get_elastic
 from src.api.models.db.genre import GenreDB
+from src.api.models.db.page import CursorPageDB
 from src.api.services.base import BaseElasticService
+from src.core.utils.logger import create_logger
 
 
 class GenreService(BaseElasticService[GenreDB]):
     _key_prefix = "GenreService"
     _index = "genres"
+    _entity = "genre"
 
     async def get_by_id(self, genre_id: str) -> GenreDB | None:
         return await self._get_by_id(
@@ -19,22 +24,34 @@ class GenreService(BaseElasticService[GenreDB]):
             model=GenreDB,
         )
 
+    async def get_by_ids(self, genre_ids: list[str]) -> list[GenreDB | None]:
+        return await self._get_by_ids(
+            obj_ids=genre_ids,
+            model=GenreDB,
+        )
+
+    async def reload(self, genre_ids: list[str], lists: bool = False) -> None:
+        await self._reload_by_ids(genre_ids, GenreDB, lists)
+
     async def get_genres(
         self, page_number: int, page_size: int
     ) -> list[GenreDB] | None:
         key = self._cache.build_key(self._key_prefix, page_number, page_size)
-        genres = await self._cache.get_list_model(key, GenreDB)
-        if not genres:
-            genres = await self._db.get_all(
+        return await self._get_list(
+            key,
+            GenreDB,
+            lambda: self._db.get_all(
                 page_number=page_number,
                 page_size=page_size,
                 model=GenreDB,
                 index=self._index,
-            )
-            if not genres:
-                return None
-            await self._cache.set_list_model(key, genres, self._cache_ex)
-        return genres
+            ),
+        )
+
+    async def get_genres_page(
+        self, page_size: int, search_after: list[Any] | None
+    ) -> CursorPageDB[GenreDB] | None:
+        return await self._get_page(page_size, search_after, GenreDB)
 
 
 @lru_cache
@@ -43,7 +60,14 @@ def get_genre_service(
     db: ElasticDB = Depends(get_elastic),
 ) -> GenreService:
     return GenreService(
-        cache=cache,
-        cache_ex=settings.cache_ex_for_films,
+        cache=MemoryCache(
+            cache,
+            **settings.local_cache_for_genres.model_dump(),
+            logger=create_logger("API GenreService MemoryCache"),
+        ),
+        cache_ex=settings.cache_ex_for_genres,
+        cache_stale_ex=settings.cache_stale_ex_for_genres,
+        cache_error_ex=settings.cache_error_ex,
+        cache_empty_ex=settings.cache_empty_ex,
         db=db,
     )
@@ -1,17 +1,24 @@
 from functools import lru_cache
+from typing import Any
 
 from fastapi import Depends
 
+from src.api.cache.memory import MemoryCache
 from src.api.cache.redis import RedisCache, get_redis
+from src.api.cache.tags import build_tag
 from src.api.core.config import settings
 from src.api.db.elastic import ElasticDB, get_elastic
+from src.api.models.db.page import CursorPageDB
 from src.api.models.db.person import FilmForPersonDB, PersonDB
 from src.api.services.base import BaseElasticService
+from src.api.services.prefetch import Prefetcher, get_prefetcher
+from src.core.utils.logger import create_logger
 
 
 class PersonService(BaseElasticService[PersonDB]):
     _key_prefix = "PersonService"
     _index = "persons"
+    _entity = "person"
 
     async def get_by_id(self, person_id: str) -> PersonDB | None:
         return await self._get_by_id(
@@ -19,6 +26,15 @@ class PersonService(BaseElasticService[PersonDB]):
             model=PersonDB,
         )
 
+    async def get_by_ids(self, person_ids: list[str]) -> list[PersonDB | None]:
+        return await self._get_by_ids(
+            obj_ids=person_ids,
+            model=PersonDB,
+        )
+
+    async def reload(self, person_ids: list[str], lists: bool = False) -> None:
+        await self._reload_by_ids(person_ids, PersonDB, lists)
+
     async def get_search(
         self,
         page_number: int,
@@ -34,33 +50,63 @@ class PersonService(BaseElasticService[PersonDB]):
             model=PersonDB,
         )
 
+    async def get_search_page(
+        self,
+        page_size: int,
+        search_after: list[Any] | None,
+        search_query: str | None,
+        field: str,
+    ) -> CursorPageDB[PersonDB] | None:
+        return await self._get_search_page(
+            page_size=page_size,
+            search_after=search_after,
+            search_query=search_query,
+            field=field,
+            model=PersonDB,
+        )
+
     async def get_person_films(
         self,
         person_id: str,
     ) -> list[FilmForPersonDB] | None:
         key_prefix = self._key_prefix + "_films"
         key = self._cache.build_key(key_prefix, person_id)
-        films = await self._cache.get_list_model(key, FilmForPersonDB)
-        if not films:
-            person = await self._db.get_by_id(
-                obj_id=person_id, model=PersonDB, index=self._index
-            )
-            if not person:
-                return None
-            films = person.films
-            if not films:
-                return None
-            await self._cache.set_list_model(key, films, self._cache_ex)
-        return films
+        return await self._get_list(
+            key,
+            FilmForPersonDB,
+            lambda: self.__get_person_films_from_elastic(person_id),
+            entity="film",
+            tags=[build_tag(self._entity, person_id)],
+        )
+
+    async def __get_person_films_from_elastic(
+        self, person_id: str
+    ) -> list[FilmForPersonDB] | None:
+        person = await self._db.get_by_id(
+            obj_id=person_id, model=PersonDB, index=self._index
+        )
+        if not person:
+            return None
+        return person.films
 
 
 @lru_cache
 def get_person_service(
     cache: RedisCache = Depends(get_redis),
     db: ElasticDB = Depends(get_elastic),
+    prefetcher: Prefetcher | None = Depends(get_prefetcher),
 ) -> PersonService:
     return PersonService(
-        cache=cache,
-        cache_ex=settings.cache_ex_for_films,
+        cache=MemoryCache(
+            cache,
+            **settings.local_cache_for_persons.model_dump(),
+            logger=create_logger("API PersonService MemoryCache"),
+        ),
+        cache_ex=settings.cache_ex_for_persons,
+        cache_stale_ex=settings.cache_stale_ex_for_persons,
+        cache_error_ex=settings.cache_error_ex,
+        cache_empty_ex=settings.cache_empty_ex,
+        superpage_size=settings.superpage_size,
+        prefetcher=prefetcher,
         db=db,
     )
@@ -0,0 +1,116 @@
+import asyncio
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from contextvars import Context
+
+from src.api.core.metrics import PREFETCHES, PREFETCHES_USED
+from src.api.db.abstract import AbstractDBClient
+from src.core.utils.logger import create_logger
+
+logger = create_logger("API Prefetcher")
+
+
+class Prefetcher:
+    """
+    Фоновая загрузка в кэш следующих страниц списков.
+
+    Загрузка не запускается, если уже выполняется `max_concurrency`
+    загрузок или сглаженная задержка запросов к базе данных превышает
+    `max_db_latency` секунд. Загрузки выполняются вне контекста запроса и
+    не влияют на его замеры.
+
+    Загрузка ключа, который уже загружается, не запускается повторно.
+    Загрузка уже загруженного ключа запускается снова, так как его запись
+    могла истечь, и сама пропускает страницу, если она ещё в кэше.
+
+    Загруженные ключи запоминаются (не больше `max_tracked`), и первое
+    попадание в кэш по такому ключу учитывается в метриках как
+    использованная загрузка. Учёт ведётся в пределах одного воркера.
+
+    Args:
+        max_concurrency (int): максимальное количество одновременных загрузок
+        max_db_latency (float): задержка базы данных в секундах, выше которой
+            загрузки пропускаются
+        max_tracked (int): максимальное количество запоминаемых ключей
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        max_db_latency: float,
+        max_tracked: int = 10000,
+    ):
+        self.__max_concurrency = max_concurrency
+        self.__max_db_latency = max_db_latency
+        self.__max_tracked = max_tracked
+        self.__tasks: dict[str, asyncio.Task[None]] = {}
+        self.__prefetched: OrderedDict[str, str] = OrderedDict()
+
+    def schedule(
+        self,
+        prefix: str,
+        key: str,
+        db: AbstractDBClient,
+        prefetch: Callable[[], Awaitable[bool]],
+    ) -> None:
+        """
+        Запланировать загрузку страницы в кэш.
+
+        Args:
+            prefix (str): префикс ключей кэша сервиса
+            key (str): ключ загружаемой страницы
+            db (AbstractDBClient): база данных, из которой загружается
+                страница
+            prefetch (Callable[[], Awaitable[bool]]): загрузка, возвращающая
+                False, если страница уже была в кэше
+        """
+        if key in self.__tasks:
+            return
+        if len(self.__tasks) >= self.__max_concurrency:
+            PREFETCHES.labels(prefix, "skipped_busy").inc()
+            return
+        if db.latency > self.__max_db_latency:
+            PREFETCHES.labels(prefix, "skipped_slow").inc()
+            return
+        task = asyncio.create_task(
+            self.__run(prefix, key, prefetch), context=Context()
+        )
+        self.__tasks[key] = task
+        task.add_done_callback(lambda _: self.__tasks.pop(key, None))
+
+    def use(self, key: str) -> None:
+        """
+        Учесть попадание в кэш по ключу.
+
+        Args:
+            key (str): ключ кэша
+        """
+        prefix = self.__prefetched.pop(key, None)
+        if prefix is not None:
+            PREFETCHES_USED.labels(prefix).inc()
+
+    async def __run(
+        self, prefix: str, key: str, prefetch: Callable[[], Awaitable[bool]]
+    ) -> None:
+        # Уступить цикл событий обработке текущих запросов.
+        await asyncio.sleep(0)
+        try:
+            fetched = await prefetch()
+        except Exception as prefetch_error:
+            PREFETCHES.labels(prefix, "failed").inc()
+            logger.debug("Prefetch of `%s` failed: %s.", key, prefetch_error)
+            return
+        if not fetched:
+            PREFETCHES.labels(prefix, "cached").inc()
+            return
+        PREFETCHES.labels(prefix, "fetched").inc()
+        self.__prefetched[key] = prefix
+        while len(self.__prefetched) > self.__max_tracked:
+            self.__prefetched.popitem(last=False)
+
+
+prefetcher: Prefetcher | None = None
+
+
+async def get_prefetcher() -> Prefetcher | None:
+    return prefetcher
@@ -0,0 +1,11 @@
+from fastapi import Query
+
+from src.api.core.config import settings
+
+batch_ids_validators = Query(
+    alias="ids",
+    title="IDs",
+    description=f"The UUIDs to get, at most {settings.batch_max_ids}",
+    min_length=1,
+    max_length=settings.batch_max_ids,
+)
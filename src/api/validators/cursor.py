@@ -0,0 +1,45 @@
+import base64
+import binascii
+import json
+from typing import Any
+
+from fastapi import HTTPException, Query, Response
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+cursor_validators = Query(
+    alias="cursor",
+    title="Cursor",
+    description=(
+        "The cursor of the page to get from the `X-Next-Cursor` header of "
+        "the previous page. Pass an empty cursor to get the first page. "
+        "When set, page_number is ignored"
+    ),
+)
+
+
+def encode_cursor(search_after: list[Any]) -> str:
+    data = json.dumps(search_after, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> list[Any] | None:
+    if not cursor:
+        return None
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        search_after = json.loads(data)
+    except (binascii.Error, ValueError):
+        search_after = None
+    if not isinstance(search_after, list) or not all(
+        isinstance(value, str | int | float) for value in search_after
+    ):
+        raise HTTPException(status_code=422, detail="Cursor is invalid")
+    return search_after
+
+
+def set_next_cursor(
+    response: Response, next_search_after: list[Any] | None
+) -> None:
+    if next_search_after:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(next_search_after)
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic.fields import Field
 from pydantic_settings import BaseSettings
 
@@ -5,11 +7,43 @@ from pydantic_settings import BaseSettings
 class ElasticSettings(BaseSettings):
     """
     This class is used to store the Elastic connection settings.
+
+    `ELASTIC_HOSTS` is a comma-separated list of nodes (`host:port` or full
+    URLs). When it is empty the single `ELASTIC_HOST`/`ELASTIC_PORT` node is
+    used.
     """
 
     host: str = Field(default=..., alias="ELASTIC_HOST")
     port: int = Field(default=9200, alias="ELASTIC_PORT")
+    hosts: str = Field(default="", alias="ELASTIC_HOSTS")
+
+    request_timeout: float = Field(default=5, alias="ELASTIC_REQUEST_TIMEOUT")
+    max_retries: int = Field(default=2, alias="ELASTIC_MAX_RETRIES")
+    retry_on_timeout: bool = Field(
+        default=True, alias="ELASTIC_RETRY_ON_TIMEOUT"
+    )
+    connections_per_node: int = Field(
+        default=10, alias="ELASTIC_CONNECTIONS_PER_NODE"
+    )
+    node_selector: Literal["round_robin", "random"] = Field(
+        default="round_robin", alias="ELASTIC_NODE_SELECTOR"
+    )
+    sniff_on_start: bool = Field(default=False, alias="ELASTIC_SNIFF_ON_START")
+    sniff_on_node_failure: bool = Field(
+        default=False, alias="ELASTIC_SNIFF_ON_NODE_FAILURE"
+    )
+    sniff_timeout: float = Field(default=1, alias="ELASTIC_SNIFF_TIMEOUT")
+    warmup_connections: int = Field(
+        default=2, alias="ELASTIC_WARMUP_CONNECTIONS"
+    )
 
     @property
     def get_host(self) -> str:
         return f"http://{self.host}:{self.port}"
+
+    @property
+    def get_hosts(self) -> list[str]:
+        hosts = [host.strip() for host in self.hosts.split(",") if host.strip()]
+        if not hosts:
+            return [self.get_host]
+        return [host if "://" in host else f"http://{host}" for host in hosts]
@@ -9,3 +9,16 @@ class RedisSettings(BaseSettings):
 
     host: str = Field(default=..., alias="REDIS_HOST")
     port: int = Field(default=6379, alias="REDIS_PORT")
+
+    max_connections: int = Field(default=50, alias="REDIS_MAX_CONNECTIONS")
+    pool_timeout: int = Field(default=1, alias="REDIS_POOL_TIMEOUT")
+    socket_timeout: float = Field(default=1, alias="REDIS_SOCKET_TIMEOUT")
+    socket_connect_timeout: float = Field(
+        default=1, alias="REDIS_SOCKET_CONNECT_TIMEOUT"
+    )
+    socket_keepalive: bool = Field(default=True, alias="REDIS_SOCKET_KEEPALIVE")
+    health_check_interval: int = Field(
+        default=30, alias="REDIS_HEALTH_CHECK_INTERVAL"
+    )
+    retries: int = Field(default=2, alias="REDIS_RETRIES")
+    warmup_connections: int = Field(default=4, alias="REDIS_WARMUP_CONNECTIONS")
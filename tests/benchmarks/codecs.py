@@ -0,0 +1,76 @@
+"""
+Сравнение кодеков RedisCache по размеру и времени кодирования/декодирования
+на тестовых данных из tests/functional/testdata.
+
+Запуск:
+    python -m tests.benchmarks.codecs
+"""
+
+import time
+import uuid
+
+from src.api.cache.codecs import CODECS, get_codec
+from src.api.models.db.film import FilmDB
+from src.api.models.db.genre import GenreDB
+from src.api.models.db.person import PersonDB
+from tests.functional.testdata.films_data import (
+    es_films_data_1,
+    es_films_data_2,
+)
+from tests.functional.testdata.genres_data import es_genres_data
+from tests.functional.testdata.persons_data import (
+    es_persons_data_1,
+    es_persons_data_2,
+)
+
+ROUNDS = 10_000
+
+DATASET = {
+    "films": (
+        FilmDB,
+        [
+            FilmDB(uuid=str(uuid.uuid4()), **data)
+            for data in (es_films_data_1, es_films_data_2)
+        ],
+    ),
+    "persons": (
+        PersonDB,
+        [
+            PersonDB(uuid=str(uuid.uuid4()), **data)
+            for data in (es_persons_data_1, es_persons_data_2)
+        ],
+    ),
+    "genres": (GenreDB, [GenreDB(uuid=str(uuid.uuid4()), **es_genres_data)]),
+}
+
+
+def measure(func, values) -> float:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for value in values:
+            func(value)
+    return (time.perf_counter() - start) / ROUNDS / len(values) * 1_000_000
+
+
+def main():
+    print(
+        f"{'dataset':>8} | {'codec':>12} | {'bytes':>6} | "
+        f"{'encode, us':>10} | {'decode, us':>10}"
+    )
+    for dataset, (model, values) in DATASET.items():
+        for name in CODECS:
+            codec = get_codec(name)
+            encoded = [codec.header + codec.encode(value) for value in values]
+            size = sum(len(data) for data in encoded) / len(encoded)
+            encode_us = measure(codec.encode, values)
+            decode_us = measure(
+                lambda data: codec.decode(data[1:], model), encoded
+            )
+            print(
+                f"{dataset:>8} | {name:>12} | {size:>6.0f} | "
+                f"{encode_us:>10.2f} | {decode_us:>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Сравнение процессорного времени на запрос для эндпоинтов фильмов: старый
+способ ответа (пересоздание моделей в эндпоинте и валидация по
+`response_model`) и текущие эндпоинты с однократной сериализацией.
+
+Сервис фильмов подменяется заглушкой, поэтому измеряется только работа
+api, без Redis и Elastic.
+
+Запуск:
+    python -m tests.benchmarks.endpoints
+"""
+
+import asyncio
+import time
+import uuid
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, FastAPI, Path, Query, Response
+
+from src.api.endpoints.v1 import films
+from src.api.models.api.v1.film import Film, FilmForFilmsList
+from src.api.models.db.film import FilmDB, FilmListItemDB
+from src.api.services.film import get_film_service
+from src.api.validators.cursor import cursor_validators
+from src.api.validators.films import FilmFieldsToSort
+from src.api.validators.pagination import PaginatedParams, get_paginated_params
+from tests.functional.testdata.films_data import es_films_data_1
+
+ROUNDS = 2_000
+FILM_ID = str(uuid.uuid4())
+FILM = FilmDB(uuid=FILM_ID, **es_films_data_1)
+FILMS = [
+    FilmListItemDB(
+        uuid=str(uuid.uuid4()), title=f"Film {i}", imdb_rating=i % 10
+    )
+    for i in range(50)
+]
+
+
+class StubFilmService:
+    async def get_by_id(self, film_id: str) -> FilmDB:
+        return FILM
+
+    async def get_films(self, **kwargs) -> list[FilmListItemDB]:
+        return FILMS
+
+
+async def get_stub_film_service() -> StubFilmService:
+    return STUB_FILM_SERVICE
+
+
+STUB_FILM_SERVICE = StubFilmService()
+legacy_router = APIRouter()
+
+
+@legacy_router.get("/{film_id}", response_model=Film)
+async def legacy_film_details(
+    film_uuid: Annotated[uuid.UUID, Path(alias="film_id")],
+    film_service=Depends(get_film_service),
+) -> Film:
+    film = await film_service.get_by_id(film_uuid)
+    return Film(
+        uuid=film.uuid,
+        title=film.title,
+        imdb_rating=film.imdb_rating,
+        genre=film.genre,
+        description=film.description,
+        directors=film.directors,
+        actors=film.actors,
+        writers=film.writers,
+    )
+
+
+@legacy_router.get("/", response_model=list[FilmForFilmsList])
+async def legacy_films(
+    response: Response,
+    page_number: int = 1,
+    page_size: int = 50,
+    genre_uuid: Annotated[uuid.UUID | None, Query(alias="genre")] = None,
+    sort: Annotated[
+        FilmFieldsToSort, Query(alias="sort")
+    ] = FilmFieldsToSort.desc_rating,
+    cursor: Annotated[str | None, cursor_validators] = None,
+    paginated_params: PaginatedParams = Depends(get_paginated_params),
+    film_service=Depends(get_film_service),
+) -> list[FilmForFilmsList]:
+    paginated_params.validate(page_number, page_size)
+    films = await film_service.get_films(
+        **paginated_params.get(), genre_uuid=genre_uuid, sort=sort
+    )
+    return [
+        FilmForFilmsList(
+            uuid=film.uuid, title=film.title, imdb_rating=film.imdb_rating
+        )
+        for film in films
+    ]
+
+
+def build_app(router: APIRouter) -> FastAPI:
+    app = FastAPI()
+    app.include_router(router, prefix="/api/v1/films")
+    app.dependency_overrides[get_film_service] = get_stub_film_service
+    return app
+
+
+async def request(app: FastAPI, path: str, query: bytes = b"") -> bytes:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": query,
+        "headers": [(b"host", b"benchmark")],
+        "server": ("benchmark", 80),
+        "client": ("benchmark", 1),
+    }
+    body = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            body.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return b"".join(body)
+
+
+async def measure(app: FastAPI, path: str, query: bytes = b"") -> float:
+    await request(app, path, query)
+    start = time.process_time()
+    for _ in range(ROUNDS):
+        await request(app, path, query)
+    return (time.process_time() - start) / ROUNDS * 1_000_000
+
+
+async def main():
+    apps = {
+        "legacy": build_app(legacy_router),
+        "current": build_app(films.router),
+    }
+    cases = {
+        "film details": (f"/api/v1/films/{FILM_ID}", b""),
+        "films list (50)": ("/api/v1/films/", b"page_size=50"),
+    }
+    print(f"{'endpoint':>16} | {'app':>8} | {'cpu per request, us':>20}")
+    for case, (path, query) in cases.items():
+        for name, app in apps.items():
+            cpu_us = await measure(app, path, query)
+            print(f"{case:>16} | {name:>8} | {cpu_us:>20.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,86 @@
+"""
+Сравнение старого и нового способа записи/чтения списков моделей в Redis.
+
+Запуск (нужен доступный Redis из .env):
+    python -m tests.benchmarks.redis_list
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+
+from redis.asyncio import Redis
+
+from src.api.cache.redis import RedisCache
+from src.api.models.db.film import FilmDB
+from tests.functional.settings import settings
+from tests.functional.testdata.films_data import es_films_data_1
+
+PAGE_SIZES = (1, 10, 25, 50, 100)
+ROUNDS = 200
+KEY = "benchmark-redis-list"
+EXPIRE = 60
+
+
+async def legacy_set(redis: Redis, key: str, values: list[FilmDB]) -> None:
+    for value in values:
+        await redis.lpush(key, value.model_dump_json())
+    await redis.expire(key, EXPIRE)
+
+
+async def legacy_get(redis: Redis, key: str) -> list[FilmDB]:
+    list_count = await redis.llen(key)
+    values = await redis.lrange(key, 0, list_count)
+    values.reverse()
+    return [FilmDB.model_validate_json(value) for value in values]
+
+
+async def measure(func, *args, prepare=None) -> float:
+    """Среднее время вызова в мс, `prepare` выполняется вне замера."""
+    elapsed = 0.0
+    for _ in range(ROUNDS):
+        if prepare:
+            await prepare()
+        start = time.perf_counter()
+        await func(*args)
+        elapsed += time.perf_counter() - start
+    return elapsed / ROUNDS * 1000
+
+
+async def main():
+    redis = Redis(**settings.get_redis_host)
+    cache = RedisCache(redis, logging.getLogger("benchmark"))
+    print(
+        f"{'size':>5} | {'old set, ms':>11} | {'new set, ms':>11} | "
+        f"{'old get, ms':>11} | {'new get, ms':>11}"
+    )
+    try:
+        for size in PAGE_SIZES:
+            films = [
+                FilmDB(uuid=str(uuid.uuid4()), **es_films_data_1)
+                for _ in range(size)
+            ]
+
+            async def prepare():
+                await redis.delete(KEY)
+
+            old_set_ms = await measure(
+                legacy_set, redis, KEY, films, prepare=prepare
+            )
+            old_get_ms = await measure(legacy_get, redis, KEY)
+            new_set_ms = await measure(
+                cache.set_list_model, KEY, films, EXPIRE, prepare=prepare
+            )
+            new_get_ms = await measure(cache.get_list_model, KEY, FilmDB)
+            print(
+                f"{size:>5} | {old_set_ms:>11.3f} | {new_set_ms:>11.3f} | "
+                f"{old_get_ms:>11.3f} | {new_get_ms:>11.3f}"
+            )
+    finally:
+        await redis.delete(KEY)
+        await redis.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -26,3 +26,20 @@ def make_get_request(session: aiohttp.ClientSession):
         return body, status
 
     return inner
+
+
+@pytest.fixture
+def make_get_request_with_headers(session: aiohttp.ClientSession):
+    async def inner(path: str, query_data: dict = None, headers: dict = None):
+        url = settings.get_api_host + "/api/v1" + path
+        async with session.get(
+            url, params=query_data, headers=headers
+        ) as response:
+            body = await response.read()
+        try:
+            body = json.loads(body)
+        except JSONDecodeError:
+            pass
+        return body, response.status, response.headers
+
+    return inner
@@ -16,6 +16,8 @@ from tests.functional.testdata.base_data import (
 
 import string
 
+from tests.functional.settings import settings
+
 
 @pytest.mark.parametrize(
     "query_data, expected_answer",
@@ -271,6 +273,29 @@ async def test_paginated(
             ].get("uuid")
 
 
+@pytest.mark.asyncio
+async def test_paginated_page_sizes(
+    make_get_request, es_write_data, clear_cache
+):
+    template = [{"uuid": id} for id in ids[:10]]
+    for id in template:
+        id.update(es_films_data_1)
+    await es_write_data(template, module="films")
+
+    await clear_cache()
+    body, status = await make_get_request(
+        "/films/", {"page_number": 1, "page_size": 10}
+    )
+    assert status == HTTPStatus.OK
+    for page_number, page_size in [(1, 3), (2, 3), (4, 3), (2, 4), (3, 4)]:
+        page, status = await make_get_request(
+            "/films/", {"page_number": page_number, "page_size": page_size}
+        )
+        start = (page_number - 1) * page_size
+        assert status == HTTPStatus.OK
+        assert page == body[start : start + page_size]
+
+
 @pytest.mark.parametrize(
     "query_data, expected_answer",
     [
@@ -311,3 +336,180 @@ async def test_search(
         assert len(es_body) == expected_answer.get("length")
         for doc in es_body:
             assert doc.get("uuid") in ids
+
+
+@pytest.mark.parametrize(
+    "query_data, expected_answer",
+    [
+        (
+            [("ids", id_good_1), ("ids", id_bad), ("ids", ids[0])],
+            {
+                "status": HTTPStatus.OK,
+                "items": [id_good_1, ids[0]],
+                "missing": [id_bad],
+            },
+        ),
+        (
+            [("ids", id_bad)],
+            {"status": HTTPStatus.OK, "items": [], "missing": [id_bad]},
+        ),
+        ([("ids", id_invalid)], {"status": HTTPStatus.UNPROCESSABLE_ENTITY}),
+        (None, {"status": HTTPStatus.UNPROCESSABLE_ENTITY}),
+        (
+            [("ids", id_good_1)] * 51,
+            {"status": HTTPStatus.UNPROCESSABLE_ENTITY},
+        ),
+    ],
+)
+@pytest.mark.asyncio
+async def test_films_batch(
+    make_get_request,
+    es_write_data,
+    es_delete_data,
+    clear_cache,
+    query_data,
+    expected_answer,
+):
+    template = [{"uuid": id_good_1}, {"uuid": ids[0]}]
+    for item in template:
+        item.update(es_films_data_1)
+    await es_write_data(template, module="films")
+
+    await clear_cache()
+    path = "/films/batch"
+    es_response = await make_get_request(path, query_data)
+    es_body, es_status = es_response
+
+    assert es_status == expected_answer.get("status")
+    if es_status == HTTPStatus.OK:
+        await es_delete_data(module="films")
+        rd_response = await make_get_request(path, query_data)
+        rd_body, rd_status = rd_response
+
+        assert es_status == rd_status
+        assert es_body == rd_body
+        assert [
+            doc.get("uuid") for doc in es_body.get("items")
+        ] == expected_answer.get("items")
+        assert es_body.get("missing") == expected_answer.get("missing")
+
+
+@pytest.mark.parametrize(
+    "headers, expected_answer",
+    [
+        ({}, {"status": HTTPStatus.OK, "cache": ["MISS", "HIT"]}),
+        (
+            {"X-Cache-Bypass": "1"},
+            {"status": HTTPStatus.OK, "cache": [None, None]},
+        ),
+    ],
+)
+@pytest.mark.asyncio
+async def test_response_cache(
+    make_get_request_with_headers,
+    es_write_data,
+    clear_cache,
+    headers,
+    expected_answer,
+):
+    template = [{"uuid": id_good_1}]
+    template[0].update(es_films_data_1)
+    await es_write_data(template, module="films")
+
+    await clear_cache()
+    path = f"/films/{id_good_1}"
+    bodies = []
+    cache = []
+    for _ in range(2):
+        body, status, response_headers = await make_get_request_with_headers(
+            path, headers=headers
+        )
+        assert status == expected_answer.get("status")
+        bodies.append(body)
+        cache.append(response_headers.get("X-Cache"))
+
+    assert bodies[0] == bodies[1]
+    assert cache == expected_answer.get("cache")
+
+
+@pytest.mark.parametrize(
+    "path",
+    [f"/films/{id_good_1}", "/films/", "/films/search/"],
+)
+@pytest.mark.asyncio
+async def test_conditional_get(
+    make_get_request_with_headers,
+    es_write_data,
+    clear_cache,
+    path,
+):
+    template = [{"uuid": id_good_1}]
+    template[0].update(es_films_data_1)
+    await es_write_data(template, module="films")
+
+    await clear_cache()
+    body, status, headers = await make_get_request_with_headers(path)
+    assert status == HTTPStatus.OK
+    assert headers.get("Cache-Control", "").startswith("max-age=")
+    etag = headers.get("ETag")
+    assert etag
+
+    body, status, headers = await make_get_request_with_headers(
+        path, headers={"If-None-Match": etag}
+    )
+    assert status == HTTPStatus.NOT_MODIFIED
+    assert headers.get("ETag") == etag
+
+    body, status, headers = await make_get_request_with_headers(
+        path, headers={"If-None-Match": '"outdated"'}
+    )
+    assert status == HTTPStatus.OK
+    assert headers.get("ETag") == etag
+
+
+@pytest.mark.asyncio
+async def test_metrics(make_get_request, session, es_write_data, clear_cache):
+    template = [{"uuid": id_good_1}]
+    template[0].update(es_films_data_1)
+    await es_write_data(template, module="films")
+
+    await clear_cache()
+    await make_get_request(f"/films/{id_good_1}")
+    async with session.get(settings.get_api_host + "/metrics") as response:
+        body = await response.text()
+    assert response.status == HTTPStatus.OK
+    assert (
+        'api_request_duration_seconds_count{method="GET",'
+        'route="/api/v1/films/{film_id}",status="200"}' in body
+    )
+    assert 'api_cache_requests_total{prefix="FilmService"' in body
+    assert 'api_elastic_duration_seconds_count{index="movies"' in body
+    assert 'api_redis_duration_seconds_count{operation="get_one_entry"}' in body
+
+
+@pytest.mark.asyncio
+async def test_server_timing(
+    make_get_request_with_headers, es_write_data, clear_cache
+):
+    template = [{"uuid": id_good_1}]
+    template[0].update(es_films_data_1)
+    await es_write_data(template, module="films")
+
+    await clear_cache()
+    body, status, headers = await make_get_request_with_headers(
+        f"/films/{id_good_1}"
+    )
+    assert status == HTTPStatus.OK
+    assert "Server-Timing" not in headers
+
+    body, status, headers = await make_get_request_with_headers(
+        "/films/",
+        query_data={"page_size": 5},
+        headers={"X-Server-Timing": "1"},
+    )
+    assert status == HTTPStatus.OK
+    timing = headers.get("Server-Timing", "")
+    assert 'cache;desc="miss"' in timing
+    assert "es;dur=" in timing
+    assert "serialize;dur=" in timing
+    assert "total;dur=" in timing
@@ -1,3 +1,6 @@
+import base64
+import json
+
 import pytest
 from http import HTTPStatus
 
@@ -11,6 +14,11 @@ from tests.functional.testdata.base_data import (
 from tests.functional.testdata.genres_data import es_genres_data
 
 
+def encode_cursor(search_after):
+    data = json.dumps(search_after).encode()
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
 @pytest.mark.parametrize(
     "query_data, expected_answer",
     [
@@ -146,3 +154,122 @@ async def test_paginated(
             assert template[start:stop][index].get("uuid") == es_body[
                 index
             ].get("uuid")
+
+
+@pytest.mark.parametrize(
+    "query_data, expected_answer",
+    [
+        (
+            [("ids", id_good_1), ("ids", id_bad), ("ids", ids[0])],
+            {
+                "status": HTTPStatus.OK,
+                "items": [id_good_1, ids[0]],
+                "missing": [id_bad],
+            },
+        ),
+        (
+            [("ids", id_bad)],
+            {"status": HTTPStatus.OK, "items": [], "missing": [id_bad]},
+        ),
+        ([("ids", id_invalid)], {"status": HTTPStatus.UNPROCESSABLE_ENTITY}),
+        (None, {"status": HTTPStatus.UNPROCESSABLE_ENTITY}),
+        (
+            [("ids", id_good_1)] * 51,
+            {"status": HTTPStatus.UNPROCESSABLE_ENTITY},
+        ),
+    ],
+)
+@pytest.mark.asyncio
+async def test_genres_batch(
+    make_get_request,
+    es_write_data,
+    es_delete_data,
+    clear_cache,
+    query_data,
+    expected_answer,
+):
+    template = [{"uuid": id_good_1}, {"uuid": ids[0]}]
+    for item in template:
+        item.update(es_genres_data)
+    await es_write_data(template, module="genres")
+
+    await clear_cache()
+    path = "/genres/batch"
+    es_response = await make_get_request(path, query_data)
+    es_body, es_status = es_response
+
+    assert es_status == expected_answer.get("status")
+    if es_status == HTTPStatus.OK:
+        await es_delete_data(module="genres")
+        rd_response = await make_get_request(path, query_data)
+        rd_body, rd_status = rd_response
+
+        assert es_status == rd_status
+        assert es_body == rd_body
+        assert [
+            doc.get("uuid") for doc in es_body.get("items")
+        ] == expected_answer.get("items")
+        assert es_body.get("missing") == expected_answer.get("missing")
+
+
+@pytest.mark.parametrize(
+    "query_data, expected_answer",
+    [
+        ({"page_size": 4}, {"status": HTTPStatus.OK, "lengths": [4, 4, 2]}),
+        ({"page_size": 5}, {"status": HTTPStatus.OK, "lengths": [5, 5]}),
+        ({"page_size": 0}, {"status": HTTPStatus.UNPROCESSABLE_ENTITY}),
+        (
+            {"page_size": 2, "cursor": "not a cursor"},
+            {"status": HTTPStatus.UNPROCESSABLE_ENTITY},
+        ),
+        (
+            {"page_size": 2, "cursor": encode_cursor([])},
+            {"status": HTTPStatus.UNPROCESSABLE_ENTITY},
+        ),
+        (
+            {"page_size": 2, "cursor": encode_cursor([1.0])},
+            {"status": HTTPStatus.UNPROCESSABLE_ENTITY},
+        ),
+        (
+            {"page_size": 2, "cursor": encode_cursor([1.0, id_good_1, 1])},
+            {"status": HTTPStatus.UNPROCESSABLE_ENTITY},
+        ),
+        (
+            {"page_size": 2, "cursor": encode_cursor(["high", id_good_1])},
+            {"status": HTTPStatus.UNPROCESSABLE_ENTITY},
+        ),
+    ],
+)
+@pytest.mark.asyncio
+async def test_cursor_paginated(
+    make_get_request_with_headers,
+    es_write_data,
+    clear_cache,
+    query_data,
+    expected_answer,
+):
+    template = [{"uuid": id} for id in ids[:10]]
+    for id in template:
+        id.update(es_genres_data)
+    await es_write_data(template, module="genres")
+
+    await clear_cache()
+    path = "/genres/"
+    query_data = {"cursor": "", **query_data}
+    lengths = []
+    uuids = []
+    while True:
+        body, status, headers = await make_get_request_with_headers(
+            path, query_data
+        )
+        assert status == expected_answer.get("status")
+        if status != HTTPStatus.OK:
+            return
+        lengths.append(len(body))
+        uuids.extend(doc.get("uuid") for doc in body)
+        if "X-Next-Cursor" not in headers:
+            break
+        query_data["cursor"] = headers["X-Next-Cursor"]
+
+    assert lengths == expected_answer.get("lengths")
+    assert uuids == sorted(ids[:10])
@@ -0,0 +1,23 @@
+import pytest
+from http import HTTPStatus
+
+from tests.functional.settings import settings
+
+
+@pytest.mark.asyncio
+async def test_live(session):
+    async with session.get(settings.get_api_host + "/health/live") as response:
+        body = await response.json()
+    assert response.status == HTTPStatus.OK
+    assert body["status"] == "ok"
+
+
+@pytest.mark.asyncio
+async def test_ready(session):
+    async with session.get(settings.get_api_host + "/health/ready") as response:
+        body = await response.json()
+    assert response.status == HTTPStatus.OK
+    assert body["status"] == "ok"
+    for dependency in ("redis", "elastic"):
+        assert body["checks"][dependency]["status"] == "ok"
+        assert body["checks"][dependency]["latency_ms"] is not None
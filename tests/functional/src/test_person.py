@@ -167,3 +167,59 @@ async def test_one_person(
         assert es_body == rd_body
         assert es_body.get("uuid") == expected_answer.get("uuid")
         assert rd_body.get("uuid") == expected_answer.get("uuid")
+
+
+@pytest.mark.parametrize(
+    "query_data, expected_answer",
+    [
+        (
+            [("ids", id_good_1), ("ids", id_bad), ("ids", ids[0])],
+            {
+                "status": HTTPStatus.OK,
+                "items": [id_good_1, ids[0]],
+                "missing": [id_bad],
+            },
+        ),
+        (
+            [("ids", id_bad)],
+            {"status": HTTPStatus.OK, "items": [], "missing": [id_bad]},
+        ),
+        ([("ids", id_invalid)], {"status": HTTPStatus.UNPROCESSABLE_ENTITY}),
+        (None, {"status": HTTPStatus.UNPROCESSABLE_ENTITY}),
+        (
+            [("ids", id_good_1)] * 51,
+            {"status": HTTPStatus.UNPROCESSABLE_ENTITY},
+        ),
+    ],
+)
+@pytest.mark.asyncio
+async def test_persons_batch(
+    make_get_request,
+    es_write_data,
+    es_delete_data,
+    clear_cache,
+    query_data,
+    expected_answer,
+):
+    template = [{"uuid": id_good_1}, {"uuid": ids[0]}]
+    for item in template:
+        item.update(es_persons_data_1)
+    await es_write_data(template, module="persons")
+
+    await clear_cache()
+    path = "/persons/batch"
+    es_response = await make_get_request(path, query_data)
+    es_body, es_status = es_response
+
+    assert es_status == expected_answer.get("status")
+    if es_status == HTTPStatus.OK:
+        await es_delete_data(module="persons")
+        rd_response = await make_get_request(path, query_data)
+        rd_body, rd_status = rd_response
+
+        assert es_status == rd_status
+        assert es_body == rd_body
+        assert [
+            doc.get("uuid") for doc in es_body.get("items")
+        ] == expected_answer.get("items")
+        assert es_body.get("missing") == expected_answer.get("missing")
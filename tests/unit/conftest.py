@@ -0,0 +1,34 @@
+import os
+
+import fakeredis
+import pytest
+
+# Обязательные настройки api, без которых модули с `settings` не
+# импортируются. Значения из окружения и `.env` имеют приоритет.
+REQUIRED_ENV = {
+    "API_PROJECT_NAME": "test",
+    "API_PROJECT_DESCRIPTION": "test",
+    "API_HOST": "localhost",
+    "API_PORT": "8000",
+    "API_DOCS_URL": "/docs",
+    "API_OPENAPI_URL": "/json",
+    "API_CACHE_EXPIRE_FOR_FILM_SERVICE": "300",
+    "API_CACHE_EXPIRE_FOR_GENRES_SERVICE": "300",
+    "API_CACHE_EXPIRE_FOR_PERSON_SERVICE": "300",
+    "ELASTIC_HOST": "localhost",
+    "REDIS_HOST": "localhost",
+}
+
+for name, value in REQUIRED_ENV.items():
+    os.environ.setdefault(name, value)
+
+
+@pytest.fixture
+def redis_server():
+    """Общий сервер для клиентов fakeredis одного теста."""
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def redis(redis_server):
+    return fakeredis.aioredis.FakeRedis(server=redis_server)
@@ -0,0 +1,87 @@
+import time
+from collections import defaultdict
+from collections.abc import Iterable
+from typing import Any
+
+from prometheus_client import REGISTRY
+
+from src.api.cache.abstract import AbstractModelCache, CacheEntry
+
+
+class DictCache(AbstractModelCache):
+    """Основной кэш в словаре с теми же правилами записи, что у RedisCache."""
+
+    def __init__(self):
+        self.entries: dict[str, tuple[Any, float]] = {}
+        self.tags: dict[str, set[str]] = defaultdict(set)
+        self.reads = 0
+
+    async def set_one_model(self, key, value, cache_expire, tags=()):
+        self.__set(key, value, cache_expire, tags)
+
+    async def set_empty(self, key, cache_expire, tags=()):
+        self.__set(key, None, cache_expire, tags)
+
+    async def get_one_model(self, key, model):
+        entry = await self.get_one_entry(key, model)
+        return entry.value if entry else None
+
+    async def set_list_model(self, key, values, cache_expire, tags=()):
+        self.__set(key, list(values), cache_expire, tags)
+
+    async def get_list_model(self, key, model):
+        entry = await self.get_list_entry(key, model)
+        return entry.value or None if entry else None
+
+    async def get_one_entry(self, key, model):
+        return self.__get(key)
+
+    async def get_list_entry(self, key, model, start=0, stop=-1):
+        entry = self.__get(key)
+        if entry is None:
+            return None
+        if not entry.value:
+            return CacheEntry(None, entry.ttl)
+        end = None if stop == -1 else stop + 1
+        return CacheEntry(entry.value[start:end], entry.ttl)
+
+    async def set_many_models(self, values, cache_expire, tags=None):
+        for key, value in values.items():
+            self.__set(key, value, cache_expire, (tags or {}).get(key, ()))
+
+    async def get_many_models(self, keys, model):
+        return [self.__get(key) for key in keys]
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> int:
+        keys = set().union(*(self.tags.pop(tag, set()) for tag in tags))
+        return sum(self.entries.pop(key, None) is not None for key in keys)
+
+    def build_key(self, key_prefix: str, *args: Any) -> str:
+        return f"{key_prefix}-" + "".join(f"{arg}:" for arg in args)
+
+    def expire(self, key: str) -> None:
+        """Сделать запись истёкшей, как будто её TTL прошёл."""
+        self.entries.pop(key, None)
+
+    def __set(
+        self, key: str, value: Any, cache_expire: int, tags: Iterable[str]
+    ) -> None:
+        self.entries[key] = (value, time.monotonic() + cache_expire)
+        for tag in tags:
+            self.tags[tag].add(key)
+
+    def __get(self, key: str) -> CacheEntry[Any] | None:
+        self.reads += 1
+        if key not in self.entries:
+            return None
+        value, expires_at = self.entries[key]
+        ttl = expires_at - time.monotonic()
+        if ttl <= 0:
+            del self.entries[key]
+            return None
+        return CacheEntry(value, ttl)
+
+
+def sample(name: str, **labels: str) -> float:
+    """Текущее значение метрики Prometheus `name` с метками `labels`."""
+    return REGISTRY.get_sample_value(name, labels) or 0
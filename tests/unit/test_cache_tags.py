@@ -0,0 +1,97 @@
+import asyncio
+import logging
+import sys
+import time
+from types import SimpleNamespace
+
+import fakeredis
+import pytest
+from pydantic import BaseModel
+
+from src.api.cache import invalidate as invalidate_cli
+from src.api.cache import redis as redis_cache
+from src.api.cache.redis import TAG_PREFIX, RedisCache
+
+EXPIRE = 60
+TAGS = {
+    "Tagged-a": ["film:1"],
+    "Tagged-b": ["film:1", "film:2"],
+    "Tagged-c": ["film:2"],
+    "Tagged-d": [],
+}
+
+
+class Doc(BaseModel):
+    uuid: str
+
+
+def make_cache(redis):
+    return RedisCache(redis, logging.getLogger("test"), tag_expire=EXPIRE * 2)
+
+
+async def fill(cache):
+    for key, tags in TAGS.items():
+        await cache.set_one_model(key, Doc(uuid=key), EXPIRE, tags=tags)
+
+
+async def stored(redis):
+    return sorted(key.decode() for key in await redis.keys("Tagged-*"))
+
+
+@pytest.mark.asyncio
+async def test_invalidate_tags_deletes_only_tagged_entries(redis):
+    cache = make_cache(redis)
+    await fill(cache)
+
+    assert await cache.invalidate_tags(["film:1"]) == 2
+
+    assert await stored(redis) == ["Tagged-c", "Tagged-d"]
+    assert await cache.get_one_model("Tagged-c", Doc) == Doc(uuid="Tagged-c")
+    assert await redis.zcard(cache.build_key(TAG_PREFIX, "film:1")) == 0
+
+
+@pytest.mark.asyncio
+async def test_unknown_tag_deletes_nothing(redis):
+    cache = make_cache(redis)
+    await fill(cache)
+
+    assert await cache.invalidate_tags(["film:3"]) == 0
+    assert await stored(redis) == sorted(TAGS)
+
+
+@pytest.mark.asyncio
+async def test_tag_write_drops_expired_keys(redis, monkeypatch):
+    now = [time.time()]
+    monkeypatch.setattr(
+        redis_cache,
+        "time",
+        SimpleNamespace(time=lambda: now[0], perf_counter=time.perf_counter),
+    )
+    cache = make_cache(redis)
+    tag_key = cache.build_key(TAG_PREFIX, "film:1")
+    for number in range(5):
+        await cache.set_one_model(
+            f"Old-{number}", Doc(uuid="old"), EXPIRE, tags=["film:1"]
+        )
+
+    now[0] += EXPIRE + 1
+    await cache.set_empty("New", EXPIRE, tags=["film:1"])
+
+    assert await redis.zrange(tag_key, 0, -1) == [b"New"]
+    assert 0 < await redis.ttl(tag_key) <= EXPIRE * 2
+
+
+def test_purge_command_deletes_only_tagged_entries(
+    redis_server, monkeypatch, capsys
+):
+    def create_redis(settings):
+        return fakeredis.aioredis.FakeRedis(server=redis_server)
+
+    asyncio.run(fill(make_cache(create_redis(None))))
+    monkeypatch.setattr(invalidate_cli, "create_redis", create_redis)
+    monkeypatch.setattr(sys, "argv", ["invalidate", "film:2"])
+
+    invalidate_cli.main()
+
+    assert capsys.readouterr().out == "Deleted 2 cache entries.\n"
+    assert asyncio.run(stored(create_redis(None))) == ["Tagged-a", "Tagged-d"]
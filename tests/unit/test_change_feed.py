@@ -0,0 +1,245 @@
+import logging
+
+import fakeredis
+import pytest
+
+from src.api.cache.abstract import CachedResponse
+from src.api.cache.generations import Generations
+from src.api.cache.redis import RedisCache
+from src.api.changes.abstract import (
+    OPERATION_CREATE,
+    OPERATION_DELETE,
+    ChangeEvent,
+)
+from src.api.changes.consumer import ChangeFeedConsumer
+from src.api.changes.memory import MemoryChangeFeed
+from src.api.db.abstract import DBUnavailableError
+from src.api.models.db.base import UUIDDB
+from src.api.services.base import BaseElasticService
+from tests.unit.fakes import sample
+
+CACHE_EX = 300
+EMPTY_EX = 30
+EVENTS = "api_change_events_total"
+
+
+class Doc(UUIDDB):
+    title: str
+
+
+class DocService(BaseElasticService[Doc]):
+    _key_prefix = "DocService"
+    _index = "docs"
+    _entity = "film"
+
+    async def reload(self, obj_ids, lists=False):
+        await self._reload_by_ids(obj_ids, Doc, lists)
+
+
+class DocDB:
+    def __init__(self, docs):
+        self.docs = docs
+        self.available = True
+
+    async def get_by_id(self, obj_id, model, **kwargs):
+        return (await self.get_by_ids([obj_id], model))[0]
+
+    async def get_by_ids(self, obj_ids, model, **kwargs):
+        if not self.available:
+            raise DBUnavailableError("down")
+        return [self.docs.get(obj_id) for obj_id in obj_ids]
+
+
+@pytest.fixture
+def generations(redis):
+    return Generations(redis, ("docs",), 60, logging.getLogger("test"))
+
+
+@pytest.fixture
+def cache(redis, generations):
+    return RedisCache(
+        redis,
+        logging.getLogger("test"),
+        tag_expire=CACHE_EX * 2,
+        generations=generations,
+        namespaces={"DocService": ("docs",)},
+    )
+
+
+@pytest.fixture
+def db():
+    return DocDB(
+        {"1": Doc(uuid="1", title="old"), "2": Doc(uuid="2", title="")}
+    )
+
+
+@pytest.fixture
+def service(cache, db):
+    return DocService(cache, CACHE_EX, db, cache_empty_ex=EMPTY_EX)
+
+
+@pytest.fixture
+def feed():
+    return MemoryChangeFeed()
+
+
+@pytest.fixture
+def consumer(feed, service):
+    return ChangeFeedConsumer(
+        feed,
+        {"film": service.reload},
+        batch_size=10,
+        timeout=0.01,
+        retry_delay=0,
+        logger=logging.getLogger("test"),
+    )
+
+
+async def fill(service, cache):
+    """Записать фильмы, списки и ответ с тегами фильмов."""
+    await service._get_by_id("1", Doc)
+    await service._get_by_id("2", Doc)
+    for key, tags in {
+        "List-1": ["film:1", "film:lists"],
+        "List-2": ["film:2", "film:lists"],
+    }.items():
+        await cache.set_list_model(key, [UUIDDB(uuid="1")], CACHE_EX, tags)
+    await cache.set_response(
+        "Response-1", CachedResponse(b"{}", [], "etag"), CACHE_EX, ["film:1"]
+    )
+
+
+async def read(cache, obj_id):
+    return await cache.get_one_entry(cache.build_key("DocService", obj_id), Doc)
+
+
+async def stored(redis):
+    return sorted(key.decode() for key in await redis.keys("[LR]*-*"))
+
+
+@pytest.mark.asyncio
+async def test_update_invalidates_entries_tagged_with_entity(
+    consumer, feed, service, cache, db, redis
+):
+    await fill(service, cache)
+    db.docs["1"] = Doc(uuid="1", title="new")
+    await feed.publish(ChangeEvent("film", "1"))
+
+    assert await consumer.consume() == 1
+
+    assert (await read(cache, "1")).value == Doc(uuid="1", title="new")
+    assert (await read(cache, "2")).value == Doc(uuid="2", title="")
+    assert await stored(redis) == ["List-2"]
+    assert feed.pending == {}
+
+
+@pytest.mark.asyncio
+async def test_create_invalidates_entity_lists(
+    consumer, feed, service, cache, db, redis
+):
+    await fill(service, cache)
+    db.docs["3"] = Doc(uuid="3", title="new")
+    await feed.publish(ChangeEvent("film", "3", OPERATION_CREATE))
+
+    await consumer.consume()
+
+    assert (await read(cache, "3")).value == Doc(uuid="3", title="new")
+    assert await stored(redis) == ["Response-1"]
+
+
+@pytest.mark.asyncio
+async def test_delete_caches_missing_entity(
+    consumer, feed, service, cache, db, redis
+):
+    await fill(service, cache)
+    del db.docs["1"]
+    await feed.publish(ChangeEvent("film", "1", OPERATION_DELETE))
+
+    await consumer.consume()
+
+    entry = await read(cache, "1")
+    assert entry.value is None
+    assert EMPTY_EX - 1 < entry.ttl <= EMPTY_EX
+    assert await stored(redis) == []
+
+
+@pytest.mark.asyncio
+async def test_reload_writes_current_generation(
+    consumer, feed, service, cache, db, generations, redis_server
+):
+    await fill(service, cache)
+    old_key = cache.build_key("DocService", "1")
+    other = Generations(
+        fakeredis.aioredis.FakeRedis(server=redis_server),
+        ("docs",),
+        60,
+        logging.getLogger("test"),
+    )
+    await other.bump("docs")
+    await generations.refresh()
+    db.docs["1"] = Doc(uuid="1", title="new")
+    await feed.publish(ChangeEvent("film", "1"))
+
+    await consumer.consume()
+
+    assert cache.build_key("DocService", "1") != old_key
+    assert (await read(cache, "1")).value == Doc(uuid="1", title="new")
+    assert await cache.get_one_model(old_key, Doc) is None
+
+
+@pytest.mark.asyncio
+async def test_failed_reload_is_redelivered(consumer, feed, service, cache, db):
+    await fill(service, cache)
+    failed = sample(EVENTS, entity="film", result="failed")
+    db.available = False
+    db.docs["1"] = Doc(uuid="1", title="new")
+    message_id = await feed.publish(ChangeEvent("film", "1"))
+
+    assert await consumer.consume() == 1
+    assert list(feed.pending) == [message_id]
+    assert sample(EVENTS, entity="film", result="failed") == failed + 1
+
+    db.available = True
+    assert await consumer.consume() == 1
+    assert feed.pending == {}
+    assert (await read(cache, "1")).value == Doc(uuid="1", title="new")
+
+
+@pytest.mark.asyncio
+async def test_unknown_entity_is_skipped(consumer, feed, service, cache, redis):
+    await fill(service, cache)
+    skipped = sample(EVENTS, entity="studio", result="skipped")
+    await feed.publish(ChangeEvent("studio", "1"))
+
+    assert await consumer.consume() == 1
+
+    assert feed.pending == {}
+    assert sample(EVENTS, entity="studio", result="skipped") == skipped + 1
+    assert await stored(redis) == ["List-1", "List-2", "Response-1"]
+
+
+@pytest.mark.asyncio
+async def test_memory_feed_redelivers_unacked_events(feed):
+    first = await feed.publish(ChangeEvent("film", "1"))
+    second = await feed.publish(ChangeEvent("film", "2"))
+
+    assert [message_id for message_id, _ in await feed.read(1, 0.01)] == [first]
+    assert [message_id for message_id, _ in await feed.read(10, 0.01)] == [
+        first
+    ]
+    await feed.ack([first])
+    assert [message_id for message_id, _ in await feed.read(10, 0.01)] == [
+        second
+    ]
+    await feed.ack([second])
+    assert await feed.read(10, 0.01) == []
+
+
+@pytest.mark.asyncio
+async def test_memory_feed_waits_claim_idle_before_redelivery():
+    feed = MemoryChangeFeed(claim_idle=60)
+    first = await feed.publish(ChangeEvent("film", "1"))
+    await feed.read(10, 0.01)
+
+    assert await feed.read(10, 0.01) == []
+    assert list(feed.pending) == [first]
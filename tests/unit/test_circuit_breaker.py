@@ -0,0 +1,165 @@
+import asyncio
+import logging
+from http import HTTPStatus
+from types import SimpleNamespace
+
+import pytest
+
+from src.api.core import circuit_breaker
+from src.api.core.circuit_breaker import CircuitBreaker, CircuitState
+from src.api.core.config import settings
+from src.api.db.abstract import DBUnavailableError
+from src.api.db.elastic import ElasticDB
+from src.api.main import app, db_unavailable_handler
+from src.api.models.db.base import UUIDDB
+
+THRESHOLD = 3
+TIMEOUT = 10
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(
+        circuit_breaker, "time", SimpleNamespace(monotonic=lambda: now[0])
+    )
+    return now
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker(THRESHOLD, TIMEOUT)
+
+
+def open_breaker(breaker):
+    for _ in range(THRESHOLD):
+        breaker.record_failure()
+
+
+def test_opens_after_threshold_failures(breaker):
+    for _ in range(THRESHOLD - 1):
+        breaker.record_failure()
+        assert breaker.allow()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitState.open
+    assert not breaker.allow()
+
+
+def test_success_resets_failures(breaker):
+    for _ in range(THRESHOLD - 1):
+        breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitState.closed
+
+
+def test_half_open_after_recovery_timeout(breaker, clock):
+    open_breaker(breaker)
+
+    clock[0] += TIMEOUT - 1
+    assert not breaker.allow()
+    clock[0] += 1
+    assert breaker.allow()
+    assert breaker.state == CircuitState.half_open
+    assert not breaker.allow()
+
+
+def test_half_open_success_closes(breaker, clock):
+    open_breaker(breaker)
+    clock[0] += TIMEOUT
+    breaker.allow()
+    breaker.record_success()
+
+    assert breaker.state == CircuitState.closed
+    assert breaker.allow()
+
+
+def test_half_open_failure_opens_again(breaker, clock):
+    open_breaker(breaker)
+    clock[0] += TIMEOUT
+    breaker.allow()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitState.open
+    assert not breaker.allow()
+    clock[0] += TIMEOUT
+    assert breaker.allow()
+
+
+def test_half_open_allows_new_trial_without_outcome(breaker, clock):
+    open_breaker(breaker)
+    clock[0] += TIMEOUT
+    assert breaker.allow()
+
+    clock[0] += TIMEOUT - 1
+    assert not breaker.allow()
+    clock[0] += 1
+    assert breaker.allow()
+
+
+class HangingES:
+    def __init__(self):
+        self.calls = 0
+
+    async def get(self, **params):
+        self.calls += 1
+        await asyncio.Event().wait()
+
+
+async def cancel_request(db):
+    request = asyncio.create_task(db.get_by_id("id", UUIDDB, index="movies"))
+    await asyncio.sleep(0)
+    request.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await request
+
+
+def test_release_frees_half_open_trial(breaker, clock):
+    open_breaker(breaker)
+    clock[0] += TIMEOUT
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.release()
+
+    assert breaker.allow()
+    assert breaker.state == CircuitState.half_open
+
+
+@pytest.mark.asyncio
+async def test_cancelled_trial_request_frees_trial(breaker, clock):
+    es = HangingES()
+    db = ElasticDB(es, logging.getLogger("test"), breaker)
+    open_breaker(breaker)
+    clock[0] += TIMEOUT
+
+    await cancel_request(db)
+
+    assert breaker.state == CircuitState.half_open
+    await cancel_request(db)
+    assert es.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_requests_do_not_open_breaker(breaker):
+    es = HangingES()
+    db = ElasticDB(es, logging.getLogger("test"), breaker)
+
+    for _ in range(THRESHOLD):
+        await cancel_request(db)
+
+    assert breaker.state == CircuitState.closed
+    assert es.calls == THRESHOLD
+
+
+@pytest.mark.asyncio
+async def test_unavailable_db_returns_503_with_retry_after():
+    response = await db_unavailable_handler(None, DBUnavailableError("down"))
+
+    assert app.exception_handlers[DBUnavailableError] is db_unavailable_handler
+    assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert response.headers["Retry-After"] == str(
+        int(settings.elastic_breaker_timeout)
+    )
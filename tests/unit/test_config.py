@@ -0,0 +1,17 @@
+import pytest
+from pydantic import ValidationError
+
+from src.api.core.config import Settings
+
+
+@pytest.mark.parametrize("superpage_size", [0, 100, 500, 10000])
+def test_superpage_size_dividing_max_result_window(superpage_size):
+    settings = Settings(API_SUPERPAGE_SIZE=superpage_size)
+
+    assert settings.superpage_size == superpage_size
+
+
+@pytest.mark.parametrize("superpage_size", [-500, 300, 20000])
+def test_superpage_size_not_dividing_max_result_window(superpage_size):
+    with pytest.raises(ValidationError, match="API_SUPERPAGE_SIZE"):
+        Settings(API_SUPERPAGE_SIZE=superpage_size)
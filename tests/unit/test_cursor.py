@@ -0,0 +1,126 @@
+import logging
+from http import HTTPStatus
+
+import pytest
+from elastic_transport import ApiResponseMeta, HttpHeaders, NodeConfig
+from elasticsearch import BadRequestError
+
+from src.api.core.circuit_breaker import CircuitBreaker
+from src.api.db.abstract import InvalidCursorError
+from src.api.db.elastic import ElasticDB
+from src.api.main import app, invalid_cursor_handler
+from src.api.models.db.film import FilmListItemDB
+
+RATING_SORT = [{"imdb_rating": "desc"}]
+
+
+class SearchES:
+    def __init__(self, error=None):
+        self.error = error
+        self.calls = []
+
+    async def search(self, **params):
+        self.calls.append(params)
+        if self.error:
+            raise self.error
+        return {"hits": {"hits": []}}
+
+
+def make_db(es):
+    return ElasticDB(es, logging.getLogger("test"), CircuitBreaker(3, 10))
+
+
+def bad_request():
+    meta = ApiResponseMeta(
+        400, "1.1", HttpHeaders(), 0.01, NodeConfig("http", "localhost", 9200)
+    )
+    return BadRequestError("search_phase_execution_exception", meta, {})
+
+
+async def get_page(db, search_after, sort=RATING_SORT):
+    return await db.get_page_after(
+        page_size=2,
+        model=FilmListItemDB,
+        search_after=search_after,
+        index="movies",
+        sort=sort,
+    )
+
+
+@pytest.mark.parametrize(
+    "search_after, sort",
+    [
+        ([], RATING_SORT),
+        ([8.5], RATING_SORT),
+        ([8.5, "id", "id"], RATING_SORT),
+        (["high", "id"], RATING_SORT),
+        ([True, "id"], RATING_SORT),
+        ([8.5, 1], RATING_SORT),
+        ([1, "id"], [{"title.raw": "asc"}]),
+        (["id"], None),
+    ],
+)
+@pytest.mark.asyncio
+async def test_mismatched_cursor_is_rejected_before_search(search_after, sort):
+    es = SearchES()
+
+    with pytest.raises(InvalidCursorError):
+        await get_page(make_db(es), search_after, sort)
+
+    assert es.calls == []
+
+
+@pytest.mark.parametrize(
+    "search_after, sort",
+    [
+        ([8.5, "id"], RATING_SORT),
+        ([8, "id"], RATING_SORT),
+        (["-Infinity", "id"], RATING_SORT),
+        (["Star", "id"], [{"title.raw": "asc"}]),
+        ([1.0, "id"], None),
+    ],
+)
+@pytest.mark.asyncio
+async def test_matching_cursor_is_searched(search_after, sort):
+    es = SearchES()
+
+    assert await get_page(make_db(es), search_after, sort) == ([], None)
+    assert es.calls[0]["search_after"] == search_after
+
+
+@pytest.mark.asyncio
+async def test_rejected_cursor_is_invalid():
+    with pytest.raises(InvalidCursorError):
+        await get_page(make_db(SearchES(bad_request())), [8.5, "id"])
+
+
+@pytest.mark.asyncio
+async def test_bad_request_without_cursor_is_raised():
+    with pytest.raises(BadRequestError):
+        await get_page(make_db(SearchES(bad_request())), None)
+
+
+class MSearchES:
+    async def msearch(self, **params):
+        return {"responses": [{"status": 400, "error": {"type": "parse"}}]}
+
+
+@pytest.mark.asyncio
+async def test_rejected_cursor_in_msearch_is_invalid():
+    db = ElasticDB(
+        MSearchES(),
+        logging.getLogger("test"),
+        CircuitBreaker(3, 10),
+        msearch_window=0.001,
+    )
+
+    with pytest.raises(InvalidCursorError):
+        await get_page(db, [8.5, "id"])
+
+
+@pytest.mark.asyncio
+async def test_invalid_cursor_returns_422():
+    response = await invalid_cursor_handler(None, InvalidCursorError("bad"))
+
+    assert app.exception_handlers[InvalidCursorError] is invalid_cursor_handler
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
@@ -0,0 +1,92 @@
+import asyncio
+import logging
+
+import fakeredis
+import pytest
+from pydantic import BaseModel
+
+from src.api.cache.generations import Generations
+from src.api.cache.redis import RedisCache
+
+EXPIRE = 60
+NAMESPACES = {"FilmService": ("movies",), "GenreService": ("genres",)}
+
+
+class Doc(BaseModel):
+    uuid: str
+
+
+def make_cache(redis, refresh_interval=60):
+    logger = logging.getLogger("test")
+    generations = Generations(
+        redis, ("movies", "genres"), refresh_interval, logger
+    )
+    cache = RedisCache(
+        redis, logger, generations=generations, namespaces=NAMESPACES
+    )
+    return cache, generations
+
+
+async def read(cache, key_prefix, uuid):
+    return await cache.get_one_model(cache.build_key(key_prefix, uuid), Doc)
+
+
+async def write(cache, key_prefix, uuid):
+    key = cache.build_key(key_prefix, uuid)
+    await cache.set_one_model(key, Doc(uuid=uuid), EXPIRE)
+
+
+@pytest.mark.asyncio
+async def test_bump_makes_old_keys_unreachable(redis):
+    cache, generations = make_cache(redis)
+    await write(cache, "FilmService", "a")
+    await write(cache, "GenreService", "b")
+    old_key = cache.build_key("FilmService", "a")
+
+    assert await generations.bump("movies") == 1
+
+    assert cache.build_key("FilmService", "a") != old_key
+    assert await read(cache, "FilmService", "a") is None
+    assert await read(cache, "GenreService", "b") == Doc(uuid="b")
+    await write(cache, "FilmService", "a")
+    assert await read(cache, "FilmService", "a") == Doc(uuid="a")
+
+
+@pytest.mark.asyncio
+async def test_refresh_picks_up_bump_from_other_process(redis, redis_server):
+    cache, generations = make_cache(redis)
+    other_cache, other_generations = make_cache(
+        fakeredis.aioredis.FakeRedis(server=redis_server)
+    )
+    await write(cache, "FilmService", "a")
+    assert await read(other_cache, "FilmService", "a") == Doc(uuid="a")
+
+    await other_generations.bump("movies")
+    assert await read(cache, "FilmService", "a") == Doc(uuid="a")
+
+    await generations.refresh()
+    assert await read(cache, "FilmService", "a") is None
+    assert cache.build_key("FilmService", "a") == other_cache.build_key(
+        "FilmService", "a"
+    )
+
+
+@pytest.mark.asyncio
+async def test_background_refresh_picks_up_bump(redis, redis_server):
+    cache, generations = make_cache(redis, refresh_interval=0.01)
+    other_generations = Generations(
+        fakeredis.aioredis.FakeRedis(server=redis_server),
+        ("movies",),
+        refresh_interval=60,
+        logger=logging.getLogger("test"),
+    )
+    await generations.start()
+    try:
+        await write(cache, "FilmService", "a")
+        await other_generations.bump("movies")
+        await asyncio.sleep(0.05)
+
+        assert generations.get("movies") == 1
+        assert await read(cache, "FilmService", "a") is None
+    finally:
+        await generations.close()
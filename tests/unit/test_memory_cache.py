@@ -0,0 +1,175 @@
+import logging
+from types import SimpleNamespace
+
+import pytest
+from pydantic import BaseModel
+
+from src.api.cache import memory
+from src.api.cache.memory import MemoryCache
+from tests.unit.fakes import DictCache, sample
+
+EXPIRE = 60
+
+
+class Doc(BaseModel):
+    uuid: str
+    name: str = "x" * 100
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(
+        memory, "time", SimpleNamespace(monotonic=lambda: now[0])
+    )
+    return now
+
+
+def make_cache(main, ttl=10, max_entries=100, max_memory=10**6):
+    return MemoryCache(
+        main,
+        ttl=ttl,
+        max_entries=max_entries,
+        max_memory=max_memory,
+        logger=logging.getLogger("test"),
+    )
+
+
+async def read(cache, main, key):
+    """Прочитать модель и признак обращения к основному кэшу."""
+    reads = main.reads
+    value = await cache.get_one_model(key, Doc)
+    return value, main.reads > reads
+
+
+@pytest.mark.asyncio
+async def test_lru_evicts_least_recently_used(clock):
+    main = DictCache()
+    cache = make_cache(main, max_entries=2)
+    evictions = sample("api_memory_cache_evictions_total", prefix="LRU")
+    for name in ("a", "b"):
+        await cache.set_one_model(f"LRU-{name}", Doc(uuid=name), EXPIRE)
+
+    assert await read(cache, main, "LRU-a") == (Doc(uuid="a"), False)
+    await cache.set_one_model("LRU-c", Doc(uuid="c"), EXPIRE)
+
+    assert await read(cache, main, "LRU-a") == (Doc(uuid="a"), False)
+    assert await read(cache, main, "LRU-c") == (Doc(uuid="c"), False)
+    assert await read(cache, main, "LRU-b") == (Doc(uuid="b"), True)
+    assert (
+        sample("api_memory_cache_evictions_total", prefix="LRU")
+        == evictions + 2
+    )
+
+
+@pytest.mark.asyncio
+async def test_entry_expires_after_local_ttl(clock):
+    main = DictCache()
+    cache = make_cache(main, ttl=10)
+    await cache.set_one_model("TTL-a", Doc(uuid="a"), EXPIRE)
+
+    clock[0] += 9
+    entry = await cache.get_one_entry("TTL-a", Doc)
+    assert entry.value == Doc(uuid="a")
+    assert entry.ttl == EXPIRE - 9
+    assert (await read(cache, main, "TTL-a"))[1] is False
+
+    clock[0] += 1
+    assert await read(cache, main, "TTL-a") == (Doc(uuid="a"), True)
+
+
+@pytest.mark.asyncio
+async def test_local_ttl_never_exceeds_cache_expire(clock):
+    main = DictCache()
+    cache = make_cache(main, ttl=10)
+    await cache.set_one_model("Short-a", Doc(uuid="a"), 5)
+
+    clock[0] += 5
+    assert (await read(cache, main, "Short-a"))[1] is True
+
+
+@pytest.mark.asyncio
+async def test_max_memory_evicts_oldest_entries(clock):
+    main = DictCache()
+    size = len(Doc(uuid="a").model_dump_json())
+    cache = make_cache(main, max_memory=size * 2)
+    for name in ("a", "b", "c"):
+        await cache.set_one_model(f"Mem-{name}", Doc(uuid=name), EXPIRE)
+
+    assert (await read(cache, main, "Mem-b"))[1] is False
+    assert (await read(cache, main, "Mem-c"))[1] is False
+    assert (await read(cache, main, "Mem-a"))[1] is True
+
+
+@pytest.mark.asyncio
+async def test_value_larger_than_max_memory_is_not_stored(clock):
+    main = DictCache()
+    cache = make_cache(main, max_memory=10)
+    await cache.set_one_model("Big-a", Doc(uuid="a"), EXPIRE)
+
+    assert await read(cache, main, "Big-a") == (Doc(uuid="a"), True)
+    assert await read(cache, main, "Big-a") == (Doc(uuid="a"), True)
+
+
+@pytest.mark.asyncio
+async def test_hits_and_misses_are_counted(clock):
+    main = DictCache()
+    cache = make_cache(main)
+    hits = sample("api_memory_cache_requests_total", prefix="Hit", result="hit")
+    misses = sample(
+        "api_memory_cache_requests_total", prefix="Hit", result="miss"
+    )
+
+    assert await cache.get_one_model("Hit-a", Doc) is None
+    await cache.set_one_model("Hit-a", Doc(uuid="a"), EXPIRE)
+    await cache.get_one_model("Hit-a", Doc)
+    await cache.get_one_model("Hit-a", Doc)
+
+    assert (
+        sample("api_memory_cache_requests_total", prefix="Hit", result="hit")
+        == hits + 2
+    )
+    assert (
+        sample("api_memory_cache_requests_total", prefix="Hit", result="miss")
+        == misses + 1
+    )
+
+
+@pytest.mark.asyncio
+async def test_list_write_drops_local_ranges(clock):
+    main = DictCache()
+    cache = make_cache(main)
+    old = [Doc(uuid=str(number)) for number in range(4)]
+    new = [Doc(uuid=f"new-{number}") for number in range(4)]
+    await cache.set_list_model("Range-a", old, EXPIRE)
+    assert (await cache.get_list_entry("Range-a", Doc, 1, 2)).value == old[1:3]
+
+    await cache.set_list_model("Range-a", new, EXPIRE)
+
+    assert (await cache.get_list_entry("Range-a", Doc, 1, 2)).value == new[1:3]
+    assert (await cache.get_list_entry("Range-a", Doc)).value == new
+
+
+@pytest.mark.asyncio
+async def test_empty_list_is_a_negative_entry(clock):
+    main = DictCache()
+    cache = make_cache(main)
+    await cache.set_list_model("Empty-a", [], EXPIRE)
+
+    assert (await cache.get_list_entry("Empty-a", Doc)).value is None
+    assert (await cache.get_list_entry("Empty-a", Doc, 2, 3)).value is None
+
+
+@pytest.mark.asyncio
+async def test_oversized_overwrite_drops_previous_entry(clock):
+    main = DictCache()
+    size = len(Doc(uuid="a").model_dump_json())
+    cache = make_cache(main, max_memory=size)
+    await cache.set_one_model("Over-a", Doc(uuid="a"), EXPIRE)
+
+    await cache.set_one_model("Over-a", Doc(uuid="a", name="y" * 200), EXPIRE)
+
+    assert await read(cache, main, "Over-a") == (
+        Doc(uuid="a", name="y" * 200),
+        True,
+    )
@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+
+from src.api.db.abstract import DBUnavailableError
+from src.api.db.msearch import MSearchBatcher, MSearchError
+
+WINDOW = 0.01
+
+
+class Sender:
+    """Отправка `_msearch` с заданными ответами на поиски."""
+
+    def __init__(self, items=None, error=None):
+        self.items = items
+        self.error = error
+        self.batches = []
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def __call__(self, searches):
+        self.batches.append(searches)
+        await self.release.wait()
+        if self.error:
+            raise self.error
+        items = self.items or [
+            {"hits": {"hits": [body]}} for body in searches[1::2]
+        ]
+        return {"responses": [dict(item) for item in items]}
+
+
+def search(batcher, number):
+    return asyncio.create_task(batcher.search("movies", {"number": number}))
+
+
+@pytest.mark.asyncio
+async def test_concurrent_searches_are_sent_in_one_batch():
+    send = Sender()
+    batcher = MSearchBatcher(send, WINDOW, max_size=10)
+
+    results = await asyncio.gather(*(search(batcher, n) for n in range(3)))
+
+    assert len(send.batches) == 1
+    assert send.batches[0][0] == {"index": "movies"}
+    assert results == [{"hits": {"hits": [{"number": n}]}} for n in range(3)]
+
+
+@pytest.mark.asyncio
+async def test_full_batch_is_sent_without_waiting_for_window():
+    send = Sender()
+    batcher = MSearchBatcher(send, window=60, max_size=2)
+
+    await asyncio.wait_for(
+        asyncio.gather(*(search(batcher, n) for n in range(2))), 1
+    )
+
+    assert len(send.batches) == 1
+
+
+@pytest.mark.asyncio
+async def test_item_error_goes_to_its_waiter_only():
+    send = Sender(
+        [
+            {"hits": {"hits": []}},
+            {"status": 400, "error": {"type": "parse"}},
+            {"status": 404, "error": {"type": "index_not_found"}},
+            {"status": 503, "error": {"type": "unavailable"}},
+        ]
+    )
+    batcher = MSearchBatcher(send, WINDOW, max_size=10)
+
+    results = await asyncio.gather(
+        *(search(batcher, n) for n in range(4)), return_exceptions=True
+    )
+
+    assert results[0] == {"hits": {"hits": []}}
+    assert isinstance(results[1], MSearchError)
+    assert results[1].status == 400
+    assert results[2] is None
+    assert isinstance(results[3], DBUnavailableError)
+
+
+@pytest.mark.asyncio
+async def test_batch_error_goes_to_every_waiter():
+    error = DBUnavailableError("down")
+    batcher = MSearchBatcher(Sender(error=error), WINDOW, max_size=10)
+
+    results = await asyncio.gather(
+        *(search(batcher, n) for n in range(3)), return_exceptions=True
+    )
+
+    assert results == [error] * 3
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_cancel_batch():
+    send = Sender()
+    send.release.clear()
+    batcher = MSearchBatcher(send, WINDOW, max_size=10)
+    first, second = search(batcher, 0), search(batcher, 1)
+    while not send.batches:
+        await asyncio.sleep(WINDOW)
+
+    first.cancel()
+    send.release.set()
+
+    assert await second == {"hits": {"hits": [{"number": 1}]}}
+    assert first.cancelled()
+    assert len(send.batches) == 1
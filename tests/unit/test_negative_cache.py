@@ -0,0 +1,134 @@
+import time
+
+import pytest
+
+from src.api.models.db.base import UUIDDB
+from src.api.services.base import BaseElasticService
+from tests.unit.fakes import DictCache
+
+CACHE_EX = 300
+EMPTY_EX = 30
+ERROR_EX = 100
+
+
+class DocService(BaseElasticService[UUIDDB]):
+    _key_prefix = "DocService"
+    _index = "docs"
+    _entity = "genre"
+
+
+class DocDB:
+    def __init__(self, docs=None):
+        self.docs = docs or {}
+        self.calls = 0
+
+    async def get_by_id(self, obj_id, model, **kwargs):
+        self.calls += 1
+        return self.docs.get(obj_id)
+
+
+def make_service(db=None, **kwargs):
+    cache = DictCache()
+    kwargs.setdefault("cache_empty_ex", EMPTY_EX)
+    service = DocService(cache, CACHE_EX, db or DocDB(), **kwargs)
+    return service, cache
+
+
+def make_fetch(refs):
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        return refs
+
+    return fetch, calls
+
+
+def expires_in(cache, key):
+    return cache.entries[key][1] - time.monotonic()
+
+
+@pytest.mark.asyncio
+async def test_missing_document_is_cached_for_empty_ttl():
+    db = DocDB()
+    service, cache = make_service(db)
+    key = cache.build_key(DocService._key_prefix, "missing")
+
+    assert await service._get_by_id("missing", UUIDDB) is None
+    assert await service._get_by_id("missing", UUIDDB) is None
+    assert db.calls == 1
+    assert EMPTY_EX - 1 < expires_in(cache, key) <= EMPTY_EX
+
+    cache.expire(key)
+    assert await service._get_by_id("missing", UUIDDB) is None
+    assert db.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_missing_document_is_not_cached_without_empty_ttl():
+    db = DocDB()
+    service, _ = make_service(db, cache_empty_ex=0)
+
+    await service._get_by_id("missing", UUIDDB)
+    await service._get_by_id("missing", UUIDDB)
+
+    assert db.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_found_document_replaces_negative_entry():
+    db = DocDB()
+    service, cache = make_service(db)
+    key = cache.build_key(DocService._key_prefix, "late")
+    await service._get_by_id("late", UUIDDB)
+
+    db.docs["late"] = UUIDDB(uuid="late")
+    cache.expire(key)
+
+    assert await service._get_by_id("late", UUIDDB) == UUIDDB(uuid="late")
+    assert CACHE_EX - 1 < expires_in(cache, key) <= CACHE_EX
+
+
+@pytest.mark.asyncio
+async def test_empty_list_is_cached_for_empty_ttl():
+    service, cache = make_service()
+    fetch, calls = make_fetch([])
+
+    assert await service._get_list("List-empty", UUIDDB, fetch) is None
+    assert await service._get_list("List-empty", UUIDDB, fetch) is None
+    assert len(calls) == 1
+    assert EMPTY_EX - 1 < expires_in(cache, "List-empty") <= EMPTY_EX
+
+    cache.expire("List-empty")
+    assert await service._get_list("List-empty", UUIDDB, fetch) is None
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_range_past_end_of_list_is_a_hit():
+    service, cache = make_service()
+    refs = [UUIDDB(uuid=str(number)) for number in range(3)]
+    await cache.set_list_model("List-short", refs, CACHE_EX)
+    fetch, calls = make_fetch(refs)
+
+    result = await service._get_list(
+        "List-short", UUIDDB, fetch, start=5, stop=9
+    )
+
+    assert result is None
+    assert calls == []
+
+
+@pytest.mark.asyncio
+async def test_range_past_end_of_expired_list_is_requeried():
+    service, cache = make_service(cache_error_ex=ERROR_EX)
+    refs = [UUIDDB(uuid=str(number)) for number in range(8)]
+    await cache.set_list_model("List-grown", refs[:3], ERROR_EX - 1)
+    fetch, calls = make_fetch(refs)
+
+    result = await service._get_list(
+        "List-grown", UUIDDB, fetch, start=5, stop=9
+    )
+
+    assert result == refs[5:]
+    assert len(calls) == 1
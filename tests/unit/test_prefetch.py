@@ -0,0 +1,147 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.api.services.prefetch import Prefetcher
+from tests.unit.fakes import sample
+
+PREFETCHES = "api_prefetch_total"
+USED = "api_prefetch_used_total"
+FAST_DB = SimpleNamespace(latency=0.01)
+
+
+def make_prefetch(fetched=True, error=None):
+    calls = []
+    release = asyncio.Event()
+    release.set()
+
+    async def prefetch():
+        calls.append(1)
+        await release.wait()
+        if error:
+            raise error
+        return fetched
+
+    return prefetch, calls, release
+
+
+async def settle():
+    """Дождаться завершения запущенных загрузок."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def make_prefetcher(max_concurrency=10, max_tracked=100):
+    return Prefetcher(
+        max_concurrency, max_db_latency=1, max_tracked=max_tracked
+    )
+
+
+@pytest.mark.asyncio
+async def test_scheduled_page_is_prefetched():
+    prefetcher = make_prefetcher()
+    prefetch, calls, _ = make_prefetch()
+    fetched = sample(PREFETCHES, prefix="Run", result="fetched")
+
+    prefetcher.schedule("Run", "Run-page", FAST_DB, prefetch)
+    await settle()
+
+    assert len(calls) == 1
+    assert sample(PREFETCHES, prefix="Run", result="fetched") == fetched + 1
+
+
+@pytest.mark.asyncio
+async def test_running_prefetch_is_not_duplicated():
+    prefetcher = make_prefetcher()
+    prefetch, calls, release = make_prefetch()
+    release.clear()
+
+    for _ in range(3):
+        prefetcher.schedule("Dup", "Dup-page", FAST_DB, prefetch)
+    await settle()
+    release.set()
+    await settle()
+
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_prefetched_page_is_scheduled_again():
+    prefetcher = make_prefetcher()
+    prefetch, calls, _ = make_prefetch()
+
+    prefetcher.schedule("Again", "Again-page", FAST_DB, prefetch)
+    await settle()
+    prefetcher.schedule("Again", "Again-page", FAST_DB, prefetch)
+    await settle()
+
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_busy_or_slow_prefetch_is_skipped():
+    prefetcher = make_prefetcher(max_concurrency=1)
+    prefetch, calls, release = make_prefetch()
+    release.clear()
+    busy = sample(PREFETCHES, prefix="Skip", result="skipped_busy")
+    slow = sample(PREFETCHES, prefix="Skip", result="skipped_slow")
+
+    prefetcher.schedule("Skip", "Skip-1", FAST_DB, prefetch)
+    prefetcher.schedule("Skip", "Skip-2", FAST_DB, prefetch)
+    release.set()
+    await settle()
+    prefetcher.schedule("Skip", "Skip-3", SimpleNamespace(latency=2), prefetch)
+    await settle()
+
+    assert len(calls) == 1
+    assert sample(PREFETCHES, prefix="Skip", result="skipped_busy") == busy + 1
+    assert sample(PREFETCHES, prefix="Skip", result="skipped_slow") == slow + 1
+
+
+@pytest.mark.asyncio
+async def test_first_hit_on_prefetched_page_is_counted_once():
+    prefetcher = make_prefetcher()
+    prefetch, _, _ = make_prefetch()
+    used = sample(USED, prefix="Use")
+
+    prefetcher.schedule("Use", "Use-page", FAST_DB, prefetch)
+    await settle()
+    prefetcher.use("Use-page")
+    prefetcher.use("Use-page")
+    prefetcher.use("Use-other")
+
+    assert sample(USED, prefix="Use") == used + 1
+
+
+@pytest.mark.asyncio
+async def test_cached_or_failed_prefetch_is_not_counted_as_used():
+    prefetcher = make_prefetcher()
+    cached_prefetch, _, _ = make_prefetch(fetched=False)
+    failed_prefetch, _, _ = make_prefetch(error=ValueError("down"))
+    used = sample(USED, prefix="Miss")
+    failed = sample(PREFETCHES, prefix="Miss", result="failed")
+
+    prefetcher.schedule("Miss", "Miss-1", FAST_DB, cached_prefetch)
+    prefetcher.schedule("Miss", "Miss-2", FAST_DB, failed_prefetch)
+    await settle()
+    prefetcher.use("Miss-1")
+    prefetcher.use("Miss-2")
+
+    assert sample(USED, prefix="Miss") == used
+    assert sample(PREFETCHES, prefix="Miss", result="failed") == failed + 1
+
+
+@pytest.mark.asyncio
+async def test_tracked_keys_are_bounded():
+    prefetcher = make_prefetcher(max_tracked=2)
+    prefetch, _, _ = make_prefetch()
+    used = sample(USED, prefix="Bound")
+
+    for number in range(3):
+        prefetcher.schedule("Bound", f"Bound-{number}", FAST_DB, prefetch)
+        await settle()
+    for number in range(3):
+        prefetcher.use(f"Bound-{number}")
+
+    assert sample(USED, prefix="Bound") == used + 2
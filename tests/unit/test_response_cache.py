@@ -0,0 +1,134 @@
+import json
+import logging
+
+import pytest
+from fastapi import FastAPI
+
+from src.api.cache import redis as redis_cache
+from src.api.cache.redis import RedisCache
+from src.api.core.context import (
+    RequestContextMiddleware,
+    mark_degraded,
+    mark_stale,
+)
+from src.api.core.response_cache import ResponseCacheMiddleware
+from tests.unit.fakes import sample
+
+TTL = 60
+REQUESTS = "api_cache_requests_total"
+
+api = FastAPI()
+calls = []
+
+
+@api.get("/docs/{state}")
+async def get_doc(state: str) -> dict[str, str]:
+    calls.append(state)
+    if state == "stale":
+        mark_stale()
+    elif state == "degraded":
+        mark_degraded()
+    return {"state": state}
+
+
+api.add_middleware(ResponseCacheMiddleware, ttls={"/docs": TTL})
+api.add_middleware(RequestContextMiddleware)
+
+
+class Response:
+    def __init__(self, messages):
+        start, *bodies = messages
+        self.status_code = start["status"]
+        self.headers = {
+            name.decode(): value.decode() for name, value in start["headers"]
+        }
+        self.body = b"".join(body.get("body", b"") for body in bodies)
+
+    def json(self):
+        return json.loads(self.body)
+
+
+class Client:
+    """Клиент, вызывающий ASGI-приложение напрямую."""
+
+    async def get(self, path):
+        messages = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "root_path": "",
+            "query_string": b"",
+            "headers": [],
+            "client": ("test", 1),
+            "server": ("test", 80),
+        }
+        await api(scope, receive, send)
+        return Response(messages)
+
+
+@pytest.fixture
+def client(redis, monkeypatch):
+    calls.clear()
+    monkeypatch.setattr(
+        redis_cache, "redis", RedisCache(redis, logging.getLogger("test"))
+    )
+    return Client()
+
+
+async def get_twice(client, path):
+    first = await client.get(path)
+    second = await client.get(path)
+    return first, second
+
+
+@pytest.mark.asyncio
+async def test_fresh_response_is_cached(client):
+    first, second = await get_twice(client, "/docs/fresh")
+
+    assert first.headers["x-cache"] == "MISS"
+    assert first.headers["cache-control"] == f"max-age={TTL}"
+    assert second.headers["x-cache"] == "HIT"
+    assert second.json() == {"state": "fresh"}
+    assert calls == ["fresh"]
+
+
+@pytest.mark.parametrize("state", ["stale", "degraded"])
+@pytest.mark.asyncio
+async def test_response_from_stale_entries_is_not_cached(client, state):
+    first, second = await get_twice(client, f"/docs/{state}")
+
+    assert first.headers["cache-control"] == "max-age=0"
+    assert second.headers["x-cache"] == "MISS"
+    assert second.json() == {"state": state}
+    assert calls == [state, state]
+
+
+@pytest.mark.asyncio
+async def test_cache_errors_are_logged_and_counted(
+    client, redis_server, caplog
+):
+    redis_server.connected = False
+    errors = sample(REQUESTS, prefix="ResponseCache", result="error")
+
+    with caplog.at_level(logging.WARNING, "API ResponseCacheMiddleware"):
+        response = await client.get("/docs/fresh")
+
+    assert response.json() == {"state": "fresh"}
+    assert (
+        sample(REQUESTS, prefix="ResponseCache", result="error") == errors + 2
+    )
+    messages = [record.getMessage() for record in caplog.records]
+    assert any(message.startswith("Error getting") for message in messages)
+    assert any(message.startswith("Error caching") for message in messages)
@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+
+from src.api.core.singleflight import SingleFlight
+from tests.unit.fakes import sample
+
+CALLS = "api_singleflight_calls_total"
+
+
+def make_factory(result="doc", error=None):
+    calls = []
+    release = asyncio.Event()
+
+    async def factory():
+        calls.append(1)
+        await release.wait()
+        if error:
+            raise error
+        return result
+
+    return factory, calls, release
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_run_factory_once():
+    flight = SingleFlight("Flight")
+    factory, calls, release = make_factory()
+    executed = sample(CALLS, service="Flight", result="executed")
+    coalesced = sample(CALLS, service="Flight", result="coalesced")
+
+    waiters = [
+        asyncio.create_task(flight.do("key", factory)) for _ in range(10)
+    ]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*waiters) == ["doc"] * 10
+    assert len(calls) == 1
+    assert sample(CALLS, service="Flight", result="executed") == executed + 1
+    assert sample(CALLS, service="Flight", result="coalesced") == coalesced + 9
+
+
+@pytest.mark.asyncio
+async def test_calls_with_different_keys_are_not_coalesced():
+    flight = SingleFlight("Flight")
+    factory, calls, release = make_factory()
+    release.set()
+
+    await asyncio.gather(flight.do("a", factory), flight.do("b", factory))
+
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_finished_call_is_not_reused():
+    flight = SingleFlight("Flight")
+    factory, calls, release = make_factory()
+    release.set()
+
+    await flight.do("key", factory)
+    await flight.do("key", factory)
+
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_error_is_raised_to_every_waiter():
+    flight = SingleFlight("Flight")
+    factory, calls, release = make_factory(error=ValueError("down"))
+
+    waiters = [asyncio.create_task(flight.do("key", factory)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*waiters, return_exceptions=True)
+
+    assert len(calls) == 1
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_cancel_call():
+    flight = SingleFlight("Flight")
+    factory, calls, release = make_factory()
+
+    first = asyncio.create_task(flight.do("key", factory))
+    second = asyncio.create_task(flight.do("key", factory))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+
+    assert await second == "doc"
+    assert len(calls) == 1
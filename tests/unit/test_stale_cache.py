@@ -0,0 +1,212 @@
+import asyncio
+
+import pytest
+
+from src.api.core import context
+from src.api.core.context import RequestContext
+from src.api.db.abstract import DBUnavailableError
+from src.api.models.db.base import UUIDDB
+from src.api.services.base import BaseElasticService
+from tests.unit.fakes import DictCache
+
+CACHE_EX = 100
+STALE_EX = 50
+ERROR_EX = 20
+FRESH_TTL = CACHE_EX + STALE_EX + ERROR_EX
+STALE_TTL = STALE_EX + ERROR_EX - 1
+EXPIRED_TTL = ERROR_EX - 1
+
+
+class Doc(UUIDDB):
+    title: str
+
+
+class DocService(BaseElasticService[Doc]):
+    _key_prefix = "DocService"
+    _index = "docs"
+    _entity = "film"
+
+
+class DocDB:
+    def __init__(self, docs):
+        self.docs = docs
+        self.available = True
+        self.calls = 0
+
+    async def get_by_id(self, obj_id, model, **kwargs):
+        self.calls += 1
+        if not self.available:
+            raise DBUnavailableError("down")
+        return self.docs.get(obj_id)
+
+
+@pytest.fixture
+def db():
+    return DocDB({"1": Doc(uuid="1", title="new")})
+
+
+@pytest.fixture
+def cache():
+    return DictCache()
+
+
+@pytest.fixture
+def service(cache, db):
+    return DocService(
+        cache,
+        CACHE_EX,
+        db,
+        cache_stale_ex=STALE_EX,
+        cache_error_ex=ERROR_EX,
+        cache_empty_ex=ERROR_EX,
+    )
+
+
+@pytest.fixture
+def request_context():
+    """Состояние запроса, в котором выполняется тест."""
+    state = RequestContext()
+    token = context._request_context.set(state)
+    yield state
+    context._request_context.reset(token)
+
+
+async def put(cache, ttl, title="old"):
+    key = cache.build_key(DocService._key_prefix, "1")
+    await cache.set_one_model(key, Doc(uuid="1", title=title), ttl)
+    return key
+
+
+async def settle():
+    """Дождаться фонового обновления записей."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_fresh_entry_is_served_without_refresh(
+    service, cache, db, request_context
+):
+    await put(cache, FRESH_TTL - 1)
+
+    assert await service._get_by_id("1", Doc) == Doc(uuid="1", title="old")
+    await settle()
+
+    assert db.calls == 0
+    assert not request_context.stale
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_is_served_and_refreshed(
+    service, cache, db, request_context
+):
+    key = await put(cache, STALE_TTL)
+
+    assert await service._get_by_id("1", Doc) == Doc(uuid="1", title="old")
+    assert request_context.stale
+    await settle()
+
+    assert db.calls == 1
+    entry = await cache.get_one_entry(key, Doc)
+    assert entry.value == Doc(uuid="1", title="new")
+    assert FRESH_TTL - 1 < entry.ttl <= FRESH_TTL
+
+
+@pytest.mark.asyncio
+async def test_concurrent_stale_reads_refresh_once(service, cache, db):
+    await put(cache, STALE_TTL)
+
+    await asyncio.gather(*(service._get_by_id("1", Doc) for _ in range(5)))
+    await settle()
+
+    assert db.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_expired_entry_is_requeried(service, cache, db, request_context):
+    await put(cache, EXPIRED_TTL)
+
+    assert await service._get_by_id("1", Doc) == Doc(uuid="1", title="new")
+    assert db.calls == 1
+    assert not request_context.degraded
+
+
+@pytest.mark.asyncio
+async def test_expired_entry_is_served_when_db_is_unavailable(
+    service, cache, db, request_context
+):
+    await put(cache, EXPIRED_TTL)
+    db.available = False
+
+    assert await service._get_by_id("1", Doc) == Doc(uuid="1", title="old")
+    assert request_context.degraded
+
+
+@pytest.mark.asyncio
+async def test_missing_entry_fails_when_db_is_unavailable(service, db):
+    db.available = False
+
+    with pytest.raises(DBUnavailableError):
+        await service._get_by_id("1", Doc)
+
+
+@pytest.mark.parametrize("ttl", [FRESH_TTL - 1, STALE_TTL, EXPIRED_TTL])
+@pytest.mark.asyncio
+async def test_negative_entry_is_returned_regardless_of_ttl(
+    service, cache, db, ttl
+):
+    key = cache.build_key(DocService._key_prefix, "1")
+    await cache.set_empty(key, ttl)
+
+    assert await service._get_by_id("1", Doc) is None
+    await settle()
+
+    assert db.calls == 0
+
+
+@pytest.mark.asyncio
+async def test_stale_list_is_served_and_refreshed(service, cache):
+    old = [UUIDDB(uuid="1")]
+    new = [UUIDDB(uuid="1"), UUIDDB(uuid="2")]
+    await cache.set_list_model("List-a", old, STALE_TTL)
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        return new
+
+    assert await service._get_list("List-a", UUIDDB, fetch) == old
+    await settle()
+
+    assert len(calls) == 1
+    assert (await cache.get_list_entry("List-a", UUIDDB)).value == new
+
+
+@pytest.mark.asyncio
+async def test_expired_list_is_served_when_db_is_unavailable(
+    service, cache, request_context
+):
+    old = [UUIDDB(uuid="1")]
+    await cache.set_list_model("List-b", old, EXPIRED_TTL)
+
+    async def fetch():
+        raise DBUnavailableError("down")
+
+    assert await service._get_list("List-b", UUIDDB, fetch) == old
+    assert request_context.degraded
+
+
+@pytest.mark.parametrize("ttl", [STALE_TTL, EXPIRED_TTL])
+@pytest.mark.asyncio
+async def test_negative_list_is_returned_regardless_of_ttl(service, cache, ttl):
+    await cache.set_list_model("List-c", [], ttl)
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        return []
+
+    assert await service._get_list("List-c", UUIDDB, fetch) is None
+    await settle()
+
+    assert calls == []